@@ -0,0 +1,70 @@
+# benchmarks/animation_mirror.py
+"""
+Замер отрисовки бойца, смотрящего влево
+---------------------------------------
+Раньше Animation.draw делал transform.flip текущего кадра на каждой отрисовке
+(новая Surface размером с кадр), теперь берет кадр из заранее отраженного набора.
+Оба способа рисуют DRAWS кадров анимации на экран, картинки сверяются.
+
+Запуск:
+  python -m benchmarks.animation_mirror
+  python -m benchmarks.animation_mirror 256 512
+"""
+
+import os
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+
+from src.core.animations import Animation
+
+DRAWS = 2000
+FRAMES = 8
+
+
+def make_frames(size):
+    frames = []
+    for i in range(FRAMES):
+        frame = pygame.Surface((size, size), pygame.SRCALPHA)
+        pygame.draw.polygon(frame, (200, 40 + i * 20, 60, 255), [(0, 0), (size - 1, size // 2), (0, size - 1)])
+        frames.append(frame)
+    return frames
+
+
+def draw_flip_each_time(animation, screen):
+    """Старый Animation.draw с flip=True"""
+    started = time.perf_counter()
+    for i in range(DRAWS):
+        animation.index = i % FRAMES
+        screen.blit(pygame.transform.flip(animation.get_frame(), True, False), (0, 0))
+    return time.perf_counter() - started
+
+
+def draw_mirrored(animation, screen):
+    started = time.perf_counter()
+    for i in range(DRAWS):
+        animation.index = i % FRAMES
+        animation.draw(screen, 0, 0, flip=True)
+    return time.perf_counter() - started
+
+
+def run(sizes=(128, 256, 512)):
+    pygame.init()
+    screen = pygame.display.set_mode((1280, 720))
+    print(f"{'кадр':>7}{'flip, мкс/кадр':>16}{'набор, мкс/кадр':>17}{'ускорение':>11}")
+    for size in sizes:
+        animation = Animation(make_frames(size))
+        flip_time = draw_flip_each_time(animation, screen)
+        flipped = screen.copy()
+        mirrored_time = draw_mirrored(animation, screen)
+        assert pygame.image.tobytes(flipped, "RGBA") == pygame.image.tobytes(screen, "RGBA"), "кадры отличаются"
+        print(f"{size:>7}{flip_time / DRAWS * 1e6:>16.1f}{mirrored_time / DRAWS * 1e6:>17.1f}"
+              f"{flip_time / mirrored_time:>10.1f}x")
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    run([int(arg) for arg in sys.argv[1:]] or (128, 256, 512))
@@ -0,0 +1,74 @@
+# benchmarks/physics_bodies.py
+"""
+Замер PhysicsWorld.step: список Entity против BodyStore
+-------------------------------------------------------
+N частиц, подброшенных вверх (как искры супер-удара), шагают TICKS тиков
+двумя способами: обычными Entity в PhysicsWorld.bodies и через
+PhysicsWorld.spawn() (массивы NumPy). Конечные позиции сверяются.
+
+Запуск:
+  python -m benchmarks.physics_bodies
+  python -m benchmarks.physics_bodies 100 1000 10000
+"""
+
+import random
+import sys
+import time
+
+from src.core.entity import Entity
+from src.core.fixed_step import TICK_DT
+from src.core.physics import PhysicsWorld
+
+TICKS = 120
+
+
+class Particle(Entity):
+    """Тело без анимации - только физика"""
+    def __init__(self, x, y, w, h):
+        super().__init__(x, y, w, h)
+        self.is_airborne = True
+
+    def draw(self, surface):
+        pass
+
+
+def make_particles(count, seed=0):
+    rng = random.Random(seed)
+    return [(rng.uniform(0, 1280), rng.uniform(0, 400), rng.randint(2, 8), rng.randint(2, 8),
+             rng.uniform(-300, 300), rng.uniform(-900, 0)) for _ in range(count)]
+
+
+def run_list(particles):
+    world = PhysicsWorld()
+    for x, y, w, h, vx, vy in particles:
+        body = Particle(x, y, w, h)
+        body.velocity_x, body.velocity_y = vx, vy
+        world.add(body)
+    started = time.perf_counter()
+    for _ in range(TICKS):
+        world.step(TICK_DT)
+    return time.perf_counter() - started, [(b.rect.x, b.rect.y) for b in world.bodies]
+
+
+def run_store(particles):
+    world = PhysicsWorld()
+    bodies = [world.spawn(x, y, w, h, vx, vy, is_airborne=True) for x, y, w, h, vx, vy in particles]
+    started = time.perf_counter()
+    for _ in range(TICKS):
+        world.step(TICK_DT)
+    return time.perf_counter() - started, [(b.rect.x, b.rect.y) for b in bodies]
+
+
+def run(counts=(100, 1000, 5000)):
+    print(f"{'тел':>7}{'список, мс/тик':>16}{'массивы, мс/тик':>17}{'ускорение':>11}")
+    for count in counts:
+        particles = make_particles(count)
+        list_time, list_result = run_list(particles)
+        store_time, store_result = run_store(particles)
+        assert list_result == store_result, "BodyStore разошелся со списком Entity"
+        print(f"{count:>7}{list_time / TICKS * 1000:>16.3f}{store_time / TICKS * 1000:>17.3f}"
+              f"{list_time / store_time:>10.1f}x")
+
+
+if __name__ == "__main__":
+    run([int(arg) for arg in sys.argv[1:]] or (100, 1000, 5000))
@@ -0,0 +1,108 @@
+# benchmarks/physics_broadphase.py
+"""
+Замер broadphase в src/core/physics.py
+--------------------------------------
+Сотни хит- и хертбоксов (снаряды, призывы камео, эффекты), случайно
+разбросанных по арене. Сравнивается полный перебор n*m colliderect
+(как detect_hits работал раньше) и detect_hits с sort-and-sweep.
+Последний столбец - те же коробки, но анимированные: каждая привязана к
+FrameBoxTable (HitBox.bind), и detect_hits на каждом тике сначала читает
+коробку текущего кадра владельца. Результаты всех способов сверяются.
+
+Запуск:
+  python -m benchmarks.physics_broadphase
+  python -m benchmarks.physics_broadphase 50 100 200 400 800 1600
+"""
+
+import random
+import sys
+import time
+
+import pygame
+
+from src.core.physics import FrameBoxTable, HitBox, HurtBox, detect_hits
+
+ARENA_WIDTH = 1280 * 3  # арена шире экрана: снаряды улетают за камеру
+ARENA_HEIGHT = 720
+REPEATS = 20
+FRAMES = 8  # кадров в анимации коробок
+
+
+class BoxOwner:
+    """Минимальный владелец коробки (rect + направление), вместо Character"""
+    def __init__(self, x, y, w, h):
+        self.rect = pygame.Rect(x, y, w, h)
+        self.is_facing_right = True
+        self.box_frame = 0  # как Character.box_frame - текущий кадр анимации
+
+
+def make_boxes(count, rng):
+    """count хитбоксов и count хертбоксов, у каждого свой владелец"""
+    hitboxes, hurtboxes = [], []
+    for _ in range(count):
+        w, h = rng.randint(20, 120), rng.randint(20, 160)
+        owner = BoxOwner(rng.randint(0, ARENA_WIDTH - w), rng.randint(0, ARENA_HEIGHT - h), w, h)
+        hitboxes.append(HitBox(owner, 0, 0, w, h))
+        owner = BoxOwner(rng.randint(0, ARENA_WIDTH - w), rng.randint(0, ARENA_HEIGHT - h), w, h)
+        hurtboxes.append(HurtBox(owner))
+    return hitboxes, hurtboxes
+
+
+def make_animated_boxes(count, rng):
+    """Как make_boxes, но коробки по кадрам из FrameBoxTable (размер и смещение меняются)"""
+    hitboxes, hurtboxes = [], []
+    for _ in range(count):
+        for boxes, box_class in ((hitboxes, HitBox), (hurtboxes, HurtBox)):
+            w, h = rng.randint(20, 120), rng.randint(20, 160)
+            owner = BoxOwner(rng.randint(0, ARENA_WIDTH - w), rng.randint(0, ARENA_HEIGHT - h), w, h)
+            owner.is_facing_right = rng.random() < 0.5
+            table = FrameBoxTable([[(rng.randint(-20, 20), rng.randint(-20, 20),
+                                     rng.randint(10, w), rng.randint(10, h))] for _ in range(FRAMES)])
+            boxes.append(box_class(owner, 0, 0, w, h).bind(table))
+    return hitboxes, hurtboxes
+
+
+def animated_hits(hitboxes, hurtboxes):
+    """Тик анимации: владельцы переходят на следующий кадр, затем detect_hits"""
+    for box in hitboxes + hurtboxes:
+        box.owner.box_frame = (box.owner.box_frame + 1) % FRAMES
+    return detect_hits(None, None, hitboxes, hurtboxes)
+
+
+def brute_force_hits(hitboxes, hurtboxes):
+    """Прежний detect_hits: каждый хитбокс с каждым хертбоксом"""
+    collisions = []
+    for hb in hitboxes:
+        for db in hurtboxes:
+            if hb.rect.colliderect(db.rect):
+                collisions.append((hb, db))
+    return collisions
+
+
+def measure(func, hitboxes, hurtboxes):
+    started = time.perf_counter()
+    for _ in range(REPEATS):
+        result = func(hitboxes, hurtboxes)
+    return (time.perf_counter() - started) / REPEATS * 1000, result
+
+
+def run(counts=(50, 100, 200, 400, 800)):
+    rng = random.Random(0)
+    print(f"{'коробок':>8}{'перебор, мс':>14}{'sweep, мс':>12}{'ускорение':>11}{'попаданий':>11}"
+          f"{'по кадрам, мс':>15}")
+    for count in counts:
+        hitboxes, hurtboxes = make_boxes(count, rng)
+        brute_ms, expected = measure(brute_force_hits, hitboxes, hurtboxes)
+        sweep_ms, result = measure(lambda a, b: detect_hits(None, None, a, b), hitboxes, hurtboxes)
+        assert result == expected, "broadphase потерял или добавил попадание"
+
+        animated = make_animated_boxes(count, rng)
+        frames_ms, frame_result = measure(animated_hits, *animated)
+        # Коробки уже прочитаны для последнего кадра - перебор по ним же
+        assert frame_result == brute_force_hits(*animated), "коробки кадра прочитаны неверно"
+        print(f"{count * 2:>8}{brute_ms:>14.2f}{sweep_ms:>12.2f}{brute_ms / sweep_ms:>10.1f}x{len(result):>11}"
+              f"{frames_ms:>15.2f}")
+
+
+if __name__ == "__main__":
+    run([int(arg) for arg in sys.argv[1:]] or (50, 100, 200, 400, 800))
@@ -0,0 +1,99 @@
+# benchmarks/physics_continuous.py
+"""
+Проверка и замер непрерывных столкновений (PhysicsWorld(continuous=True))
+------------------------------------------------------------------------
+Для каждой карты из STAGE_GEOMETRY:
+ - тело падает на пол со скоростью больше своей высоты за тик и должно встать
+   ровно на пол (is_airborne = False), а не провалиться под него
+ - рывок в 1000 пикселей за тик в стоящего противника должен остановиться
+   вплотную к нему (касание в PhysicsWorld.contacts), а не пролететь насквозь
+Обычный шаг (continuous=False) для сравнения - он противника не видит.
+Затем замер step: COUNT тел, летящих в разные стороны, TICKS тиков.
+
+Запуск:
+  python -m benchmarks.physics_continuous
+  python -m benchmarks.physics_continuous 100 400
+"""
+
+import random
+import sys
+import time
+
+from src.core.entity import Entity
+from src.core.fixed_step import TICK_DT
+from src.core.physics import GROUND_Y, STAGE_GEOMETRY, PhysicsWorld
+
+TICKS = 60
+DASH_SPEED = 60000.0  # 1000 пикселей за тик
+
+
+class Body(Entity):
+    def __init__(self, x, y, w, h, is_airborne=False):
+        super().__init__(x, y, w, h)
+        self.is_airborne = is_airborne
+
+    def draw(self, surface):
+        pass
+
+
+def check_floor(map_id, continuous=True):
+    """Нижний край тела после падения и стоит ли оно на полу"""
+    world = PhysicsWorld(continuous=continuous, map_id=map_id)
+    body = Body(600, 100, 40, 40, is_airborne=True)
+    body.velocity_y = 20000.0  # 333 пикселя за тик - больше высоты тела
+    world.add(body)
+    for _ in range(5):
+        world.step(TICK_DT)
+    return body.y + body.rect.height, body.is_airborne
+
+
+def check_dash(map_id, continuous=True):
+    """Правый край рывка, левый край противника и было ли касание"""
+    world = PhysicsWorld(continuous=continuous, map_id=map_id)
+    target = Body(600, GROUND_Y - 100, 40, 100)
+    dash = Body(100.5, GROUND_Y - 20, 20, 20)
+    dash.velocity_x = DASH_SPEED
+    world.add(target)
+    world.add(dash)
+    world.step(TICK_DT)
+    touched = any(body is dash and other is target for body, other, toi, normal in world.contacts)
+    return dash.x + dash.rect.width, target.x, touched
+
+
+def make_world(count, continuous, seed=0):
+    rng = random.Random(seed)
+    world = PhysicsWorld(continuous=continuous)
+    for _ in range(count):
+        body = Body(rng.uniform(0, 1240), rng.uniform(0, 450), rng.randint(4, 30), rng.randint(4, 30), True)
+        body.velocity_x, body.velocity_y = rng.uniform(-3000, 3000), rng.uniform(-900, 900)
+        world.add(body)
+    return world
+
+
+def time_steps(world):
+    started = time.perf_counter()
+    for _ in range(TICKS):
+        world.step(TICK_DT)
+    return time.perf_counter() - started
+
+
+def run(counts=(50, 200, 800)):
+    print(f"{'карта':<20}{'пол':>8}{'на полу':>9}{'рывок':>8}{'противник':>11}{'без swept':>11}")
+    for map_id in STAGE_GEOMETRY:
+        bottom, airborne = check_floor(map_id)
+        right, target_left, touched = check_dash(map_id)
+        discrete_right = check_dash(map_id, continuous=False)[0]
+        assert abs(bottom - GROUND_Y) < 1e-6 and not airborne, f"{map_id}: тело прошло сквозь пол"
+        assert abs(right - target_left) < 1e-6 and touched, f"{map_id}: рывок пролетел сквозь противника"
+        print(f"{map_id:<20}{bottom:>8.1f}{'да' if not airborne else 'нет':>9}{right:>8.1f}"
+              f"{target_left:>11.1f}{discrete_right:>11.1f}")
+
+    print(f"\n{'тел':>7}{'обычный, мс/тик':>17}{'swept, мс/тик':>15}")
+    for count in counts:
+        discrete = time_steps(make_world(count, continuous=False))
+        continuous = time_steps(make_world(count, continuous=True))
+        print(f"{count:>7}{discrete / TICKS * 1000:>17.3f}{continuous / TICKS * 1000:>15.3f}")
+
+
+if __name__ == "__main__":
+    run([int(arg) for arg in sys.argv[1:]] or (50, 200, 800))
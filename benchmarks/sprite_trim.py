@@ -0,0 +1,99 @@
+# benchmarks/sprite_trim.py
+"""
+Замер отрисовки обрезанных кадров
+---------------------------------
+Кадр бойца - фигура на холсте с широкими прозрачными полями. Сравниваются:
+ - холст целиком (как было до sprite_trim)
+ - кадр, обрезанный до непрозрачной области, + смещение в AnimationClip
+ - обрезанный кадр с RLEACCEL (sprite_trim.accelerate)
+Каждый способ рисует DRAWS кадров через Animation.draw (в обе стороны),
+картинки сверяются с холстом: обрезка - точно, RLE - с точностью до 1
+на канал (округление альфа-смешивания SDL на полупрозрачных пикселях).
+
+Запуск:
+  python -m benchmarks.sprite_trim
+  python -m benchmarks.sprite_trim 256 512
+"""
+
+import os
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+
+from src.core.animations import Animation, AnimationClip
+from src.core.sprite_trim import accelerate, mirrored_offset, trim_frame
+
+DRAWS = 2000
+FRAMES = 8
+
+
+def make_frames(size):
+    """Фигура занимает примерно треть холста, с полупрозрачной тенью"""
+    frames = []
+    for i in range(FRAMES):
+        frame = pygame.Surface((size, size), pygame.SRCALPHA)
+        pygame.draw.ellipse(frame, (0, 0, 0, 90), (size // 4, size * 7 // 8, size // 2, size // 16))
+        pygame.draw.ellipse(frame, (200, 40 + i * 20, 60, 255),
+                            (size // 3 + i * 2, size // 6, size // 3, size * 2 // 3))
+        frames.append(frame.convert_alpha())
+    return frames
+
+
+def make_clip(frames, rle):
+    trimmed = [trim_frame(frame) for frame in frames]
+    clip = AnimationClip([frame for frame, _ in trimmed],
+                         offsets=[offset for _, offset in trimmed],
+                         mirrored_offsets=[mirrored_offset(offset, frame, canvas.get_width())
+                                           for (frame, offset), canvas in zip(trimmed, frames)])
+    if rle:
+        accelerate(clip.frames)
+        accelerate(clip.mirror())
+    return clip
+
+
+def draw(animation, screen):
+    """(время, картинки влево и вправо)"""
+    shots = []
+    started = time.perf_counter()
+    for flip in (False, True):
+        screen.fill((40, 80, 120))
+        for i in range(DRAWS // 2):
+            animation.index = i % FRAMES
+            animation.draw(screen, 100, 50, flip=flip)
+        shots.append(pygame.image.tobytes(screen, "RGB"))
+    return time.perf_counter() - started, shots
+
+
+def max_difference(shots, reference):
+    return max(max(abs(a - b) for a, b in zip(shot, ref)) if shot != ref else 0
+               for shot, ref in zip(shots, reference))
+
+
+def run(sizes=(128, 256, 512)):
+    pygame.init()
+    screen = pygame.display.set_mode((1280, 720))
+    print(f"{'кадр':>7}{'холст, мкс':>12}{'обрезка, мкс':>14}{'+RLE, мкс':>11}{'ускорение':>11}{'пиксели, КБ':>18}")
+    for size in sizes:
+        frames = make_frames(size)
+        canvas = Animation(frames)
+        canvas.clip.mirror()
+        canvas_time, reference = draw(canvas, screen)
+        trimmed_time, shots = draw(Animation(clip=make_clip(frames, rle=False)), screen)
+        assert max_difference(shots, reference) == 0, "обрезанные кадры рисуются не там"
+        rle_clip = make_clip(frames, rle=True)
+        rle_time, shots = draw(Animation(clip=rle_clip), screen)
+        assert max_difference(shots, reference) <= 1, "кадры с RLE отличаются"
+
+        canvas_kb = sum(f.get_width() * f.get_height() * 4 for f in frames) // 1024
+        trimmed_kb = sum(f.get_width() * f.get_height() * 4 for f in rle_clip.frames) // 1024
+        print(f"{size:>7}{canvas_time / DRAWS * 1e6:>12.1f}{trimmed_time / DRAWS * 1e6:>14.1f}"
+              f"{rle_time / DRAWS * 1e6:>11.1f}{canvas_time / rle_time:>10.1f}x"
+              f"{canvas_kb:>9} -> {trimmed_kb:<6}")
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    run([int(arg) for arg in sys.argv[1:]] or (128, 256, 512))
@@ -1,23 +1,23 @@
 # main.py
-import pygame
-from src.managers.game_manager import GameManager
-from src.managers.settings_manager import SettingsManager
-from src.scenes.loading_scene import LoadingScene
-from src.scenes.menu_scene import MenuScene
-from src.scenes.settings_scene import SettingsScene
-from src.scenes.battle_scene import BattleScene
-from src.scenes.victory_scene import VictoryScene
-from src.scenes.character_selection_scene import CharacterSelectionScene
-from src.scenes.intro_scene import IntroSequenceScene
-from src.scenes.victory_scene import VictoryScene
-from src.core.character import Character
-from src.managers.resource_manager import ResourceManager
-from src.core.input_handler import InputHandler
-from src.managers.language_manager import LanguageManager
-from src.managers.save_manager import SaveManager
-from src.scenes.shop_scene import ShopScene
-from src.managers.skin_manager import SkinManager
-from src.scenes.shop_scene import ShopScene
+from src.core.startup_profile import timed, mark, report
+with timed("pygame"):
+    import pygame
+with timed("менеджеры"):
+    from src.managers.game_manager import GameManager
+    from src.managers.settings_manager import SettingsManager
+    from src.managers.resource_manager import ResourceManager
+    from src.core.input_handler import InputHandler
+    from src.managers.save_manager import SaveManager
+    from src.managers.skin_manager import SkinManager
+    from src.managers.netplay import parse_netplay_args
+# Сцены боя (intro, battle, character_selection) импортируются там, где создаются -
+# на старте нужны только сцены меню
+with timed("сцены меню"):
+    from src.scenes.loading_scene import LoadingScene
+    from src.scenes.menu_scene import MenuScene
+    from src.scenes.settings_scene import SettingsScene
+    from src.scenes.victory_scene import VictoryScene
+    from src.scenes.shop_scene import ShopScene
 import sys
 import os
 
@@ -45,6 +45,7 @@ def main():
         settings_manager.update_scale_factor(settings_manager.base_resolution[0])
     
     pygame.display.set_caption("Villian War")
+    mark("окно создано")
     clock = pygame.time.Clock()
 
     # Core systems с настройками
@@ -70,9 +71,24 @@ def main():
     gm.register_scene("character_selection", None)
 
     # Выставление первой сцены
-    gm.set_scene("loading")
+    netplay = parse_netplay_args(sys.argv[1:])
+    if netplay:
+        # Сетевой vs_friend: сразу к выбору бойца (python main.py --netplay 1 7000 127.0.0.1:7001),
+        # адрес из командной строки вместо настройки "netplay"
+        from src.scenes.character_selection_scene import CharacterSelectionScene
+        gm.netplay_config = netplay
+        gm.register_scene("character_selection", CharacterSelectionScene(gm, "vs_friend_online"))
+        gm.register_scene("game_loading", LoadingScene(gm, "character_selection", skip_logo=True))
+        gm.set_scene("game_loading")
+    elif "--replay" in sys.argv[1:]:
+        # Просмотр реплея: python main.py --replay replays/<файл>.vwr
+        from src.scenes.replay_viewer_scene import start_replay_viewer
+        start_replay_viewer(gm, sys.argv[sys.argv.index("--replay") + 1])
+    else:
+        gm.set_scene("loading")
     # Игровой цикл
     running = True
+    first_frame_shown = False
     while running:
         dt = clock.tick(60) / 1000.0
 
@@ -84,9 +100,15 @@ def main():
         gm.handle_events(events)
         gm.update(dt)
 
-        screen.fill((0, 0, 0))
-        gm.draw(screen)
-        pygame.display.flip()
+        dirty_rects = gm.draw(screen)
+        if dirty_rects is None:
+            pygame.display.flip()
+        elif dirty_rects:
+            pygame.display.update(dirty_rects)
+        if not first_frame_shown:
+            first_frame_shown = True
+            mark("первый кадр")
+            report()
 
     # Сохранение настроек при выходе
     settings_manager.save_settings()
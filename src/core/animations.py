@@ -2,8 +2,15 @@
 import pygame
 import os
 import sys
+import threading
+from collections import deque
 from typing import List, Dict, Tuple, Optional
-import cv2  # Для работы с видео
+# OpenCV/NumPy загружаются лениво - только когда появляется настоящее видео
+from src.core.video_backend import get_cv2, get_numpy
+from src.core.fonts import get_font
+
+# Сколько декодированных кадров держит потоковый декодер (кольцевой буфер)
+STREAM_BUFFER_FRAMES = 8
 
 # Функция для получения корректного пути к ресурсам в pyinstaller
 def resource_path(relative_path):
@@ -44,12 +51,12 @@ def load_video_frames(video_path: str, target_size: Tuple[int, int] = None,
             placeholder.fill((80, 80, 150, 255))
             
             # Рисуем сообщение
-            font = pygame.font.SysFont("arial", min(24, target_size[0] // 10))
+            font = get_font(min(24, target_size[0] // 10))
             text = font.render("VIDEO NOT FOUND", True, (255, 255, 255))
             text_rect = text.get_rect(center=(target_size[0]//2, target_size[1]//2))
             placeholder.blit(text, text_rect)
             
-            filename_font = pygame.font.SysFont("arial", min(14, target_size[0] // 15))
+            filename_font = get_font(min(14, target_size[0] // 15))
             filename_text = filename_font.render(os.path.basename(video_path), True, (200, 200, 200))
             filename_rect = filename_text.get_rect(center=(target_size[0]//2, target_size[1]//2 + 30))
             placeholder.blit(filename_text, filename_rect)
@@ -59,8 +66,8 @@ def load_video_frames(video_path: str, target_size: Tuple[int, int] = None,
     
     try:
         # Пробуем использовать OpenCV для чтения видео
-        import cv2
-        import numpy as np
+        cv2 = get_cv2()
+        np = get_numpy()
         
         cap = cv2.VideoCapture(actual_path)
         
@@ -120,7 +127,7 @@ def load_video_frames(video_path: str, target_size: Tuple[int, int] = None,
                 hue = (i * 25) % 255
                 placeholder.fill((hue, 100, 150, 255))
                 
-                font = pygame.font.SysFont("arial", min(20, target_size[0] // 10))
+                font = get_font(min(20, target_size[0] // 10))
                 text = font.render("NO OPENCV", True, (255, 255, 255))
                 text_rect = text.get_rect(center=(target_size[0]//2, target_size[1]//2))
                 placeholder.blit(text, text_rect)
@@ -138,57 +145,376 @@ def load_video_frames(video_path: str, target_size: Tuple[int, int] = None,
     return frames, fps
 
 
-class Animation:
+def cache_video_frames(video_path: str, target_size: Tuple[int, int], frame_cache) -> bool:
+    """
+    Декодирует видео целиком прямо в дисковый кэш кадров (без pygame.Surface).
+    Безопасно вызывать из рабочего потока - используется AssetLoader для прогрева артов.
+    Возвращает True, если кадры нужного размера есть в кэше.
+    """
+    actual_path = resource_path(video_path)
+    if frame_cache is None or not target_size or not os.path.exists(actual_path):
+        return False
+    if frame_cache.lookup(actual_path, target_size) is not None:
+        return True
+
+    try:
+        cv2 = get_cv2()
+    except ImportError:
+        print("❌ OpenCV (cv2) не установлен. Не могу закэшировать видео.")
+        return False
+
+    writer = frame_cache.create_writer(actual_path, target_size)
+    if writer is None:
+        return False
+
+    cap = cv2.VideoCapture(actual_path)
+    try:
+        if not cap.isOpened():
+            writer.abort()
+            return False
+        fps = int(cap.get(cv2.CAP_PROP_FPS))
+        if fps <= 0:
+            fps = 30
+        while True:
+            ret, frame = cap.read()
+            if not ret:
+                break
+            frame = cv2.resize(frame, tuple(target_size), interpolation=cv2.INTER_AREA)
+            writer.write(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+        writer.commit(fps)
+        return writer.frame_count > 0
+    except Exception as e:
+        writer.abort()
+        print(f"❌ Ошибка кэширования видео {video_path}: {e}")
+        return False
+    finally:
+        cap.release()
+
+
+class VideoFrameStream:
+    """
+    Потоковый декодер видео.
+    Кадры читаются в фоновом потоке и складываются в ограниченный кольцевой буфер
+    numpy-массивов RGB (уже нужного размера). Главный поток забирает их через pop()
+    и превращает в Surface только те кадры, которые реально показываются.
+    Память ограничена buffer_size кадрами независимо от длины ролика.
     """
-    Простой покадровый Animation wrapper.
+    def __init__(self, actual_path: str, target_size: Tuple[int, int] = None,
+                 loop: bool = True, max_frames: int = None,
+                 buffer_size: int = STREAM_BUFFER_FRAMES, cache_writer=None):
+        self.path = actual_path
+        self.target_size = tuple(target_size) if target_size else None
+        self.loop = loop
+        self.max_frames = max_frames
+        self.buffer_size = max(2, buffer_size)
+        self.finished = False  # декодер дошел до конца (только для незацикленных)
+        # Писатель дискового кэша: получает кадры первого полного прохода
+        self.cache_writer = cache_writer
+
+        cv2 = get_cv2()
+        self._cap = cv2.VideoCapture(actual_path)
+        if not self._cap.isOpened():
+            self._cap.release()
+            raise IOError(f"не удалось открыть видео {actual_path}")
+
+        self.fps = int(self._cap.get(cv2.CAP_PROP_FPS))
+        if self.fps <= 0:
+            self.fps = 30
+
+        # Количество кадров из метаданных (уточняется после первого прохода)
+        self.frame_count = max(0, int(self._cap.get(cv2.CAP_PROP_FRAME_COUNT)))
+        if max_frames:
+            self.frame_count = min(self.frame_count, max_frames) if self.frame_count else max_frames
+
+        if self.target_size:
+            self.size = self.target_size
+        else:
+            self.size = (int(self._cap.get(cv2.CAP_PROP_FRAME_WIDTH)),
+                         int(self._cap.get(cv2.CAP_PROP_FRAME_HEIGHT)))
+
+        self._buffer = deque()
+        self._cond = threading.Condition()
+        self._stopped = False
+        self._restart = False
+
+        self._thread = threading.Thread(target=self._run, name=f"video:{os.path.basename(actual_path)}",
+                                        daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        """Цикл фонового потока: декодируем вперед, пока буфер не заполнится"""
+        cv2 = get_cv2()
+        frame_no = 0
+        try:
+            while True:
+                with self._cond:
+                    while (len(self._buffer) >= self.buffer_size or self.finished) \
+                            and not self._stopped and not self._restart:
+                        self._cond.wait()
+                    if self._stopped:
+                        break
+                    if self._restart:
+                        self._restart = False
+                        self._buffer.clear()
+                        self.finished = False
+                        self._cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+                        frame_no = 0
+                        self._abort_cache_writer()
+
+                ret, frame = (False, None)
+                if not self.max_frames or frame_no < self.max_frames:
+                    ret, frame = self._cap.read()
+
+                if not ret:
+                    if frame_no > 0:
+                        self.frame_count = frame_no
+                        if self.cache_writer:
+                            self.cache_writer.commit(self.fps)
+                            self.cache_writer = None
+                    if self.loop and frame_no > 0:
+                        self._cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+                        frame_no = 0
+                        continue
+                    with self._cond:
+                        self.finished = True
+                        self._cond.notify_all()
+                    continue
+
+                # Сначала уменьшаем, потом конвертируем цвет - меньше пикселей
+                if self.target_size:
+                    frame = cv2.resize(frame, self.target_size, interpolation=cv2.INTER_AREA)
+                frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+                if self.cache_writer:
+                    self.cache_writer.write(frame_rgb)
+
+                with self._cond:
+                    if self._restart or self._stopped:
+                        continue
+                    self._buffer.append((frame_no, frame_rgb))
+                    self._cond.notify_all()
+                frame_no += 1
+        except Exception as e:
+            print(f"❌ Ошибка потокового декодирования {self.path}: {e}")
+            with self._cond:
+                self.finished = True
+                self._cond.notify_all()
+        finally:
+            self._abort_cache_writer()
+            self._cap.release()
+
+    def _abort_cache_writer(self):
+        """Незавершенный проход не попадает в кэш"""
+        if self.cache_writer:
+            self.cache_writer.abort()
+            self.cache_writer = None
+
+    def pop(self):
+        """Забирает следующий готовый кадр (frame_no, rgb) или None, если декодер не успел"""
+        with self._cond:
+            if not self._buffer:
+                return None
+            item = self._buffer.popleft()
+            self._cond.notify_all()
+            return item
+
+    def wait_first_frame(self, timeout: float = 0.05):
+        """Ждет появления хотя бы одного кадра в буфере (не дольше timeout секунд)"""
+        with self._cond:
+            if not self._buffer and not self.finished and not self._stopped:
+                self._cond.wait_for(lambda: self._buffer or self.finished or self._stopped, timeout)
+            return bool(self._buffer)
+
+    def is_drained(self):
+        """True, если незацикленное видео полностью проиграно"""
+        with self._cond:
+            return self.finished and not self._buffer
+
+    def restart(self):
+        """Перемотка в начало: буфер очищается, декодер начинает с нулевого кадра"""
+        with self._cond:
+            self._restart = True
+            self._cond.notify_all()
+
+    def close(self):
+        """Останавливает фоновый поток и освобождает VideoCapture"""
+        with self._cond:
+            self._stopped = True
+            self._buffer.clear()
+            self._cond.notify_all()
+
+
+def open_video_stream(video_path: str, target_size: Tuple[int, int] = None, loop: bool = True,
+                      max_frames: int = None, buffer_size: int = STREAM_BUFFER_FRAMES,
+                      frame_cache=None) -> Optional[VideoFrameStream]:
+    """
+    Открывает потоковый декодер для видео.
+    Возвращает None, если файла нет или OpenCV не смог его открыть -
+    тогда вызывающий код откатывается на load_video_frames с заглушками.
+    Если передан frame_cache, первый полный проход записывается в дисковый кэш.
+    """
+    actual_path = resource_path(video_path)
+    if not video_path or not os.path.exists(actual_path):
+        return None
+    # Обрезанные (max_frames) проходы в кэш не пишем - это не полный ролик
+    writer = None
+    if frame_cache is not None and target_size and not max_frames:
+        writer = frame_cache.create_writer(actual_path, target_size)
+    try:
+        return VideoFrameStream(actual_path, target_size, loop, max_frames, buffer_size, writer)
+    except Exception as e:
+        if writer:
+            writer.abort()
+        print(f"⚠️ Потоковое видео недоступно {video_path}: {e}")
+        return None
+
+
+class AnimationClip:
+    """
+    Данные анимации без состояния проигрывания: кадры, длительности кадров,
+    зацикленность и события. Один клип на (персонаж, скин, анимация) -
+    ResourceManager.get_clip, его делят все Character с этим скином.
     frames: list[pygame.Surface]
-    fps: кадры в секунду
+    fps: кадры в секунду (если нет своих durations)
     loop: повторять ли
+    durations: секунды на каждый кадр; None - 1 / fps для всех
+    events: { индекс кадра: [имена событий] } (звук шага, активный кадр удара...)
+    mirrored_frames: те же кадры, отраженные по горизонтали; None - отразить при первом запросе
+    offsets: (dx, dy) каждого кадра внутри исходного холста - кадры обрезаны до
+             непрозрачной области (sprite_trim); None - кадры не обрезаны
+    mirrored_offsets: то же для отраженных кадров (dx от правого края холста)
     """
-    def __init__(self, frames: List[pygame.Surface], fps: int = 12, loop: bool = True):
+    def __init__(self, frames: List[pygame.Surface], fps: int = 12, loop: bool = True,
+                 durations: List[float] = None, events: Dict[int, List[str]] = None,
+                 mirrored_frames: List[pygame.Surface] = None,
+                 offsets: List[Tuple[int, int]] = None, mirrored_offsets: List[Tuple[int, int]] = None):
         self.frames = frames or []
         self.fps = fps
         self.loop = loop
+        self.durations = durations
+        self.events = events or {}
+        self.mirrored_frames = mirrored_frames
+        self.offsets = offsets
+        self.mirrored_offsets = mirrored_offsets
+
+    def frame_time(self, index: int) -> float:
+        if self.durations:
+            return self.durations[index]
+        return 1.0 / max(1, self.fps)
+
+    def mirror(self):
+        """Отраженный набор кадров (создается один раз)"""
+        if self.mirrored_frames is None:
+            self.mirrored_frames = [pygame.transform.flip(frame, True, False) for frame in self.frames]
+        return self.mirrored_frames
+
 
+class Animation:
+    """
+    Плейхед анимации: текущий кадр и таймер поверх общего AnimationClip.
+    Animation(frames, fps, loop) - как раньше, со своим клипом;
+    Animation(clip=clip) - плейхед на общем клипе (создается за O(1), кадры не копируются).
+    """
+    def __init__(self, frames: List[pygame.Surface] = None, fps: int = 12, loop: bool = True,
+                 mirrored_frames: List[pygame.Surface] = None, clip: AnimationClip = None):
+        self.clip = clip or AnimationClip(frames, fps, loop, mirrored_frames=mirrored_frames)
         self.index = 0
         self.timer = 0.0
 
+    # Данные клипа - для кода, который работает с Animation как раньше
+    @property
+    def frames(self):
+        return self.clip.frames
+
+    @frames.setter
+    def frames(self, frames):
+        self.clip.frames = frames
+        self.clip.mirrored_frames = None
+        self.clip.offsets = self.clip.mirrored_offsets = None
+
+    @property
+    def fps(self):
+        return self.clip.fps
+
+    @fps.setter
+    def fps(self, fps):
+        self.clip.fps = fps
+
+    @property
+    def loop(self):
+        return self.clip.loop
+
+    @loop.setter
+    def loop(self, loop):
+        self.clip.loop = loop
+
+    @property
+    def frame_events(self):
+        """События текущего кадра"""
+        return self.clip.events.get(self.index, ())
+
     def update(self, dt: float):
-        if not self.frames:
+        frame_count = self.frame_count
+        if not frame_count:
             return
+        clip = self.clip
         self.timer += dt
-        frame_time = 1.0 / max(1, self.fps)
+        frame_time = clip.frame_time(self.index)
         while self.timer >= frame_time:
             self.timer -= frame_time
             self.index += 1
-            if self.index >= len(self.frames):
-                if self.loop:
+            if self.index >= frame_count:
+                if clip.loop:
                     self.index = 0
                 else:
-                    self.index = len(self.frames) - 1
+                    self.index = frame_count - 1
+            frame_time = clip.frame_time(self.index)
 
     def get_frame(self):
-        if not self.frames:
+        frames = self.clip.frames
+        if not frames:
+            return None
+        return frames[self.index]
+
+    def get_mirrored_frame(self):
+        """Текущий кадр, отраженный по горизонтали - из готового набора клипа, без transform на каждый кадр"""
+        if not self.clip.frames:
             return None
-        return self.frames[self.index]
+        return self.clip.mirror()[self.index]
+
+    @property
+    def frame_count(self):
+        return len(self.frames)
 
     def reset(self):
         self.index = 0
         self.timer = 0.0
 
     def draw(self, surface: pygame.Surface, x: int, y: int, flip: bool = False):
-        frame = self.get_frame()
+        frame = self.get_mirrored_frame() if flip else self.get_frame()
         if frame is None:
             return
-        if flip:
-            frame = pygame.transform.flip(frame, True, False)
+        offsets = self.clip.mirrored_offsets if flip else self.clip.offsets
+        if offsets:
+            dx, dy = offsets[self.index]
+            x += dx
+            y += dy
         surface.blit(frame, (x, y))
 
 class VideoAnimation(Animation):
-    """Анимация на основе видео"""
+    """
+    Анимация на основе видео.
+    В обычном режиме все кадры декодируются заранее (load_video_frames).
+    В потоковом режиме (streaming=True) кадры декодируются фоновым потоком
+    в кольцевой буфер на buffer_size кадров - первый кадр доступен почти сразу,
+    а память не зависит от длины ролика.
+    С frame_cache готовые масштабированные кадры берутся из дискового кэша
+    (memory-map) без декодирования, а первый потоковый проход наполняет кэш.
+    """
     
     def __init__(self, video_path: str, target_size: Tuple[int, int] = None, 
-                 fps: int = None, loop: bool = True, max_frames: int = None):
+                 fps: int = None, loop: bool = True, max_frames: int = None,
+                 streaming: bool = False, buffer_size: int = STREAM_BUFFER_FRAMES,
+                 frame_cache=None):
         """
         Инициализирует анимацию из видео
         
@@ -198,28 +524,135 @@ class VideoAnimation(Animation):
             fps: кадры в секунду (если None, берется из видео)
             loop: зациклено ли видео
             max_frames: максимальное количество кадров для загрузки
+            streaming: декодировать кадры на лету в фоновом потоке
+            buffer_size: размер кольцевого буфера для потокового режима
+            frame_cache: FrameCache для чтения/записи готовых кадров на диске
         """
-        # Загружаем кадры из видео
-        frames, video_fps = load_video_frames(video_path, target_size, max_frames)
+        self.video_path = video_path
+        self.stream = None
+        self.cached = None
+        self._stream_surface = None
+        self._stream_pending = None
+        self._cached_index = -1
+        self._mirrored_source = None   # кадр видео, для которого уже есть отражение
+        self._mirrored_surface = None
+
+        if frame_cache is not None and video_path and target_size and not max_frames:
+            self.cached = frame_cache.lookup(resource_path(video_path), target_size)
+
+        if self.cached is None and streaming:
+            self.stream = open_video_stream(video_path, target_size, loop, max_frames, buffer_size,
+                                            frame_cache)
+
+        if self.cached is not None:
+            frames, video_fps = [], self.cached.fps
+        elif self.stream:
+            frames, video_fps = [], self.stream.fps
+        else:
+            # Загружаем кадры из видео целиком
+            frames, video_fps = load_video_frames(video_path, target_size, max_frames)
         
         # Используем FPS из видео если не указан
         if fps is None:
             fps = video_fps if video_fps > 0 else 30
         
         super().__init__(frames, fps, loop)
-        self.video_path = video_path
+
+    @property
+    def frame_count(self):
+        if self.cached is not None:
+            return self.cached.frame_count
+        if self.stream:
+            return self.stream.frame_count
+        return len(self.frames)
+
+    def update(self, dt: float):
+        if not self.stream:
+            super().update(dt)
+            return
+
+        self.timer += dt
+        frame_time = 1.0 / max(1, self.fps)
+        steps = 0
+        while self.timer >= frame_time:
+            self.timer -= frame_time
+            steps += 1
+
+        # Если отстали - пропускаем промежуточные кадры, показываем самый свежий.
+        # Если декодер не успел - держим текущий кадр.
+        for _ in range(steps):
+            item = self.stream.pop()
+            if item is None:
+                break
+            self.index, self._stream_pending = item
+
+    def get_frame(self):
+        if self.cached is not None:
+            # Кадр из memory-map: Surface ссылается на страницы файла без копирования
+            if self._cached_index != self.index:
+                width, height = self.cached.size
+                self._stream_surface = pygame.image.frombuffer(self.cached.get(self.index), (width, height), "RGB")
+                self._cached_index = self.index
+            return self._stream_surface
+        if not self.stream:
+            return super().get_frame()
+
+        if self._stream_surface is None and self._stream_pending is None:
+            # Первый кадр: ждем декодер не дольше нескольких миллисекунд
+            self.stream.wait_first_frame()
+            item = self.stream.pop()
+            if item is not None:
+                self.index, self._stream_pending = item
+
+        if self._stream_pending is not None:
+            width, height = self._stream_pending.shape[1], self._stream_pending.shape[0]
+            self._stream_surface = pygame.image.frombuffer(self._stream_pending.tobytes(), (width, height), "RGB")
+            self._stream_pending = None
+        return self._stream_surface
+
+    def get_mirrored_frame(self):
+        """Видео из кэша/потока не хранит кадры целиком - отражаем текущий, один раз на кадр видео"""
+        if self.cached is None and not self.stream:
+            return super().get_mirrored_frame()
+        frame = self.get_frame()
+        if frame is None:
+            return None
+        if frame is not self._mirrored_source:
+            self._mirrored_surface = pygame.transform.flip(frame, True, False)
+            self._mirrored_source = frame
+        return self._mirrored_surface
+
+    def is_finished(self):
+        """Закончилось ли незацикленное видео"""
+        if self.stream:
+            return not self.loop and self.stream.is_drained()
+        return not self.loop and self.index == self.frame_count - 1
+
+    def reset(self):
+        super().reset()
+        if self.stream:
+            self.stream.restart()
+            self._stream_surface = None
+            self._stream_pending = None
+
+    def close(self):
+        """Останавливает фоновый декодер (для потокового режима)"""
+        if self.stream:
+            self.stream.close()
     
     @classmethod
     def create_looped(cls, video_path: str, target_size: Tuple[int, int] = None, 
-                     fps: int = None, max_frames: int = None) -> 'VideoAnimation':
+                     fps: int = None, max_frames: int = None,
+                     streaming: bool = False) -> 'VideoAnimation':
         """Создает зацикленную видео-анимацию"""
-        return cls(video_path, target_size, fps, loop=True, max_frames=max_frames)
+        return cls(video_path, target_size, fps, loop=True, max_frames=max_frames, streaming=streaming)
     
     @classmethod
     def create_single_play(cls, video_path: str, target_size: Tuple[int, int] = None,
-                          fps: int = None, max_frames: int = None) -> 'VideoAnimation':
+                          fps: int = None, max_frames: int = None,
+                          streaming: bool = False) -> 'VideoAnimation':
         """Создает одноразовую видео-анимацию (не зацикленную)"""
-        return cls(video_path, target_size, fps, loop=False, max_frames=max_frames)
+        return cls(video_path, target_size, fps, loop=False, max_frames=max_frames, streaming=streaming)
 
 
 def play_video_animation(surface: pygame.Surface, position: Tuple[int, int], 
@@ -248,7 +681,11 @@ def play_video_animation(surface: pygame.Surface, position: Tuple[int, int],
     # Проверяем завершена ли анимация (для не зацикленных)
     if not animation.loop:
         # Анимация завершена если это последний кадр и прошло достаточно времени
-        if animation.index == len(animation.frames) - 1:
+        if animation.stream:
+            # Потоковое видео: завершено, когда декодер дошел до конца и буфер пуст
+            if animation.is_finished():
+                return True
+        elif animation.index == animation.frame_count - 1:
             # Ждем время отображения последнего кадра
             frame_time = 1.0 / max(1, animation.fps)
             if animation.timer >= frame_time:
@@ -356,10 +793,30 @@ def play_single_video(surface: pygame.Surface, position: Tuple[int, int],
 
 
 class AnimationController:
-    def __init__(self, animations: Dict[str, Animation] = None, default: str = None, speed: float = 1.0):
+    """
+    Набор анимаций бойца и текущая из них.
+    clip_source(name) -> AnimationClip или None: анимации, которых еще нет в animations,
+    создаются по первому запросу (change, set_state, prefetch) - кадры декодируются тогда же.
+    """
+    def __init__(self, animations: Dict[str, Animation] = None, default: str = None, speed: float = 1.0,
+                 clip_source=None):
         self.animations = animations or {}
         self.current = default
         self.speed = speed
+        self.clip_source = clip_source
+
+    def _resolve(self, name: str) -> Optional[Animation]:
+        anim = self.animations.get(name)
+        if anim is None and self.clip_source is not None:
+            clip = self.clip_source(name)
+            if clip is not None:
+                anim = self.animations[name] = Animation(clip=clip)
+        return anim
+
+    def prefetch(self, names):
+        """Заранее создает анимации names (кадры декодируются сейчас, а не посреди боя)"""
+        for name in names:
+            self._resolve(name)
 
     def update(self, dt: float):
         if self.current is None:
@@ -378,7 +835,7 @@ class AnimationController:
         anim.draw(surface, x, y, flip)
 
     def change(self, name: str, reset: bool = True):
-        if name not in self.animations:
+        if self._resolve(name) is None:
             return
         if self.current == name:
             return
@@ -392,4 +849,19 @@ class AnimationController:
         self.animations[name] = animation
 
     def set_speed(self, speed: float):
-        self.speed = speed
\ No newline at end of file
+        self.speed = speed
+
+    def get_state(self):
+        """Плейхед для снапшота: (текущая анимация, кадр, таймер)"""
+        anim = self.animations.get(self.current) if self.current is not None else None
+        if anim is None:
+            return (self.current, 0, 0.0)
+        return (self.current, anim.index, anim.timer)
+
+    def set_state(self, state):
+        """Восстанавливает плейхед из get_state() (кадры и ассеты не трогаются)"""
+        self.current, index, timer = state
+        anim = self._resolve(self.current) if self.current is not None else None
+        if anim is not None:
+            anim.index = index
+            anim.timer = timer
\ No newline at end of file
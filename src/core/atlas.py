@@ -0,0 +1,222 @@
+# src/core/atlas.py
+"""
+Texture atlas
+-------------
+Офлайн-упаковщик кадров анимаций в атласы (несколько больших листов + JSON индекс).
+
+Структура до упаковки:
+  Sprites/<character>/<skin>/<anim_name>/*.png|*.jpg
+
+После упаковки в папке скина появляются:
+  atlas_0.png, atlas_1.png, ...  - листы с кадрами
+  atlas.json                     - индекс: для каждой анимации список [лист, x, y, w, h]
+
+ResourceManager загружает листы один раз и отдает кадры как subsurface листа,
+вместо сотен отдельных Surface и открытий файлов.
+
+Запуск упаковщика:
+  python -m src.core.atlas            # все персонажи в Sprites
+  python -m src.core.atlas Sprites/chara
+"""
+
+import json
+import os
+import sys
+
+import pygame
+
+ATLAS_INDEX = "atlas.json"
+ATLAS_SHEET = "atlas_{}.png"
+ATLAS_VERSION = 1
+MAX_SHEET_SIZE = 2048
+FRAME_PADDING = 1
+FRAME_EXTENSIONS = ('.png', '.jpg', '.jpeg')
+
+
+def list_animation_frames(skin_dir):
+    """
+    Возвращает { anim_name: [пути к кадрам] } для папки скина.
+    Кадры сортируются по имени файла - как в ResourceManager.
+    """
+    animations = {}
+    for anim_name in sorted(os.listdir(skin_dir)):
+        anim_dir = os.path.join(skin_dir, anim_name)
+        if not os.path.isdir(anim_dir):
+            continue
+        frame_files = sorted(f for f in os.listdir(anim_dir) if f.lower().endswith(FRAME_EXTENSIONS))
+        if frame_files:
+            animations[anim_name] = [os.path.join(anim_dir, f) for f in frame_files]
+    return animations
+
+
+def pack_frames(sizes, max_sheet_size=MAX_SHEET_SIZE, padding=FRAME_PADDING):
+    """
+    Полочная упаковка (shelf packing) прямоугольников по листам.
+    sizes: список (w, h)
+    Возвращает (placements, sheet_sizes):
+      placements[i] = (sheet_index, x, y)
+      sheet_sizes[s] = (width, height) - обрезанный по содержимому размер листа
+    """
+    order = sorted(range(len(sizes)), key=lambda i: (sizes[i][1], sizes[i][0]), reverse=True)
+    placements = [None] * len(sizes)
+    sheet_sizes = []
+
+    sheet = -1
+    shelf_x = shelf_y = shelf_h = 0
+    used_w = used_h = 0
+
+    def close_sheet():
+        if sheet >= 0:
+            sheet_sizes.append((max(1, used_w), max(1, used_h)))
+
+    for i in order:
+        w, h = sizes[i]
+        pw, ph = w + padding, h + padding
+
+        # Новая полка, если кадр не влезает по ширине
+        if sheet >= 0 and shelf_x + pw > max_sheet_size and shelf_x > 0:
+            shelf_y += shelf_h
+            shelf_x = shelf_h = 0
+
+        # Новый лист, если кадр не влезает по высоте
+        if sheet < 0 or (shelf_y + ph > max_sheet_size and shelf_y > 0):
+            close_sheet()
+            sheet += 1
+            shelf_x = shelf_y = shelf_h = 0
+            used_w = used_h = 0
+
+        placements[i] = (sheet, shelf_x, shelf_y)
+        shelf_x += pw
+        shelf_h = max(shelf_h, ph)
+        used_w = max(used_w, shelf_x - padding)
+        used_h = max(used_h, shelf_y + h)
+
+    close_sheet()
+    return placements, sheet_sizes
+
+
+def build_skin_atlas(skin_dir, max_sheet_size=MAX_SHEET_SIZE, padding=FRAME_PADDING):
+    """Упаковывает все анимации скина в листы атласа и пишет atlas.json"""
+    animations = list_animation_frames(skin_dir)
+    if not animations:
+        return None
+
+    frames = []  # (anim_name, Surface)
+    for anim_name, paths in animations.items():
+        for path in paths:
+            frames.append((anim_name, pygame.image.load(path)))
+
+    placements, sheet_sizes = pack_frames([surf.get_size() for _, surf in frames],
+                                          max_sheet_size, padding)
+
+    sheets = [pygame.Surface(size, pygame.SRCALPHA) for size in sheet_sizes]
+    for sheet in sheets:
+        sheet.fill((0, 0, 0, 0))
+
+    index = {"version": ATLAS_VERSION, "sheets": [], "animations": {}}
+    for (anim_name, surf), (sheet_i, x, y) in zip(frames, placements):
+        sheets[sheet_i].blit(surf, (x, y))
+        w, h = surf.get_size()
+        index["animations"].setdefault(anim_name, []).append([sheet_i, x, y, w, h])
+
+    for sheet_i, sheet in enumerate(sheets):
+        name = ATLAS_SHEET.format(sheet_i)
+        pygame.image.save(sheet, os.path.join(skin_dir, name))
+        index["sheets"].append(name)
+
+    with open(os.path.join(skin_dir, ATLAS_INDEX), "w", encoding="utf-8") as f:
+        json.dump(index, f, ensure_ascii=False)
+
+    print(f"🧩 Атлас {skin_dir}: {len(frames)} кадров -> {len(sheets)} лист(ов)")
+    return index
+
+
+def is_atlas_fresh(skin_dir):
+    """
+    Атлас актуален, если atlas.json новее всех папок анимаций (добавление/удаление
+    кадров меняет mtime папки) и всех файлов кадров (правка PNG на месте меняет
+    только mtime самого файла).
+    """
+    index_path = os.path.join(skin_dir, ATLAS_INDEX)
+    try:
+        index_mtime = os.stat(index_path).st_mtime
+    except OSError:
+        return False
+    for anim_name in os.listdir(skin_dir):
+        anim_dir = os.path.join(skin_dir, anim_name)
+        if not os.path.isdir(anim_dir):
+            continue
+        if os.stat(anim_dir).st_mtime > index_mtime:
+            return False
+        with os.scandir(anim_dir) as entries:
+            for entry in entries:
+                if entry.name.lower().endswith(FRAME_EXTENSIONS) and entry.stat().st_mtime > index_mtime:
+                    return False
+    return True
+
+
+def read_atlas_index(skin_dir):
+    """
+    Индекс атласа без загрузки листов: { anim_name: [(путь к листу, (x, y, w, h))] }
+    или None, если атласа нет или он устарел.
+    """
+    if not is_atlas_fresh(skin_dir):
+        return None
+    try:
+        with open(os.path.join(skin_dir, ATLAS_INDEX), "r", encoding="utf-8") as f:
+            index = json.load(f)
+        if index.get("version") != ATLAS_VERSION:
+            return None
+        sheets = [os.path.join(skin_dir, name) for name in index["sheets"]]
+        return {anim_name: [(sheets[s], (x, y, w, h)) for s, x, y, w, h in rects]
+                for anim_name, rects in index["animations"].items()}
+    except Exception as e:
+        print(f"⚠️ Ошибка чтения атласа {skin_dir}: {e}")
+        return None
+
+
+def load_skin_atlas(skin_dir, load_image):
+    """
+    Загружает анимации скина из атласа.
+    load_image(path) -> Surface (обычно ResourceManager.load_image с кэшем и convert_alpha)
+    Возвращает { anim_name: [subsurface] } или None, если атласа нет или он устарел.
+    """
+    index = read_atlas_index(skin_dir)
+    if index is None:
+        return None
+    try:
+        return {anim_name: [load_image(sheet).subsurface(rect) for sheet, rect in frames]
+                for anim_name, frames in index.items()}
+    except Exception as e:
+        print(f"⚠️ Ошибка загрузки атласа {skin_dir}: {e}")
+        return None
+
+
+def build_all(root):
+    """
+    Строит атласы для всех скинов внутри root (Sprites или Sprites/<character>).
+    Папка скина - та, у которой все подпапки содержат кадры.
+    """
+    built = 0
+    for dirpath, dirnames, filenames in os.walk(root):
+        if dirpath == root or not dirnames:
+            continue
+        if all(_is_frame_dir(os.path.join(dirpath, d)) for d in dirnames):
+            if build_skin_atlas(dirpath):
+                built += 1
+            dirnames[:] = []  # внутрь папок анимаций не спускаемся
+    return built
+
+
+def _is_frame_dir(path):
+    try:
+        return any(f.lower().endswith(FRAME_EXTENSIONS) for f in os.listdir(path))
+    except OSError:
+        return False
+
+
+if __name__ == "__main__":
+    root = sys.argv[1] if len(sys.argv) > 1 else "Sprites"
+    pygame.init()
+    count = build_all(root)
+    print(f"✅ Собрано атласов: {count}")
@@ -0,0 +1,165 @@
+# src/core/body_store.py
+"""
+Массивное хранилище тел для PhysicsWorld (struct of arrays)
+----------------------------------------------------------
+Позиции, скорости, размеры и флаги всех тел лежат в непрерывных массивах NumPy,
+а гравитация, интеграция и прижатие к полу считаются одной векторной операцией
+на все тела сразу - без hasattr и вызова update() на каждое тело.
+Для частиц супер-ударов и множества headless-боев в одном процессе.
+
+Снаружи тело выглядит как BodyProxy - тонкая обертка с интерфейсом Entity
+(x, y, velocity_x, velocity_y, is_airborne, is_facing_right, rect,
+set_position, save_previous, get_render_pos). Прокси хранит только индекс строки.
+
+Освобожденные строки переиспользуются, массивы растут удвоением.
+NumPy загружается лениво (video_backend.get_numpy) - только если хранилище создают.
+"""
+
+import pygame
+
+from src.core.video_backend import get_numpy
+
+INITIAL_CAPACITY = 64
+
+
+class BodyStore:
+    """Тела в массивах: pos/prev/vel/size - (capacity, 2), флаги - (capacity,)"""
+    def __init__(self, capacity=INITIAL_CAPACITY):
+        np = get_numpy()
+        self.capacity = max(1, int(capacity))
+        self.pos = np.zeros((self.capacity, 2), dtype=np.float64)
+        self.prev = np.zeros((self.capacity, 2), dtype=np.float64)
+        self.vel = np.zeros((self.capacity, 2), dtype=np.float64)
+        self.size = np.zeros((self.capacity, 2), dtype=np.float64)
+        self.airborne = np.zeros(self.capacity, dtype=bool)
+        self.facing_right = np.ones(self.capacity, dtype=bool)
+        self.active = np.zeros(self.capacity, dtype=bool)
+        self.free = list(range(self.capacity - 1, -1, -1))  # свободные строки (pop() - самая младшая)
+        self.count = 0
+
+    def _grow(self):
+        np = get_numpy()
+        old = self.capacity
+        self.capacity = old * 2
+        for name in ("pos", "prev", "vel", "size", "airborne", "facing_right", "active"):
+            array = getattr(self, name)
+            grown = np.zeros((self.capacity,) + array.shape[1:], dtype=array.dtype)
+            grown[:old] = array
+            setattr(self, name, grown)
+        self.facing_right[old:] = True
+        self.free.extend(range(self.capacity - 1, old - 1, -1))
+
+    def add(self, x, y, width, height, velocity_x=0.0, velocity_y=0.0, is_airborne=False):
+        """Новое тело - возвращает BodyProxy"""
+        if not self.free:
+            self._grow()
+        i = self.free.pop()
+        self.pos[i] = self.prev[i] = (x, y)
+        self.vel[i] = (velocity_x, velocity_y)
+        self.size[i] = (width, height)
+        self.airborne[i] = is_airborne
+        self.facing_right[i] = True
+        self.active[i] = True
+        self.count += 1
+        return BodyProxy(self, i)
+
+    def remove(self, proxy):
+        i = proxy.index
+        if self.active[i]:
+            self.active[i] = False
+            self.vel[i] = 0
+            self.free.append(i)
+            self.count -= 1
+
+    def save_previous(self):
+        """Позиции перед тиком для всех тел (интерполяция отрисовки)"""
+        self.prev[:] = self.pos
+
+    def step(self, dt, gravity, ground_y):
+        """Гравитация -> интеграция -> пол, векторно по всем активным телам"""
+        active = self.active
+        falling = active & self.airborne
+        self.vel[falling, 1] += gravity * dt
+        self.pos[active] += self.vel[active] * dt
+
+        # Пол: как в PhysicsWorld.step - нижний край по целому rect
+        bottom = self.pos[:, 1].astype(int) + self.size[:, 1]
+        landed = active & (bottom >= ground_y)
+        self.pos[landed, 1] = ground_y - self.size[landed, 1]
+        self.vel[landed, 1] = 0
+        self.airborne[landed] = False
+
+
+class BodyProxy:
+    """Тело из BodyStore с интерфейсом Entity"""
+    __slots__ = ("store", "index")
+
+    def __init__(self, store, index):
+        self.store = store
+        self.index = index
+
+    @property
+    def x(self):
+        return float(self.store.pos[self.index, 0])
+
+    @x.setter
+    def x(self, value):
+        self.store.pos[self.index, 0] = value
+
+    @property
+    def y(self):
+        return float(self.store.pos[self.index, 1])
+
+    @y.setter
+    def y(self, value):
+        self.store.pos[self.index, 1] = value
+
+    @property
+    def velocity_x(self):
+        return float(self.store.vel[self.index, 0])
+
+    @velocity_x.setter
+    def velocity_x(self, value):
+        self.store.vel[self.index, 0] = value
+
+    @property
+    def velocity_y(self):
+        return float(self.store.vel[self.index, 1])
+
+    @velocity_y.setter
+    def velocity_y(self, value):
+        self.store.vel[self.index, 1] = value
+
+    @property
+    def is_airborne(self):
+        return bool(self.store.airborne[self.index])
+
+    @is_airborne.setter
+    def is_airborne(self, value):
+        self.store.airborne[self.index] = value
+
+    @property
+    def is_facing_right(self):
+        return bool(self.store.facing_right[self.index])
+
+    @is_facing_right.setter
+    def is_facing_right(self, value):
+        self.store.facing_right[self.index] = value
+
+    @property
+    def rect(self):
+        """Целочисленный Rect (копия - изменения в нем не сохраняются, используй x/y)"""
+        x, y = self.store.pos[self.index]
+        w, h = self.store.size[self.index]
+        return pygame.Rect(int(x), int(y), int(w), int(h))
+
+    def set_position(self, x, y):
+        self.store.pos[self.index] = self.store.prev[self.index] = (x, y)
+
+    def save_previous(self):
+        self.store.prev[self.index] = self.store.pos[self.index]
+
+    def get_render_pos(self, alpha=1.0):
+        prev_x, prev_y = self.store.prev[self.index]
+        x, y = self.store.pos[self.index]
+        return int(prev_x + (x - prev_x) * alpha), int(prev_y + (y - prev_y) * alpha)
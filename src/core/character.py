@@ -1,20 +1,26 @@
 # src/core/character.py
 import pygame
 from src.core.entity import Entity
-from src.core.animations import AnimationController, Animation
+from src.core.animations import AnimationController
+
+# Анимации, которые нужны в каждом бою (интро, стойка, победа) - их кадры
+# декодируются на загрузке, остальные - при первом play_animation
+PREFETCH_ANIMATIONS = ("idle", "intro", "victory")
 
 class Character(Entity):
     """
     Упрощённый Character, интегрированный с AnimationController.
-    Конструктор: Character(name, resource_manager, x=100, y=400)
+    Конструктор: Character(name, resource_manager, x=100, y=400, skin=None)
+    skin - скин из каталога ResourceManager (нет такого - первый найденный).
     resource_manager должен предоставлять метод get_image(character, skin, anim_name, frame_index)
     или можно позже заполнить animations вручную.
     """
-    def __init__(self, name, resource_manager=None, x=100, y=400):
+    def __init__(self, name, resource_manager=None, x=100, y=400, skin=None):
         # hitbox 80x160 по умолчанию
         super().__init__(x, y, 80, 160)
         self.name = name
         self.resource_manager = resource_manager
+        self.skin = skin
 
         self.is_facing_right = True
 
@@ -27,49 +33,89 @@ class Character(Entity):
         # Попытка автоматически подгрузить базовые анимации при наличии resource_manager
         self._load_stub_animations()
         # стартовая анимация
-        if self.anim.current is None and "idle" in self.anim.animations:
+        if self.anim.current is None:
             self.play_animation("idle")
 
     def _load_stub_animations(self):
         """
-        Попытка загрузить из resource_manager: ожидаем структуру
-        resource_manager.get_skin_animations(name, skin) -> { anim: [frames] }
-        Здесь просто проверяем, если есть, создаём Animation объекты.
+        Подключает анимации из resource_manager, если каталог скинов персонажа
+        уже просканирован (load_character_skins). Плейхеды создаются по первому
+        запросу анимации, клипы (кадры, отраженные кадры) - общие в ResourceManager.
         """
         if not self.resource_manager:
             return
 
-        # пытаемся взять default skin
-        skins = self.resource_manager._skins.get(self.name, {})
-        # если есть хотя бы один скин - берем первый
-        skin_name = None
-        if skins:
-            # взять первый ключ
-            skin_name = list(skins.keys())[0]
-
-        if not skin_name:
+        # запрошенный скин, если он есть, иначе default - первый найденный
+        if self.name not in self.resource_manager._catalog:
+            return
+        self.skin = self.resource_manager.resolve_skin(self.name, self.skin)
+        if not self.skin:
             return
+        self.anim.animations = {}
+        self.anim.clip_source = self._get_clip
 
-        anims = skins.get(skin_name, {})
-        for anim_name, frames in anims.items():
-            # frames уже pygame.Surface list
-            if not frames:
-                continue
-            animation = Animation(frames, fps=12, loop=True)
-            self.anim.add(anim_name, animation)
+    def _get_clip(self, anim_name):
+        return self.resource_manager.get_clip(self.name, self.skin, anim_name)
+
+    def reload_animations(self):
+        """
+        Загружает скины через resource_manager и пересоздает анимации.
+        Вызывается после фоновой предзагрузки (LoadingScene), когда все кадры
+        уже в кэше ResourceManager и загрузка не трогает диск.
+        """
+        if not self.resource_manager:
+            return
+        self.resource_manager.load_character_skins(self.name)
+        self._load_stub_animations()
+        self.anim.prefetch(PREFETCH_ANIMATIONS)
+        if self.anim.current is None:
+            self.play_animation("idle")
 
     def play_animation(self, name: str):
         """Включает named анимацию (если есть)."""
         self.anim.change(name, reset=True)
 
+    @property
+    def box_frame(self):
+        """Текущий кадр анимации - по нему коробки с FrameBoxTable (HitBox.bind) берут данные кадра"""
+        anim = self.anim.animations.get(self.anim.current)
+        return anim.index if anim else 0
+
     def update(self, dt: float):
         """Обновление персонажа: анимация, физика (если нужно)."""
         # обновляем анимацию
         self.anim.update(dt)
+        # интегрируем позицию
+        super().update(dt)
         # логика движений/стейтов добавлять здесь
 
-    def draw(self, surface: pygame.Surface):
-        """Рисуем текущую анимацию в позиции rect.x/y."""
+    def draw(self, surface: pygame.Surface, alpha: float = 1.0):
+        """
+        Рисуем текущую анимацию.
+        alpha - доля между предыдущим и текущим тиком (интерполяция при фиксированном шаге).
+        """
         # flip в зависимости от is_facing_right
         flip = not self.is_facing_right
-        self.anim.draw(surface, int(self.rect.x), int(self.rect.y), flip=flip)
\ No newline at end of file
+        x, y = self.get_render_pos(alpha)
+        self.anim.draw(surface, x, y, flip=flip)
+
+    def get_state(self):
+        """
+        Компактный снапшот бойца (кортеж чисел и строк): позиция, скорость,
+        направление, hp, Stats (hp, meter) и плейхед анимации.
+        """
+        stats = (self.stats.hp, self.stats.meter) if self.stats else None
+        return (self.x, self.y, self.prev_x, self.prev_y, self.velocity_x, self.velocity_y,
+                self.is_facing_right, getattr(self, "is_airborne", False), self.hp, stats,
+                self.anim.get_state())
+
+    def set_state(self, state):
+        """Восстанавливает бойца из get_state() без пересоздания и загрузки ассетов"""
+        (self.x, self.y, self.prev_x, self.prev_y, self.velocity_x, self.velocity_y,
+         self.is_facing_right, is_airborne, self.hp, stats, anim_state) = state
+        if is_airborne or hasattr(self, "is_airborne"):
+            self.is_airborne = is_airborne
+        if stats and self.stats:
+            self.stats.hp, self.stats.meter = stats
+        self.anim.set_state(anim_state)
+        self._sync_rect()
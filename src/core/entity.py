@@ -6,15 +6,43 @@ class Entity(abc.ABC):
     """Базовый объект мира"""
     def __init__(self, x, y, width, height):
         self.rect = pygame.Rect(x, y, width, height)
+        # Точная позиция (float) - rect хранит только целые пиксели
+        self.x = float(x)
+        self.y = float(y)
+        # Позиция на предыдущем тике - для интерполяции при отрисовке
+        self.prev_x = self.x
+        self.prev_y = self.y
         self.velocity_x = 0  # Скорость по x
         self.velocity_y = 0  # Скорость по y
         self.is_facing_right = True  # Для персонажей и камео
         self.sprite = None  # ✅ ДОБАВЛЕНО: инициализация sprite
 
-    def update(self, dt):  # dt - Время между кадрами
+    def update(self, dt):  # dt - Время между кадрами (в бою - фиксированный тик)
         """Обновление позиции"""
-        self.rect.x += self.velocity_x * dt
-        self.rect.y += self.velocity_y * dt
+        self.x += self.velocity_x * dt
+        self.y += self.velocity_y * dt
+        self._sync_rect()
+
+    def set_position(self, x, y):
+        """Перемещает объект (без интерполяции с предыдущей позицией)"""
+        self.x = self.prev_x = float(x)
+        self.y = self.prev_y = float(y)
+        self._sync_rect()
+
+    def save_previous(self):
+        """Запоминает позицию перед тиком симуляции"""
+        self.prev_x = self.x
+        self.prev_y = self.y
+
+    def get_render_pos(self, alpha=1.0):
+        """Позиция для отрисовки между предыдущим и текущим тиком"""
+        x = self.prev_x + (self.x - self.prev_x) * alpha
+        y = self.prev_y + (self.y - self.prev_y) * alpha
+        return int(x), int(y)
+
+    def _sync_rect(self):
+        self.rect.x = int(self.x)
+        self.rect.y = int(self.y)
     
     @abc.abstractmethod
     def draw(self, surface):
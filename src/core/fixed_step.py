@@ -0,0 +1,50 @@
+# src/core/fixed_step.py
+"""
+Фиксированный шаг симуляции
+---------------------------
+Симуляция (бой, физика, анимации бойцов) всегда продвигается шагами по TICK_DT,
+независимо от FPS. Реальное время кадра копится в аккумуляторе и расходуется
+целыми тиками; остаток (alpha) используется при отрисовке для интерполяции
+между двумя последними состояниями.
+
+Одинаковые входные данные -> одинаковая последовательность тиков с одним и тем же dt
+-> побитово одинаковое состояние (нужно для реплеев, сетевой игры и обучения бота).
+
+Сцена получает тики, если у нее есть метод fixed_update(dt) - его вызывает GameManager.
+"""
+
+TICK_RATE = 60
+TICK_DT = 1.0 / TICK_RATE
+# Не больше стольких тиков за кадр: после долгого фриза симуляция не пытается
+# догнать все время сразу (иначе каждый следующий кадр будет еще дольше)
+MAX_TICKS_PER_FRAME = 5
+
+
+class FixedStepClock:
+    def __init__(self, tick_rate=TICK_RATE, max_ticks=MAX_TICKS_PER_FRAME):
+        self.tick_rate = tick_rate
+        self.dt = 1.0 / tick_rate
+        self.max_ticks = max_ticks
+        self.accumulator = 0.0
+        self.tick = 0  # номер тика с последнего reset()
+
+    def reset(self):
+        self.accumulator = 0.0
+        self.tick = 0
+
+    def advance(self, frame_dt):
+        """Добавляет время кадра и возвращает, сколько тиков нужно выполнить"""
+        self.accumulator += frame_dt
+        ticks = int(self.accumulator / self.dt)
+        if ticks > self.max_ticks:
+            ticks = self.max_ticks
+            self.accumulator = 0.0  # отставание выбрасываем
+        else:
+            self.accumulator -= ticks * self.dt
+        self.tick += ticks
+        return ticks
+
+    @property
+    def alpha(self):
+        """Доля следующего тика, уже прошедшая в реальном времени (0..1) - для интерполяции"""
+        return min(1.0, self.accumulator / self.dt)
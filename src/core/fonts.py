@@ -0,0 +1,111 @@
+# src/core/fonts.py
+"""
+Реестр шрифтов и кэш отрисованного текста
+-----------------------------------------
+pygame.font.SysFont на каждый вызов ищет шрифт в системе и открывает файл,
+а Font.render растеризует строку заново. В меню это происходило каждый кадр.
+
+ - get_font(size, bold)  - Font создается один раз на (размер, жирность)
+ - render_text(...)      - LRU-кэш готовых Surface по (текст, размер, жирность, цвет)
+ - fit_text(...)         - подбор размера "ужать до ширины" с LRU-кэшем результата
+ - CachedFont            - обертка над Font, у которой render() идет через кэш;
+                           ее возвращает BaseScene.get_font, поэтому сцены
+                           получают кэш без изменений в коде отрисовки
+
+Закэшированные Surface общие для всех - их можно только blit'ить, не изменять.
+Кэш текста сбрасывается при смене языка и масштаба (SettingsManager).
+"""
+
+from collections import OrderedDict
+
+import pygame
+
+FONT_NAME = "arial"
+TEXT_CACHE_SIZE = 512  # Сколько отрисованных строк держим в памяти
+
+_fonts = {}                  # { (size, bold): pygame.font.Font }
+_text_cache = OrderedDict()  # { (text, size, bold, color, antialias, background): Surface }
+_fit_cache = OrderedDict()   # { (text, max_width, max_size, min_size, bold): size }
+_stats = {"hits": 0, "misses": 0, "fonts": 0}
+
+
+def get_font(size, bold=False):
+    """Font нужного размера в пикселях (создается один раз)"""
+    key = (int(size), bool(bold))
+    font = _fonts.get(key)
+    if font is None:
+        if not pygame.font.get_init():
+            pygame.font.init()
+        font = pygame.font.SysFont(FONT_NAME, key[0], bold=key[1])
+        _fonts[key] = font
+        _stats["fonts"] += 1
+    return font
+
+
+def render_text(text, size, bold=False, color=(255, 255, 255), antialias=True, background=None):
+    """Отрисованная строка из LRU-кэша (растеризуется только при первом запросе)"""
+    key = (str(text), int(size), bool(bold), tuple(color), bool(antialias),
+           tuple(background) if background is not None else None)
+    surface = _text_cache.get(key)
+    if surface is not None:
+        _text_cache.move_to_end(key)
+        _stats["hits"] += 1
+        return surface
+
+    _stats["misses"] += 1
+    font = get_font(size, bold)
+    if background is None:
+        surface = font.render(key[0], antialias, color)
+    else:
+        surface = font.render(key[0], antialias, color, background)
+    _text_cache[key] = surface
+    if len(_text_cache) > TEXT_CACHE_SIZE:
+        _text_cache.popitem(last=False)
+    return surface
+
+
+def fit_text(text, max_width, max_size, min_size, bold=False, color=(255, 255, 255)):
+    """
+    Строка самого большого размера от max_size до min_size, влезающая в max_width.
+    Подобранный размер запоминается - цикл подбора выполняется один раз.
+    """
+    key = (str(text), int(max_width), int(max_size), int(min_size), bool(bold))
+    size = _fit_cache.get(key)
+    if size is not None:
+        _fit_cache.move_to_end(key)
+    else:
+        size = int(max_size)
+        while size > min_size and get_font(size, bold).size(key[0])[0] > max_width:
+            size -= 1
+        _fit_cache[key] = size
+        if len(_fit_cache) > TEXT_CACHE_SIZE:
+            _fit_cache.popitem(last=False)
+    return render_text(text, size, bold, color)
+
+
+def clear_text_cache():
+    """Сбрасывает отрисованный текст (смена языка или масштаба)"""
+    _text_cache.clear()
+    _fit_cache.clear()
+
+
+def cache_stats():
+    """Статистика кэша: попадания, промахи, созданные шрифты, строк в кэше"""
+    return dict(_stats, cached=len(_text_cache))
+
+
+class CachedFont:
+    """
+    Font с кэшированным render().
+    Остальные методы (size, get_height, get_linesize, ...) передаются исходному Font.
+    """
+    def __init__(self, size, bold=False):
+        self.font_size = int(size)
+        self.bold = bool(bold)
+        self.font = get_font(size, bold)
+
+    def render(self, text, antialias, color, background=None):
+        return render_text(text, self.font_size, self.bold, color, antialias, background)
+
+    def __getattr__(self, name):
+        return getattr(self.font, name)
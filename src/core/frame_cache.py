@@ -0,0 +1,297 @@
+# src/core/frame_cache.py
+"""
+Дисковый кэш декодированных кадров видео
+----------------------------------------
+Хранит уже масштабированные RGB-кадры арт-видео, чтобы при следующих запусках
+не декодировать MP4 заново.
+
+Кэш лежит в папке данных пользователя (user_data_path): в собранном .exe папка
+бандла (_MEIPASS) может быть только для чтения.
+
+Формат:
+ - <cache_dir>/index.json - индекс записей
+ - <cache_dir>/<key>.rgb  - сырые кадры подряд (uint8, frames x height x width x 3)
+
+Ключ записи - (путь к видео, mtime видео, целевой размер).
+Файл кадров открывается через memory-map, поэтому загрузка почти не тратит CPU:
+страницы читаются с диска только когда кадр реально показывается.
+
+Вытеснение:
+ - записи для удаленных или измененных видео (другой mtime) удаляются при старте и при поиске
+ - при записи нового размера для видео старые разрешения этого видео удаляются
+   (оставляется не более max_sizes_per_video последних размеров)
+ - файлы *.rgb без записи в индексе, старше самого индекса, удаляются при старте;
+   временные файлы писателей (уникальные имена, mkstemp) не трогаются -
+   их может дописывать другой процесс
+"""
+
+import hashlib
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from typing import Optional, Tuple
+
+from src.core.video_backend import get_numpy
+
+FRAME_CACHE_DIR = os.path.join("cache", "frames")
+INDEX_FILE = "index.json"
+FRAME_CHANNELS = 3
+USER_DATA_DIR = "VillianWar"
+
+
+def user_data_path(relative_path):
+    """
+    Путь для файлов, которые пишет игра: в .exe - %LOCALAPPDATA%/VillianWar
+    (или ~/.cache/VillianWar) - папка бандла может быть только для чтения,
+    при запуске из .py - папка проекта
+    """
+    if hasattr(sys, "_MEIPASS"):
+        base_path = os.environ.get("LOCALAPPDATA") or os.path.join(os.path.expanduser("~"), ".cache")
+        base_path = os.path.join(base_path, USER_DATA_DIR)
+    else:
+        base_path = os.path.abspath(".")
+    return os.path.join(base_path, relative_path)
+
+
+class CachedFrames:
+    """Кадры одной записи кэша, открытые через memory-map"""
+    def __init__(self, path: str, frame_count: int, size: Tuple[int, int], fps: int):
+        self.path = path
+        self.frame_count = frame_count
+        self.size = size
+        self.fps = fps
+        width, height = size
+        np = get_numpy()
+        self.frames = np.memmap(path, dtype=np.uint8, mode="r",
+                                shape=(frame_count, height, width, FRAME_CHANNELS))
+
+    def get(self, index: int):
+        """Возвращает кадр как массив (height, width, 3) без копирования"""
+        return self.frames[index]
+
+
+class FrameCacheWriter:
+    """
+    Пишет кадры одного видео во временный файл по мере декодирования.
+    Запись попадает в индекс только после commit() - недописанный проход
+    (остановка, перемотка) не оставляет битых записей.
+    """
+    def __init__(self, cache, key: str, meta: dict):
+        self.cache = cache
+        self.key = key
+        self.meta = meta
+        self.frame_count = 0
+        # Уникальное имя: то же видео может писать другой поток или процесс
+        fd, self.tmp_path = tempfile.mkstemp(prefix=f"{key}.", suffix=".rgb.tmp", dir=cache.cache_dir)
+        self._file = os.fdopen(fd, "wb")
+
+    def write(self, frame_rgb):
+        height, width = frame_rgb.shape[:2]
+        if (width, height) != tuple(self.meta["size"]):
+            raise ValueError(f"размер кадра {width}x{height} не совпадает с {self.meta['size']}")
+        np = get_numpy()
+        self._file.write(np.ascontiguousarray(frame_rgb, dtype=np.uint8).tobytes())
+        self.frame_count += 1
+
+    def commit(self, fps: int):
+        """Завершает запись и регистрирует ее в индексе"""
+        self._file.close()
+        if self.frame_count == 0:
+            self.abort()
+            return
+        self.meta["frames"] = self.frame_count
+        self.meta["fps"] = fps
+        self.cache._commit(self.key, self.meta, self.tmp_path)
+
+    def abort(self):
+        """Отменяет запись и удаляет временный файл"""
+        if not self._file.closed:
+            self._file.close()
+        try:
+            os.remove(self.tmp_path)
+        except OSError:
+            pass
+
+
+class FrameCache:
+    """Менеджер дискового кэша кадров"""
+    def __init__(self, cache_dir: str = None, max_sizes_per_video: int = 1):
+        self.cache_dir = cache_dir or user_data_path(FRAME_CACHE_DIR)
+        self.max_sizes_per_video = max(1, max_sizes_per_video)
+        self.index_path = os.path.join(self.cache_dir, INDEX_FILE)
+        self._lock = threading.Lock()
+        self._index = {}
+        self.enabled = True
+
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+        except OSError as e:
+            print(f"⚠️ Кэш кадров отключен, нет доступа к {self.cache_dir}: {e}")
+            self.enabled = False
+            return
+
+        self._load_index()
+        self._evict_invalid()
+
+    # ---------- ключи ----------
+
+    @staticmethod
+    def _video_stamp(actual_path: str):
+        """(абсолютный путь, mtime в наносекундах) или None если файла нет"""
+        try:
+            return os.path.abspath(actual_path), os.stat(actual_path).st_mtime_ns
+        except OSError:
+            return None
+
+    @staticmethod
+    def make_key(video: str, mtime_ns: int, size: Tuple[int, int]) -> str:
+        raw = f"{video}|{mtime_ns}|{size[0]}x{size[1]}"
+        return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:20]
+
+    # ---------- индекс ----------
+
+    def _load_index(self):
+        try:
+            if os.path.exists(self.index_path):
+                with open(self.index_path, "r", encoding="utf-8") as f:
+                    self._index = json.load(f)
+        except Exception as e:
+            print(f"⚠️ Индекс кэша кадров поврежден, начинаем заново: {e}")
+            self._index = {}
+
+    def _save_index(self):
+        tmp_path = self.index_path + ".tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self._index, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_path, self.index_path)
+        except Exception as e:
+            print(f"❌ Ошибка сохранения индекса кэша кадров: {e}")
+
+    def _remove_entry(self, key: str):
+        meta = self._index.pop(key, None)
+        if meta:
+            try:
+                os.remove(os.path.join(self.cache_dir, meta["file"]))
+            except OSError:
+                pass
+
+    def _evict_invalid(self):
+        """
+        Удаляет записи для удаленных/измененных видео и файлы кадров без записи в индексе.
+        Файл без записи удаляется, только если он старше индекса: более новый мог
+        только что закоммитить другой процесс, а его индекс мы еще не прочитали.
+        """
+        with self._lock:
+            changed = False
+            for key, meta in list(self._index.items()):
+                stamp = self._video_stamp(meta.get("video", ""))
+                data_path = os.path.join(self.cache_dir, meta.get("file", ""))
+                if stamp is None or stamp[1] != meta.get("mtime") or not os.path.exists(data_path):
+                    self._remove_entry(key)
+                    changed = True
+
+            known_files = {meta["file"] for meta in self._index.values()}
+            try:
+                index_mtime = os.stat(self.index_path).st_mtime
+            except OSError:
+                index_mtime = None  # индекса нет - не знаем, чьи это файлы
+            for fname in os.listdir(self.cache_dir):
+                if index_mtime is None or not fname.endswith(".rgb") or fname in known_files:
+                    continue
+                path = os.path.join(self.cache_dir, fname)
+                try:
+                    if os.stat(path).st_mtime < index_mtime:
+                        os.remove(path)
+                except OSError:
+                    pass
+
+            if changed:
+                self._save_index()
+
+    # ---------- публичный API ----------
+
+    def lookup(self, actual_path: str, size: Tuple[int, int]) -> Optional[CachedFrames]:
+        """Ищет готовые кадры для видео нужного размера"""
+        if not self.enabled or not size:
+            return None
+        stamp = self._video_stamp(actual_path)
+        if stamp is None:
+            return None
+        video, mtime_ns = stamp
+
+        with self._lock:
+            # Видео изменилось - старые записи для него больше не нужны
+            stale = [k for k, m in self._index.items() if m["video"] == video and m["mtime"] != mtime_ns]
+            for key in stale:
+                self._remove_entry(key)
+            if stale:
+                self._save_index()
+
+            key = self.make_key(video, mtime_ns, size)
+            meta = self._index.get(key)
+            if not meta:
+                return None
+            meta["last_used"] = time.time()
+
+        try:
+            return CachedFrames(os.path.join(self.cache_dir, meta["file"]), meta["frames"],
+                                tuple(meta["size"]), meta["fps"])
+        except Exception as e:
+            print(f"⚠️ Не удалось открыть кэш кадров {meta['file']}: {e}")
+            with self._lock:
+                self._remove_entry(key)
+                self._save_index()
+            return None
+
+    def create_writer(self, actual_path: str, size: Tuple[int, int]) -> Optional[FrameCacheWriter]:
+        """Создает писатель для кадров видео заданного размера"""
+        if not self.enabled or not size:
+            return None
+        stamp = self._video_stamp(actual_path)
+        if stamp is None:
+            return None
+        video, mtime_ns = stamp
+        key = self.make_key(video, mtime_ns, size)
+        meta = {
+            "video": video,
+            "mtime": mtime_ns,
+            "size": [int(size[0]), int(size[1])],
+            "file": f"{key}.rgb",
+        }
+        try:
+            return FrameCacheWriter(self, key, meta)
+        except OSError as e:
+            print(f"⚠️ Не удалось создать запись кэша кадров: {e}")
+            return None
+
+    def _commit(self, key: str, meta: dict, tmp_path: str):
+        with self._lock:
+            try:
+                os.replace(tmp_path, os.path.join(self.cache_dir, meta["file"]))
+            except OSError as e:
+                print(f"❌ Ошибка записи кэша кадров: {e}")
+                return
+            meta["last_used"] = time.time()
+            self._index[key] = meta
+
+            # Оставляем только последние разрешения для этого видео
+            same_video = [(m.get("last_used", 0), k) for k, m in self._index.items()
+                          if m["video"] == meta["video"]]
+            same_video.sort(reverse=True)
+            for _, old_key in same_video[self.max_sizes_per_video:]:
+                self._remove_entry(old_key)
+
+            self._save_index()
+        print(f"💾 Кадры сохранены в кэш: {os.path.basename(meta['video'])} "
+              f"{meta['size'][0]}x{meta['size'][1]}, {meta['frames']} кадров")
+
+    def clear(self):
+        """Полностью очищает кэш"""
+        with self._lock:
+            for key in list(self._index.keys()):
+                self._remove_entry(key)
+            self._save_index()
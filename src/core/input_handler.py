@@ -31,12 +31,28 @@ DEFAULT_KEYMAP = {
     "pause": [pygame.K_ESCAPE]
 }
 
+# Биты действий для компактной записи ввода одного тика (int-маска).
+# Используется симуляцией боя: маска не зависит от раскладки и легко сохраняется/передается.
+ACTION_BITS = {
+    "left": 1 << 0,
+    "right": 1 << 1,
+    "up": 1 << 2,
+    "down": 1 << 3,
+    "attack_1": 1 << 4,
+    "attack_2": 1 << 5,
+    "attack_3": 1 << 6,
+    "block": 1 << 7,
+    "special_1": 1 << 8,
+    "special_2": 1 << 9,
+}
+
 class InputHandler:
     """
     Хранит состояния и предоставляет API:
       - update(events)  -> обработать Pygame события
       - is_down(action) -> держат ли сейчас кнопку
       - was_pressed(action) -> нажата ли была в этом кадре
+      - consume_action_mask() -> ввод для одного тика симуляции (маска ACTION_BITS)
       - get_axis() -> (-1, 0, 1) горизонтальная ось
     """
 
@@ -45,6 +61,8 @@ class InputHandler:
         # текущие состояния
         self._down = defaultdict(bool)
         self._pressed = defaultdict(bool)
+        # нажатия, которые еще не забрал ни один тик (consume_action_mask)
+        self._latched = defaultdict(bool)
         # джойстики
         self.joysticks = []
         self._init_joysticks()
@@ -68,6 +86,7 @@ class InputHandler:
                 if action:
                     self._down[action] = True
                     self._pressed[action] = True
+                    self._latched[action] = True
             elif e.type == pygame.KEYUP:
                 action = self._key_to_action(e.key)
                 if action:
@@ -78,6 +97,7 @@ class InputHandler:
                 if action:
                     self._down[action] = True
                     self._pressed[action] = True
+                    self._latched[action] = True
             elif e.type == pygame.JOYBUTTONUP:
                 action = self._joybutton_to_action(e.button)
                 if action:
@@ -126,4 +146,39 @@ class InputHandler:
             return -1
         if right and not left:
             return 1
-        return 0
\ No newline at end of file
+        return 0
+
+    def get_action_mask(self):
+        """
+        Текущий ввод как битовая маска ACTION_BITS (без сброса, см. consume_action_mask).
+        Удерживаемые кнопки + нажатые, но еще не забранные тиком симуляции.
+        """
+        mask = 0
+        for action, bit in ACTION_BITS.items():
+            if self._down[action] or self._latched[action]:
+                mask |= bit
+        return mask
+
+    def consume_action_mask(self):
+        """
+        Ввод для одного тика симуляции: как get_action_mask, но сбрасывает нажатия.
+        Короткое нажатие (вниз и вверх между кадрами) доживает до первого тика, даже если
+        в этом кадре тиков не было (экран >60 Гц), и попадает только в один тик,
+        даже если кадр прогнал несколько.
+        """
+        mask = self.get_action_mask()
+        self._latched = defaultdict(bool)
+        return mask
+
+    def set_action_mask(self, mask):
+        """
+        Выставляет состояние кнопок по маске ACTION_BITS (воспроизведение реплея, бот).
+        Кнопки, которых не было в прошлой маске, считаются нажатыми в этом кадре.
+        """
+        self._pressed = defaultdict(bool)
+        self._latched = defaultdict(bool)  # маска уже точная - старые нажатия не нужны
+        for action, bit in ACTION_BITS.items():
+            down = bool(mask & bit)
+            if down and not self._down[action]:
+                self._pressed[action] = True
+            self._down[action] = down
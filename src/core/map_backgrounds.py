@@ -0,0 +1,148 @@
+# src/core/map_backgrounds.py
+"""
+Фоны карт для IntroSequenceScene и BattleScene
+----------------------------------------------
+Все статичное (цвет карты, картинка фона, подписи) собирается один раз
+под текущее разрешение в один сконвертированный Surface - за кадр это один blit.
+
+Необязательные картинки карты лежат в Sprites/maps/<map_id>/:
+  background.png              - статичный фон (растягивается на весь экран)
+  far.png, mid.png, near.png  - слои параллакса (см. PARALLAX_LAYERS)
+
+Слой параллакса масштабируется по высоте экрана и заранее склеивается в ленту
+шириной "экран + один тайл", поэтому прокрутка - это тоже один blit со сдвигом.
+Если картинок нет, фон - это просто цвет карты.
+"""
+
+import os
+
+import pygame
+
+from src.core.fonts import render_text
+
+MAPS_DIR = "maps"
+BACKGROUND_IMAGE = "background.png"
+
+MAP_COLORS = {
+    'soul_beach': (135, 206, 235),  # Небесно-голубой для пляжа
+    'hall_of_judgement': (70, 70, 90),  # Темно-серый для зала
+    'deep_caves': (30, 30, 40),  # Очень темный для пещер
+    'everlost': (100, 50, 150),  # Фиолетовый для забытого измерения
+}
+DEFAULT_MAP_COLOR = (0, 0, 30)  # По умолчанию темно-синий
+
+MAP_NAMES = {
+    'soul_beach': 'Soul Beach',
+    'hall_of_judgement': 'Hall of Judgement',
+    'deep_caves': 'Deep Caves',
+    'everlost': 'Everlost',
+    'random': 'Random'
+}
+
+# (файл, скорость относительно камеры) - от дальнего слоя к ближнему
+PARALLAX_LAYERS = [
+    ("far.png", 0.2),
+    ("mid.png", 0.5),
+    ("near.png", 0.8),
+]
+
+_backgrounds = {}  # { (map_id, size, labels): MapBackground }
+
+
+def get_map_name(map_id):
+    """Отображаемое название карты"""
+    return MAP_NAMES.get(map_id, map_id)
+
+
+class ParallaxLayer:
+    """Слой, склеенный в ленту для прокрутки одним blit"""
+    def __init__(self, image, factor, screen_size):
+        screen_w, screen_h = screen_size
+        scale = screen_h / image.get_height()
+        tile_w = max(1, int(image.get_width() * scale))
+        tile = pygame.transform.smoothscale(image, (tile_w, screen_h))
+
+        self.factor = factor
+        self.tile_w = tile_w
+        self.strip = pygame.Surface((screen_w + tile_w, screen_h), pygame.SRCALPHA)
+        for x in range(0, screen_w + tile_w, tile_w):
+            self.strip.blit(tile, (x, 0))
+        self.strip = self.strip.convert_alpha()
+
+    def draw(self, screen, camera_x):
+        offset = int(camera_x * self.factor) % self.tile_w
+        screen.blit(self.strip, (-offset, 0))
+
+
+class MapBackground:
+    """Собранный фон одной карты для одного разрешения"""
+    def __init__(self, map_id, size, resources=None, labels=()):
+        self.map_id = map_id
+        self.size = tuple(size)
+        self.layers = []
+
+        self.static = pygame.Surface(self.size)
+        self.static.fill(MAP_COLORS.get(map_id, DEFAULT_MAP_COLOR))
+
+        map_dir = self._map_dir(resources)
+        if map_dir and resources:
+            image_path = os.path.join(map_dir, BACKGROUND_IMAGE)
+            if os.path.exists(image_path):
+                image = resources.load_image(image_path)
+                self.static.blit(pygame.transform.smoothscale(image, self.size), (0, 0))
+            for filename, factor in PARALLAX_LAYERS:
+                layer_path = os.path.join(map_dir, filename)
+                if os.path.exists(layer_path):
+                    self.layers.append(ParallaxLayer(resources.load_image(layer_path), factor, self.size))
+
+        # Подписи не меняются весь бой - запекаем их в статичный слой.
+        # Если есть параллакс, подписи должны быть поверх него - отдельным слоем.
+        self.overlay = None
+        target = self.static
+        if self.layers and labels:
+            self.overlay = pygame.Surface(self.size, pygame.SRCALPHA)
+            target = self.overlay
+        for text, font_size, color, pos, bold in labels:
+            label = render_text(text, font_size, bold, color)
+            x, y = pos
+            if x is None:  # по центру
+                x = (self.size[0] - label.get_width()) // 2
+            elif x < 0:  # отрицательный x - отступ от правого края
+                x = self.size[0] - label.get_width() + x
+            target.blit(label, (x, y))
+
+        self.static = self.static.convert()
+        if self.overlay:
+            self.overlay = self.overlay.convert_alpha()
+
+    def _map_dir(self, resources):
+        if resources is None:
+            return None
+        path = os.path.join(resources.base_sprite_dir, MAPS_DIR, self.map_id)
+        return path if os.path.isdir(path) else None
+
+    def draw(self, screen, camera_x=0):
+        """Один blit статики плюс по одному blit на слой параллакса"""
+        screen.blit(self.static, (0, 0))
+        for layer in self.layers:
+            layer.draw(screen, camera_x)
+        if self.overlay:
+            screen.blit(self.overlay, (0, 0))
+
+
+def get_map_background(map_id, size, resources=None, labels=()):
+    """
+    Фон карты из кэша (собирается при первом запросе для этого разрешения).
+    labels: [(текст, размер шрифта, цвет, (x, y), жирный)] - подписи поверх фона.
+            x=None - по центру, отрицательный x - отступ от правого края.
+    """
+    labels = tuple((str(t), int(s), tuple(c), tuple(p), bool(b)) for t, s, c, p, b in labels)
+    key = (map_id, tuple(size), labels)
+    background = _backgrounds.get(key)
+    if background is None:
+        # Фоны под другие разрешения больше не нужны
+        for old_key in [k for k in _backgrounds if k[1] != key[1]]:
+            del _backgrounds[old_key]
+        background = MapBackground(map_id, size, resources, labels)
+        _backgrounds[key] = background
+    return background
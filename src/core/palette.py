@@ -0,0 +1,156 @@
+# src/core/palette.py
+"""
+Скины-перекраски (palette swap)
+-------------------------------
+Скин, который отличается от базового только цветами, не хранит своих кадров:
+в папке скина лежит один palette.json, а кадры получаются из кадров базового
+скина заменой цветов при загрузке.
+
+  Sprites/<character>/<skin>/palette.json:
+  {"base": "default", "colors": {"#c81e1e": "#3c1e8c", "#ffffff": "#202020"}}
+
+Базовый набор лучше хранить 8-битными PNG с палитрой (прозрачность - один
+индекс, colorkey): тогда перекраска - копия кадра и Surface.set_palette
+(без обхода пикселей). Для полноцветных кадров (и листов атласа) - векторная
+замена через NumPy: уникальные цвета кадра, таблица замены, одна индексация массива.
+Готовые кадры ResourceManager переводит в формат экрана (convert/convert_alpha),
+чтобы blit не конвертировал их каждый раз, - в памяти скин занимает столько же,
+сколько отдельный набор кадров; экономится диск.
+
+Проверить, что готовый скин - чистая перекраска, и записать для него palette.json:
+  python -m src.core.palette Sprites/chara default second_time
+После этого кадры скина second_time можно удалить - останется только palette.json.
+"""
+
+import json
+import os
+import sys
+
+import pygame
+
+from src.core.atlas import list_animation_frames
+from src.core.video_backend import get_numpy
+
+PALETTE_FILE = "palette.json"
+
+
+def parse_color(value):
+    """"#rrggbb" или [r, g, b] -> (r, g, b)"""
+    if isinstance(value, str):
+        value = value.lstrip("#")
+        return tuple(int(value[i:i + 2], 16) for i in (0, 2, 4))
+    return tuple(int(c) for c in value[:3])
+
+
+def format_color(color):
+    return "#{:02x}{:02x}{:02x}".format(*color)
+
+
+def _unpack(packed):
+    return (packed >> 16) & 255, (packed >> 8) & 255, packed & 255
+
+
+def read_palette_skin(skin_dir):
+    """(базовый скин, { (r, g, b): (r, g, b) }) из palette.json или None, если скин - обычный"""
+    path = os.path.join(skin_dir, PALETTE_FILE)
+    if not os.path.isfile(path):
+        return None
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        colors = {parse_color(src): parse_color(dst) for src, dst in data.get("colors", {}).items()}
+        return data.get("base", "default"), colors
+    except Exception as e:
+        print(f"⚠️ Ошибка чтения палитры {path}: {e}")
+        return None
+
+
+def recolor(surface, color_map):
+    """Новая Surface с замененными цветами (альфа и colorkey сохраняются)"""
+    result = surface.copy()
+    if surface.get_bitsize() == 8:
+        # Индексированный кадр: меняем только палитру
+        result.set_palette([color_map.get(tuple(color[:3]), tuple(color[:3])) for color in surface.get_palette()])
+        return result
+
+    np = get_numpy()
+    pixels = pygame.surfarray.pixels3d(result)
+    packed = (pixels[..., 0].astype(np.uint32) << 16) | (pixels[..., 1].astype(np.uint32) << 8) | pixels[..., 2]
+    colors, inverse = np.unique(packed, return_inverse=True)
+    table = np.array([color_map.get(color, color) for color in map(_unpack, colors.tolist())], dtype=np.uint8)
+    pixels[...] = table[inverse].reshape(pixels.shape)
+    del pixels  # отпускаем блокировку Surface
+    return result
+
+
+def _pixels(surface):
+    """(упакованные RGB, маска видимых пикселей) полноцветной копии кадра"""
+    np = get_numpy()
+    rgba = pygame.Surface(surface.get_size(), pygame.SRCALPHA)
+    rgba.blit(surface, (0, 0))
+    rgb = pygame.surfarray.array3d(rgba).astype(np.uint32)
+    visible = pygame.surfarray.array_alpha(rgba) > 0
+    return (rgb[..., 0] << 16) | (rgb[..., 1] << 8) | rgb[..., 2], visible
+
+
+def derive_palette(base_frames, variant_frames):
+    """
+    { цвет базы: цвет варианта } для кадров одинакового размера, или None,
+    если вариант - не чистая перекраска (один цвет базы стал разными цветами,
+    другая прозрачность или другие размеры).
+    """
+    np = get_numpy()
+    if len(base_frames) != len(variant_frames):
+        return None
+    pairs = set()
+    for base, variant in zip(base_frames, variant_frames):
+        if base.get_size() != variant.get_size():
+            return None
+        base_rgb, base_visible = _pixels(base)
+        variant_rgb, variant_visible = _pixels(variant)
+        if not np.array_equal(base_visible, variant_visible):
+            return None
+        combined = (base_rgb[base_visible].astype(np.uint64) << 24) | variant_rgb[base_visible]
+        pairs.update(np.unique(combined).tolist())
+
+    color_map = {}
+    for pair in pairs:
+        src, dst = pair >> 24, pair & 0xFFFFFF
+        if color_map.setdefault(src, dst) != dst:
+            return None
+    return {_unpack(src): _unpack(dst) for src, dst in color_map.items() if src != dst}
+
+
+def write_palette_skin(character_dir, base_skin, variant_skin):
+    """Сравнивает кадры двух скинов и пишет palette.json в папку варианта; возвращает число цветов или None"""
+    base = list_animation_frames(os.path.join(character_dir, base_skin))
+    variant_dir = os.path.join(character_dir, variant_skin)
+    variant = list_animation_frames(variant_dir)
+    if not base or set(base) != set(variant):
+        return None
+
+    base_frames, variant_frames = [], []
+    for anim_name, paths in base.items():
+        base_frames.extend(pygame.image.load(p) for p in paths)
+        variant_frames.extend(pygame.image.load(p) for p in variant[anim_name])
+    color_map = derive_palette(base_frames, variant_frames)
+    if color_map is None:
+        return None
+
+    with open(os.path.join(variant_dir, PALETTE_FILE), "w", encoding="utf-8") as f:
+        json.dump({"base": base_skin,
+                   "colors": {format_color(src): format_color(dst) for src, dst in sorted(color_map.items())}},
+                  f, ensure_ascii=False, indent=2)
+    return len(color_map)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 4:
+        print("python -m src.core.palette Sprites/<character> <базовый скин> <скин-перекраска>")
+        sys.exit(1)
+    pygame.init()
+    count = write_palette_skin(sys.argv[1], sys.argv[2], sys.argv[3])
+    if count is None:
+        print(f"❌ {sys.argv[3]} - не чистая перекраска {sys.argv[2]}, palette.json не записан")
+    else:
+        print(f"🎨 {sys.argv[3]}: palette.json, заменяемых цветов {count} - кадры скина можно удалить")
@@ -6,52 +6,224 @@ Physics module
 Классы:
  - PhysicsWorld: глобальная физика (гравитация, список тел)
  - HitBox / HurtBox: простые классы для хит- и хертбоксов
- - resolve_collisions: простая функция для разрешения пересечений
+ - FrameBoxTable: коробки анимации по кадрам в плоском массиве (HitBox.bind)
+ - broadphase_pairs: sort-and-sweep по x - кандидаты на пересечение
+ - detect_hits: попадания хитбоксов по хертбоксам (broadphase + точная проверка AABB)
+ - sweep_aabb: время первого касания движущегося AABB с неподвижным (swept AABB)
+ - STAGE_GEOMETRY: пол и стены арены по картам
+
+Массовые простые тела (частицы, снаряды) создаются через PhysicsWorld.spawn():
+они живут в BodyStore (src/core/body_store.py, массивы NumPy) и шагают одной
+векторной операцией. Непрерывные столкновения к ним не применяются.
+
+Broadphase: коробки сортируются по левому краю и проходятся слева направо,
+пара становится кандидатом, только если коробки перекрываются по x.
+Вместо n*m проверок - O((n+m) log(n+m) + k), где k - число перекрытий по x.
+Замер: python -m benchmarks.physics_broadphase
+
+Непрерывные столкновения (PhysicsWorld(continuous=True)): перемещение тела за тик
+не переносится одним скачком, а проверяется swept AABB против геометрии уровня
+(STAGE_GEOMETRY, пол и стены карты) и других тел. Тело останавливается в точке
+самого раннего касания - быстрые снаряды и рывки не пролетают сквозь пол и
+противника даже при подвисании кадра. Пары тел для swept отбирает тот же
+broadphase_pairs - по областям, которые тела заметают за тик.
+Проверка и замер: python -m benchmarks.physics_continuous
 
 Как расширять:
- - Добавь более точную систему столкновений (swept AABB, continuous collision)
  - Создай наследников для разных типов тел (kinematic, rigidbody)
 """
 
+from array import array
+
 import pygame
 
 GRAVITY = 1500.0  # пикселей/с^2 — настраивай по ощущениям
+GROUND_Y = 500
+
+# Стены по краям арены и толщина геометрии (чтобы за тик ее нельзя было проскочить без swept)
+STAGE_LEFT = 0
+STAGE_RIGHT = 1280
+STAGE_THICKNESS = 1000
+
+SWEEP_ITERATIONS = 3  # сколько раз за тик тело может "скользнуть" вдоль поверхности
+
+
+def default_stage(ground_y=GROUND_Y, left=STAGE_LEFT, right=STAGE_RIGHT):
+    """Пол и две стены арены"""
+    return [
+        (left - STAGE_THICKNESS, ground_y, right + STAGE_THICKNESS, ground_y + STAGE_THICKNESS),
+        (left - STAGE_THICKNESS, -STAGE_THICKNESS * 10, left, ground_y),
+        (right, -STAGE_THICKNESS * 10, right + STAGE_THICKNESS, ground_y),
+    ]
+
+
+# Геометрия уровня по картам: [(left, top, right, bottom)] - твердые прямоугольники.
+# Арена у всех карт пока одна (пол GROUND_Y, стены по краям экрана) - отличия
+# (уступы, низкий потолок) добавлять в запись карты.
+# Карты без записи ("random" до выбора и т.п.) используют default_stage()
+STAGE_GEOMETRY = {
+    "soul_beach": default_stage(),
+    "hall_of_judgement": default_stage(),
+    "deep_caves": default_stage(),
+    "everlost": default_stage(),
+}
+
+
+def get_stage_geometry(map_id):
+    return list(STAGE_GEOMETRY.get(map_id) or default_stage())
+
+
+class FrameBoxTable:
+    """
+    Хит- или хертбоксы анимации по кадрам, скомпилированные один раз в плоский массив.
+    frames: [[(offset_x, offset_y, w, h), ...] для кадра 0, ...] - как в HitBox.
+    На каждую коробку FIELDS целых: x-смещение при взгляде влево, вправо, y-смещение, w, h.
+    Коробки кадра frame лежат с индекса starts[frame] * FIELDS - чтение кадра это
+    сдвиг по массиву, без Rect и без ветвления по направлению.
+    HitBox(...).bind(table, index) - коробка index каждого кадра; detect_hits сам
+    читает ее для текущего кадра владельца (owner.box_frame).
+    """
+    FIELDS = 5
+
+    def __init__(self, frames):
+        self.starts = array('i', [0])
+        self.data = array('i')
+        for boxes in frames:
+            for offset_x, offset_y, w, h in boxes:
+                self.data.extend((-offset_x - w, offset_x, offset_y, w, h))
+            self.starts.append(len(self.data) // self.FIELDS)
+
+    @property
+    def frame_count(self):
+        return len(self.starts) - 1
+
+    def count(self, frame):
+        """Сколько коробок в кадре"""
+        return self.starts[frame + 1] - self.starts[frame]
+
 
 class HitBox:
-    """Простой объект хитбокса — AABB, привязан к Entity.rect через смещение."""
-    def init(self, owner, offset_x, offset_y, w, h):
+    """
+    Простой объект хитбокса — AABB, привязан к Entity.rect через смещение.
+    Смещения для обоих направлений считаются заранее (в __init__ / load_frame):
+    если менять offset_x / w вручную, нужно вызвать compile().
+    """
+    def __init__(self, owner, offset_x, offset_y, w, h):
         self.owner = owner
         self.offset_x = offset_x
         self.offset_y = offset_y
         self.w = w
         self.h = h
+        self.table = None  # FrameBoxTable - коробка меняется по кадрам анимации владельца
+        self.index = 0
+        self.compile()
+
+    def bind(self, table, index=0):
+        """Привязывает коробку к FrameBoxTable: detect_hits берет коробку index текущего кадра"""
+        self.table = table
+        self.index = index
+        return self
+
+    def compile(self):
+        # x-смещение при взгляде влево - зеркально относительно левого края владельца
+        self.dx_left = int(-self.offset_x - self.w)
+        self.dx_right = int(self.offset_x)
+
+    def load_frame(self, table, frame, index=0):
+        """
+        Берет коробку index кадра frame из FrameBoxTable (только чтение из массива).
+        Кадр без такой коробки - пустая коробка (w = h = 0), она ни с чем не пересекается.
+        """
+        frame = min(frame, table.frame_count - 1)
+        if index >= table.count(frame):
+            self.w = self.h = 0
+            return
+        data = table.data
+        i = (table.starts[frame] + index) * FrameBoxTable.FIELDS
+        self.dx_left = data[i]
+        self.dx_right = self.offset_x = data[i + 1]
+        self.offset_y = data[i + 2]
+        self.w = data[i + 3]
+        self.h = data[i + 4]
+
+    def bounds(self):
+        """(left, top, right, bottom) в мире - без создания Rect"""
+        owner_rect = self.owner.rect
+        left = owner_rect.x + (self.dx_right if self.owner.is_facing_right else self.dx_left)
+        top = owner_rect.y + self.offset_y
+        return left, top, left + self.w, top + self.h
 
     @property
     def rect(self):
-        x = self.owner.rect.x + (self.offset_x if self.owner.is_facing_right else -self.offset_x - self.w)
-        y = self.owner.rect.y + self.offset_y
-        return pygame.Rect(int(x), int(y), self.w, self.h)
+        left, top, right, bottom = self.bounds()
+        return pygame.Rect(left, top, self.w, self.h)
 
-class HurtBox:
+class HurtBox(HitBox):
     """Ударяемая область (обычно совпадает с body rect)."""
-    def init(self, owner, offset_x=0, offset_y=0, w=None, h=None):
-        self.owner = owner
-        self.offset_x = offset_x
-        self.offset_y = offset_y
-        self.w = w or owner.rect.width
-        self.h = h or owner.rect.height
+    def __init__(self, owner, offset_x=0, offset_y=0, w=None, h=None):
+        super().__init__(owner, offset_x, offset_y, w or owner.rect.width, h or owner.rect.height)
+
+    def compile(self):
+        # Хертбокс не зеркалится
+        self.dx_left = self.dx_right = int(self.offset_x)
+
+    def load_frame(self, table, frame, index=0):
+        super().load_frame(table, frame, index)
+        self.dx_left = self.dx_right
+
+def broadphase_pairs(hitboxes, hurtboxes):
+    """
+    Sort-and-sweep по x: индексы (i, j) пар hitboxes[i] / hurtboxes[j],
+    которые перекрываются по оси x. Точную проверку делает вызывающий.
+    Пары одного владельца (свой удар по себе) отбрасываются сразу.
+    Пары возвращаются в порядке (i, j) - как при полном переборе, чтобы
+    порядок попаданий не зависел от положения коробок (детерминизм).
+    """
+    if not hitboxes or not hurtboxes:
+        return []
+
+    # (левый край, правый край, вид: 0 - хитбокс / 1 - хертбокс, индекс, владелец)
+    edges = []
+    for i, box in enumerate(hitboxes):
+        left, top, right, bottom = box.bounds()
+        edges.append((left, right, 0, i, box.owner))
+    for j, box in enumerate(hurtboxes):
+        left, top, right, bottom = box.bounds()
+        edges.append((left, right, 1, j, box.owner))
+    edges.sort(key=lambda edge: edge[0])
+
+    pairs = []
+    active = ([], [])  # открытые на текущем x хитбоксы и хертбоксы
+    for left, right, kind, index, owner in edges:
+        others = active[1 - kind]
+        if others:
+            # Закрываем коробки, правый край которых левее текущей
+            others[:] = [edge for edge in others if edge[1] > left]
+            for other in others:
+                if other[4] is not owner:
+                    pairs.append((index, other[3]) if kind == 0 else (other[3], index))
+        active[kind].append((left, right, kind, index, owner))
+    pairs.sort()
+    return pairs
 
-    @property
-    def rect(self):
-        x = self.owner.rect.x + self.offset_x
-        y = self.owner.rect.y + self.offset_y
-        return pygame.Rect(int(x), int(y), self.w, self.h)
 
 class PhysicsWorld:
     """Менеджер физики: гравитация, список тел, простые проверки столкновений."""
-    def __init__(self, gravity=GRAVITY):
+    def __init__(self, gravity=GRAVITY, continuous=False, map_id=None):
         self.gravity = gravity
         self.bodies = []  # список сущностей (обычно Character, Projectile и т.д.)
+        self.hitboxes = []   # активные HitBox (удары, снаряды, эффекты)
+        self.hurtboxes = []  # активные HurtBox
+        self.ground_y = GROUND_Y
+        # continuous=True - swept AABB против stage и других тел вместо прыжка на velocity * dt
+        self.continuous = continuous
+        self.stage = get_stage_geometry(map_id)
+        self.contacts = []  # касания тел за последний step: (тело, другое тело, toi, (nx, ny))
+        self.store = None  # BodyStore - создается при первом spawn()
+
+    def set_stage(self, map_id):
+        """Геометрия уровня для карты (STAGE_GEOMETRY)"""
+        self.stage = get_stage_geometry(map_id)
 
     def add(self, body):
         if body not in self.bodies:
@@ -61,8 +233,45 @@ class PhysicsWorld:
         if body in self.bodies:
             self.bodies.remove(body)
 
+    def spawn(self, x, y, width, height, velocity_x=0.0, velocity_y=0.0, is_airborne=False):
+        """Тело в массивном хранилище (BodyStore) - возвращает BodyProxy"""
+        if self.store is None:
+            from src.core.body_store import BodyStore
+            self.store = BodyStore()
+        return self.store.add(x, y, width, height, velocity_x, velocity_y, is_airborne)
+
+    def despawn(self, proxy):
+        if self.store is not None:
+            self.store.remove(proxy)
+
+    def add_hitbox(self, hitbox):
+        self.hitboxes.append(hitbox)
+
+    def remove_hitbox(self, hitbox):
+        if hitbox in self.hitboxes:
+            self.hitboxes.remove(hitbox)
+
+    def add_hurtbox(self, hurtbox):
+        self.hurtboxes.append(hurtbox)
+
+    def remove_hurtbox(self, hurtbox):
+        if hurtbox in self.hurtboxes:
+            self.hurtboxes.remove(hurtbox)
+
+    def find_hits(self):
+        """Все пересечения активных хитбоксов с чужими хертбоксами: [(hitbox, hurtbox)]"""
+        return detect_hits(None, None, self.hitboxes, self.hurtboxes)
+
     def step(self, dt):
-        """Обновить физику: гравитация -> интеграция -> простая коррекция столкновений."""
+        """
+        Обновить физику: гравитация -> интеграция -> простая коррекция столкновений.
+        dt - фиксированный тик (fixed_step.TICK_DT), иначе результат зависит от FPS.
+        """
+        self.contacts = []
+        if self.store is not None and self.store.count:
+            self.store.step(dt, self.gravity, self.ground_y)
+
+        moved = []  # (тело, x, y в начале тика) - для непрерывных столкновений
         # применяем гравитацию к всем телам, которые поддерживают velocity_y и не на земле.
         for b in self.bodies:
             # Если у тела есть флаг is_airborne, не трогаем; иначе добавляем гравитацию.
@@ -74,31 +283,188 @@ class PhysicsWorld:
                 # можно применять небольшую «подпорку» для падений
                 pass
 
+            if self.continuous and hasattr(b, "x"):
+                start_x, start_y = b.x, b.y
+                # update - анимация и интеграция; его перемещение проверяем swept AABB после цикла
+                if hasattr(b, "update"):
+                    b.update(dt)
+                moved.append((b, start_x, start_y))
+                continue
+
             # интегрируем позицию
             if hasattr(b, "update"):
                 b.update(dt)
 
-        # Простая коррекция: границы экрана (не физический мир, просто demo)
-        for b in list(self.bodies):
-            # не позволять выйти за пол по Y
-            ground_y = 500  # TODO: сделать configurable / уровень
+            # Простая коррекция (за тот же проход): не позволять выйти за пол по Y
+            ground_y = self.ground_y
             if b.rect.bottom >= ground_y:
                 # фиксируем положение
                 b.rect.bottom = ground_y
+                if hasattr(b, "y"):
+                    b.y = float(b.rect.y)
                 # обнуляем вертикальную скорость
                 if hasattr(b, "velocity_y"):
                     b.velocity_y = 0
                 if hasattr(b, "is_airborne"):
                     b.is_airborne = False
 
+        if moved:
+            self._sweep_bodies(moved)
+
+    def _sweep_bodies(self, moved):
+        """
+        Swept AABB для тел, сдвинутых за тик. Кандидаты тело-тело отбирает
+        broadphase_pairs по областям, заметаемым телами за тик (от начала до конца
+        перемещения), - точный sweep только для перекрывающихся по x.
+        Тело за тик не выходит из своей области, поэтому кандидатов не теряем.
+        """
+        sweeps = []
+        for b, x, y in moved:
+            w, h = b.rect.width, b.rect.height
+            sweeps.append(_SweptBox(b, (min(x, b.x), min(y, b.y), max(x, b.x) + w, max(y, b.y) + h)))
+        moving = {id(b) for b, x, y in moved}
+        boxes = sweeps + [_SweptBox(body, _body_box(body)) for body in self.bodies if id(body) not in moving]
+
+        candidates = [[] for _ in moved]
+        for i, j in broadphase_pairs(sweeps, boxes):
+            candidates[i].append(boxes[j].owner)
+        for (b, x, y), others in zip(moved, candidates):
+            self._sweep_body(b, x, y, b.x - x, b.y - y, others)
+
+    def _sweep_body(self, b, x, y, dx, dy, others):
+        """
+        Перемещает тело из (x, y) на (dx, dy) до первого касания.
+        Об геометрию уровня тело скользит (гасится скорость вдоль нормали),
+        о другое тело из others - останавливается и касание записывается в self.contacts.
+        Тела проверяются по float-позициям (x, y), а не по целочисленному rect.
+        """
+        w, h = b.rect.width, b.rect.height
+        for _ in range(SWEEP_ITERATIONS):
+            if not dx and not dy:
+                break
+            box = (x, y, x + w, y + h)
+            hit_time, normal, other = 1.0, None, None
+            for solid in self.stage:
+                result = sweep_aabb(box, dx, dy, solid)
+                if result and result[0] < hit_time:
+                    hit_time, normal, other = result[0], result[1], None
+            for body in others:
+                result = sweep_aabb(box, dx, dy, _body_box(body))
+                if result and result[0] < hit_time:
+                    hit_time, normal, other = result[0], result[1], body
+
+            x += dx * hit_time
+            y += dy * hit_time
+            if normal is None:
+                break
+
+            nx, ny = normal
+            if other is not None:
+                self.contacts.append((b, other, hit_time, normal))
+                break
+
+            # Скольжение: остаток перемещения без составляющей вдоль нормали
+            remaining = 1.0 - hit_time
+            dx = 0.0 if nx else dx * remaining
+            dy = 0.0 if ny else dy * remaining
+            if nx and hasattr(b, "velocity_x"):
+                b.velocity_x = 0
+            if ny and hasattr(b, "velocity_y"):
+                b.velocity_y = 0
+            if ny < 0 and hasattr(b, "is_airborne"):
+                b.is_airborne = False  # приземлились
+
+        b.x, b.y = x, y
+        if hasattr(b, "_sync_rect"):
+            b._sync_rect()
+        else:
+            b.rect.x, b.rect.y = int(x), int(y)
+
+
+class _SweptBox:
+    """Коробка тела для broadphase_pairs (bounds() и owner, как у HitBox)"""
+    __slots__ = ("owner", "box")
+
+    def __init__(self, owner, box):
+        self.owner = owner
+        self.box = box
+
+    def bounds(self):
+        return self.box
+
+
+def _body_box(body):
+    """(left, top, right, bottom) тела по float-позиции; без x/y - по rect"""
+    rect = body.rect
+    x, y = getattr(body, "x", rect.x), getattr(body, "y", rect.y)
+    return x, y, x + rect.width, y + rect.height
+
+
 def detect_hits(attacker, defender, attacker_hitboxes, defender_hurtboxes):
     """
     Детектирование попаданий: возвращает список (hitbox, hurtbox) пар, которые пересеклись.
     attacker_hitboxes / defender_hurtboxes — списки HitBox/HurtBox объектов.
+    Коробки, привязанные к FrameBoxTable, сначала читают данные текущего кадра.
+    Сначала broadphase_pairs отбирает кандидатов, точная проверка (как colliderect,
+    но по bounds() без создания Rect) - только для них.
     """
+    _load_frames(attacker_hitboxes)
+    _load_frames(defender_hurtboxes)
     collisions = []
-    for hb in attacker_hitboxes:
-        for db in defender_hurtboxes:
-            if hb.rect.colliderect(db.rect):
-                collisions.append((hb, db))
-    return collisions
\ No newline at end of file
+    for i, j in broadphase_pairs(attacker_hitboxes, defender_hurtboxes):
+        hb = attacker_hitboxes[i]
+        db = defender_hurtboxes[j]
+        if not (hb.w > 0 and hb.h > 0 and db.w > 0 and db.h > 0):
+            continue  # пустые коробки ни с чем не пересекаются (как у colliderect)
+        hb_left, hb_top, hb_right, hb_bottom = hb.bounds()
+        db_left, db_top, db_right, db_bottom = db.bounds()
+        if hb_left < db_right and db_left < hb_right and hb_top < db_bottom and db_top < hb_bottom:
+            collisions.append((hb, db))
+    return collisions
+
+
+def _load_frames(boxes):
+    """Коробки с FrameBoxTable (HitBox.bind) - данные текущего кадра владельца (owner.box_frame)"""
+    for box in boxes:
+        table = box.table
+        if table is not None:
+            box.load_frame(table, box.owner.box_frame, box.index)
+
+
+def sweep_aabb(box, dx, dy, other):
+    """
+    Swept AABB: box - (left, top, right, bottom), движется на (dx, dy) за тик;
+    other - неподвижный (left, top, right, bottom).
+    Возвращает (toi, (nx, ny)) - долю перемещения до касания (0..1) и нормаль
+    поверхности other в точке касания, или None, если касания нет.
+    Коробки, уже пересекающиеся в начале тика, не считаются (их разводит дискретная коррекция).
+    """
+    left, top, right, bottom = box
+    o_left, o_top, o_right, o_bottom = other
+
+    if dx > 0:
+        x_entry, x_exit = (o_left - right) / dx, (o_right - left) / dx
+    elif dx < 0:
+        x_entry, x_exit = (o_right - left) / dx, (o_left - right) / dx
+    elif left < o_right and o_left < right:
+        x_entry, x_exit = float("-inf"), float("inf")
+    else:
+        return None
+
+    if dy > 0:
+        y_entry, y_exit = (o_top - bottom) / dy, (o_bottom - top) / dy
+    elif dy < 0:
+        y_entry, y_exit = (o_bottom - top) / dy, (o_top - bottom) / dy
+    elif top < o_bottom and o_top < bottom:
+        y_entry, y_exit = float("-inf"), float("inf")
+    else:
+        return None
+
+    entry = max(x_entry, y_entry)
+    exit_time = min(x_exit, y_exit)
+    if entry > exit_time or entry < 0 or entry >= 1:
+        return None
+
+    if x_entry > y_entry:
+        return entry, (-1 if dx > 0 else 1, 0)
+    return entry, (0, -1 if dy > 0 else 1)
@@ -0,0 +1,269 @@
+# src/core/replay.py
+"""
+Реплеи боя: запись ввода и воспроизведение
+------------------------------------------
+Бой детерминирован (fixed_step + BattleManager), поэтому реплей - это только
+ввод обоих игроков по тикам (маски ACTION_BITS) и данные матча
+(персонажи, камео, скины, карта, seed, итог).
+
+ - ReplayRecorder  - копит ввод тик за тиком, сразу сжимая повторы (RLE):
+                     удержание кнопки на 2 секунды - одна пара (маска, 120).
+                     Каждые keyframe_interval тиков - ключевой кадр (BattleManager.snapshot)
+ - Replay          - готовый реплей; to_bytes / from_bytes, save / load,
+                     keyframe_before(tick) - ближайший ключевой кадр для перемотки
+ - ReplayPlayer    - отдает ввод по тикам через обычный InputHandler
+                     (set_action_mask), поэтому бой читает его как живой ввод
+
+Перемотка к тику T: restore(keyframe_before(T)) и досчитать не больше
+keyframe_interval тиков по записанному вводу.
+
+Формат файла (.vwr):
+  b"VWRP", версия (1 байт), затем zlib от:
+  длина JSON метаданных (uint32), JSON, число тиков (uint32),
+  для каждого игрока: число серий (uint32) и серии (маска uint16, длина uint16),
+  с версии 2: интервал ключевых кадров (uint32), их число (uint32),
+  индекс (тик, смещение, длина - uint32) и сами ключевые кадры (JSON снапшота).
+  Смещения - от начала блока ключевых кадров; разбирается только тот кадр,
+  к которому перематывают.
+"""
+
+import bisect
+import json
+import os
+import struct
+import time
+import zlib
+from array import array
+
+from src.core.frame_cache import user_data_path
+
+REPLAY_MAGIC = b"VWRP"
+REPLAY_VERSION = 2
+SUPPORTED_VERSIONS = (1, 2)
+REPLAY_EXTENSION = ".vwr"
+MAX_RUN = 0xFFFF  # длиннее - новая серия с той же маской
+REPLAY_DIR = "replays"
+KEYFRAME_INTERVAL = 120  # 2 секунды - перемотка досчитывает не больше 120 тиков
+
+_U32 = struct.Struct("!I")
+_RUN = struct.Struct("!HH")
+_KEYFRAME = struct.Struct("!III")
+
+
+def _freeze(value):
+    """JSON-списки обратно в кортежи - снапшоты BattleManager неизменяемые"""
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+class Replay:
+    """Записанный бой: метаданные, серии (маска, тиков) для каждого игрока и ключевые кадры"""
+    def __init__(self, metadata, ticks, runs, keyframes=(), keyframe_interval=0):
+        self.metadata = metadata
+        self.ticks = ticks
+        self.runs = runs  # ([(mask, count), ...], [(mask, count), ...])
+        self.keyframe_interval = keyframe_interval
+        # Тики ключевых кадров по возрастанию и снапшоты (или еще не разобранный JSON - bytes)
+        self.keyframe_ticks = [tick for tick, _ in keyframes]
+        self._keyframes = [snapshot for _, snapshot in keyframes]
+
+    def keyframe_before(self, tick):
+        """(тик, снапшот) - последний ключевой кадр не позже tick, или None"""
+        i = bisect.bisect_right(self.keyframe_ticks, tick) - 1
+        if i < 0:
+            return None
+        snapshot = self._keyframes[i]
+        if isinstance(snapshot, bytes):
+            snapshot = self._keyframes[i] = _freeze(json.loads(snapshot.decode("utf-8")))
+        return self.keyframe_ticks[i], snapshot
+
+    def masks(self):
+        """Ввод обоих игроков по тикам целиком - два array("H") для доступа по номеру тика"""
+        streams = (array("H"), array("H"))
+        for masks in self.inputs():
+            streams[0].append(masks[0])
+            streams[1].append(masks[1])
+        return streams
+
+    def inputs(self):
+        """Генератор (ввод P1, ввод P2) по тикам"""
+        streams = [self._expand(runs) for runs in self.runs]
+        for _ in range(self.ticks):
+            yield next(streams[0], 0), next(streams[1], 0)
+
+    @staticmethod
+    def _expand(runs):
+        for mask, count in runs:
+            for _ in range(count):
+                yield mask
+
+    def to_bytes(self):
+        meta = json.dumps(self.metadata, ensure_ascii=False).encode("utf-8")
+        parts = [_U32.pack(len(meta)), meta, _U32.pack(self.ticks)]
+        for runs in self.runs:
+            parts.append(_U32.pack(len(runs)))
+            parts.extend(_RUN.pack(mask, count) for mask, count in runs)
+
+        blobs = [snapshot if isinstance(snapshot, bytes) else json.dumps(snapshot).encode("utf-8")
+                 for snapshot in self._keyframes]
+        parts.append(_U32.pack(self.keyframe_interval))
+        parts.append(_U32.pack(len(blobs)))
+        offset = 0
+        for tick, blob in zip(self.keyframe_ticks, blobs):
+            parts.append(_KEYFRAME.pack(tick, offset, len(blob)))
+            offset += len(blob)
+        parts.extend(blobs)
+        return REPLAY_MAGIC + bytes([REPLAY_VERSION]) + zlib.compress(b"".join(parts), 9)
+
+    @classmethod
+    def from_bytes(cls, data):
+        if data[:4] != REPLAY_MAGIC:
+            raise ValueError("не файл реплея")
+        if data[4] not in SUPPORTED_VERSIONS:
+            raise ValueError(f"неподдерживаемая версия реплея: {data[4]}")
+        body = zlib.decompress(data[5:])
+        offset = 0
+        (meta_len,) = _U32.unpack_from(body, offset)
+        offset += _U32.size
+        metadata = json.loads(body[offset:offset + meta_len].decode("utf-8"))
+        offset += meta_len
+        (ticks,) = _U32.unpack_from(body, offset)
+        offset += _U32.size
+        runs = []
+        for _ in range(2):
+            (count,) = _U32.unpack_from(body, offset)
+            offset += _U32.size
+            runs.append([_RUN.unpack_from(body, offset + i * _RUN.size) for i in range(count)])
+            offset += count * _RUN.size
+
+        keyframes = []
+        interval = 0
+        if data[4] >= 2:
+            (interval,) = _U32.unpack_from(body, offset)
+            (count,) = _U32.unpack_from(body, offset + _U32.size)
+            offset += 2 * _U32.size
+            blobs_start = offset + count * _KEYFRAME.size
+            for i in range(count):
+                tick, blob_offset, length = _KEYFRAME.unpack_from(body, offset + i * _KEYFRAME.size)
+                start = blobs_start + blob_offset
+                keyframes.append((tick, body[start:start + length]))
+        return cls(metadata, ticks, tuple(runs), keyframes, interval)
+
+    def save(self, path):
+        with open(path, "wb") as f:
+            f.write(self.to_bytes())
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f:
+            return cls.from_bytes(f.read())
+
+
+class ReplayRecorder:
+    """Запись ввода боя тик за тиком"""
+    def __init__(self, metadata=None, keyframe_interval=KEYFRAME_INTERVAL):
+        self.metadata = dict(metadata or {})
+        self.runs = ([], [])
+        self.ticks = 0
+        self.keyframe_interval = keyframe_interval
+        self.keyframes = []  # [(тик, снапшот)]
+
+    @property
+    def needs_keyframe(self):
+        """На этом тике нужен ключевой кадр - передай снапшот в record()"""
+        return bool(self.keyframe_interval) and self.ticks % self.keyframe_interval == 0
+
+    def record(self, input_p1, input_p2, snapshot=None):
+        """
+        Ввод обоих игроков за один тик (в том же порядке, что и BattleManager.step).
+        snapshot - BattleManager.snapshot() перед этим тиком; сохраняется, если needs_keyframe.
+        """
+        if snapshot is not None and self.needs_keyframe:
+            self.keyframes.append((self.ticks, snapshot))
+        for runs, mask in zip(self.runs, (input_p1, input_p2)):
+            if runs and runs[-1][0] == mask and runs[-1][1] < MAX_RUN:
+                runs[-1][1] += 1
+            else:
+                runs.append([mask, 1])
+        self.ticks += 1
+
+    def finish(self, ticks=None, result=None):
+        """
+        Готовый Replay. ticks - обрезать запись до этого тика (например, до конца боя),
+        result - итог боя в метаданные (для проверки при воспроизведении).
+        """
+        ticks = self.ticks if ticks is None else min(ticks, self.ticks)
+        metadata = dict(self.metadata)
+        if result:
+            metadata["result"] = result
+        keyframes = [(tick, snapshot) for tick, snapshot in self.keyframes if tick < ticks]
+        return Replay(metadata, ticks, tuple(self._trim(runs, ticks) for runs in self.runs),
+                      keyframes, self.keyframe_interval)
+
+    @staticmethod
+    def _trim(runs, ticks):
+        trimmed = []
+        left = ticks
+        for mask, count in runs:
+            if left <= 0:
+                break
+            trimmed.append((mask, min(count, left)))
+            left -= count
+        return trimmed
+
+
+class ReplayPlayer:
+    """
+    Воспроизведение: на каждый тик выставляет маски в InputHandler обоих игроков.
+    Дальше бой берет ввод как обычно - handler.get_action_mask().
+    """
+    def __init__(self, replay, handlers):
+        self.replay = replay
+        self.handlers = handlers
+        self.tick = 0
+        self._masks = replay.masks()  # ввод по номеру тика - перемотка без прохода с начала
+
+    @property
+    def finished(self):
+        return self.tick >= self.replay.ticks
+
+    def seek(self, tick):
+        """Следующий next_tick() отдаст ввод тика tick (бой перемотай сам - keyframe_before)"""
+        self.tick = min(max(tick, 0), self.replay.ticks)
+
+    def next_tick(self):
+        """Ввод следующего тика в handlers; False - реплей закончился"""
+        if self.finished:
+            return False
+        for handler, masks in zip(self.handlers, self._masks):
+            handler.set_action_mask(masks[self.tick])
+        self.tick += 1
+        return True
+
+
+def replay_file_name(metadata):
+    """<дата_время>_<режим>_<персонаж>_vs_<персонаж> без символов, недопустимых в именах файлов"""
+    parts = [time.strftime("%Y%m%d_%H%M%S"), metadata.get("mode", "")]
+    characters = metadata.get("characters") or []
+    if len(characters) == 2:
+        parts.append(f"{characters[0]}_vs_{characters[1]}")
+    name = "_".join(str(part) for part in parts if part)
+    return "".join(c if c.isalnum() or c in "-_" else "-" for c in name)
+
+
+def save_replay(replay, directory=None):
+    """
+    Сохраняет реплей в replays/ папки данных пользователя, возвращает путь.
+    Бои, закончившиеся в ту же секунду, получают суффикс _2, _3...
+    """
+    directory = directory or user_data_path(REPLAY_DIR)
+    os.makedirs(directory, exist_ok=True)
+    name = replay_file_name(replay.metadata)
+    path = os.path.join(directory, name + REPLAY_EXTENSION)
+    counter = 1
+    while os.path.exists(path):
+        counter += 1
+        path = os.path.join(directory, f"{name}_{counter}{REPLAY_EXTENSION}")
+    replay.save(path)
+    return path
@@ -0,0 +1,56 @@
+# src/core/sprite_trim.py
+"""
+Обрезка кадров спрайтов при импорте
+-----------------------------------
+Кадры бойцов рисуются на большом холсте с прозрачными полями, и каждый blit
+проходит по всем этим пустым пикселям. При загрузке (ResourceManager.get_frames)
+кадр обрезается до непрозрачной области (Surface.get_bounding_rect), а смещение
+обрезанного кадра внутри холста сохраняется - Animation.draw прибавляет его сам.
+Для отраженного кадра смещение по x считается от правого края холста.
+
+Разреженные кадры (много прозрачных пикселей и после обрезки) получают
+RLEACCEL: SDL кодирует прозрачные промежутки и пропускает их при blit целиком.
+Кадры после загрузки только рисуются, поэтому распаковка RLE при доступе
+к пикселям не мешает.
+"""
+
+import pygame
+
+RLE_MAX_OPAQUE = 0.9  # RLE, если непрозрачных пикселей меньше этой доли
+
+
+def trim_frame(surface):
+    """
+    (обрезанный кадр, (dx, dy)) - смещение обрезанного кадра внутри исходного холста.
+    Отдельный кадр копируется (полный холст можно освободить), subsurface листа
+    атласа остается subsurface - лист и так в памяти.
+    """
+    rect = surface.get_bounding_rect()
+    if rect.size == surface.get_size():
+        return surface, (0, 0)
+    if not rect.width or not rect.height:
+        rect = pygame.Rect(0, 0, 1, 1)  # полностью прозрачный кадр
+    frame = surface.subsurface(rect)
+    if surface.get_parent() is None:
+        frame = frame.copy()
+    return frame, rect.topleft
+
+
+def mirrored_offset(offset, frame, canvas_width):
+    """Смещение отраженного по горизонтали кадра внутри холста шириной canvas_width"""
+    return canvas_width - offset[0] - frame.get_width(), offset[1]
+
+
+def accelerate(frames):
+    """Включает RLEACCEL для разреженных кадров (кроме subsurface - к ним RLE не применяется)"""
+    for frame in frames:
+        if frame.get_parent() is not None:
+            continue
+        width, height = frame.get_size()
+        if pygame.mask.from_surface(frame, 0).count() < width * height * RLE_MAX_OPAQUE:
+            colorkey = frame.get_colorkey()
+            if colorkey is not None:
+                frame.set_colorkey(colorkey, pygame.RLEACCEL)  # кадры перекрасок из 8-битных PNG
+            else:
+                frame.set_alpha(255, pygame.RLEACCEL)
+    return frames
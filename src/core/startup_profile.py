@@ -0,0 +1,57 @@
+# src/core/startup_profile.py
+"""
+Замер времени запуска
+---------------------
+Сколько заняли импорты и подготовка до первого кадра.
+
+  with timed("сцены"):
+      from src.scenes.menu_scene import MenuScene
+  mark("окно создано")
+  report()   # печатает таблицу после первого кадра
+
+Ленивые импорты (например, OpenCV в video_backend) тоже записываются через timed()
+и печатаются сразу, если отчет о запуске уже выведен.
+"""
+
+import sys
+import time
+from contextlib import contextmanager
+
+_START = time.perf_counter()
+_timings = []   # [(метка, секунды)]
+_marks = []     # [(метка, секунды с начала запуска)]
+_reported = False
+
+
+@contextmanager
+def timed(label):
+    """Замеряет время блока (обычно группы импортов)"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        _timings.append((label, elapsed))
+        if _reported:
+            print(f"⏱️ {label}: {elapsed * 1000:.0f} мс (после запуска)")
+
+
+def mark(label):
+    """Отмечает момент запуска (время с начала процесса)"""
+    _marks.append((label, time.perf_counter() - _START))
+
+
+def report():
+    """Печатает отчет о запуске (один раз)"""
+    global _reported
+    if _reported:
+        return
+    _reported = True
+
+    print("⏱️ Время запуска:")
+    for label, elapsed in _timings:
+        print(f"   {label:<28} {elapsed * 1000:7.0f} мс")
+    for label, at in _marks:
+        print(f"   ▶ {label:<26} {at * 1000:7.0f} мс")
+    video_loaded = "cv2" in sys.modules
+    print(f"   OpenCV загружен при старте: {'да' if video_loaded else 'нет'}")
@@ -18,9 +18,9 @@ UI utilities and widgets.
 """
 
 import pygame
+from src.core.fonts import render_text
 
-pygame.font.init()
-DEFAULT_FONT = pygame.font.SysFont("arial", 18)
+DEFAULT_FONT_SIZE = 18
 
 def draw_health_bar(surface, x, y, width, height, current_hp, max_hp):
     """Рисует простую полосу здоровья."""
@@ -65,12 +65,11 @@ def draw_cameo_icon(surface, x, y, cameo, available=False):
     pygame.draw.rect(surface, color, rect)
     pygame.draw.rect(surface, (0,0,0), rect, 2)
     if cameo:
-        txt = DEFAULT_FONT.render(cameo.name[:2].upper(), True, (0,0,0))
+        txt = render_text(cameo.name[:2].upper(), DEFAULT_FONT_SIZE, color=(0,0,0))
         surface.blit(txt, (x + 6, y + 12))
 
 def draw_message(surface, text, x, y, size=36, color=(255,255,255)):
-    font = pygame.font.SysFont("arial", size)
-    txt = font.render(text, True, color)
+    txt = render_text(text, size, color=color)
     surface.blit(txt, (x, y))
 
 def draw_hitbox(surface, rect, outline=(255,0,0)):
@@ -82,5 +81,5 @@ def draw_debug_overlay(surface, fps, position=(10,10), extra_lines=None):
     if extra_lines:
         lines.extend(extra_lines)
     for i, line in enumerate(lines):
-        txt = DEFAULT_FONT.render(line, True, (255,255,255))
+        txt = render_text(line, DEFAULT_FONT_SIZE)
         surface.blit(txt, (x, y + i*18))
\ No newline at end of file
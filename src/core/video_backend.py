@@ -0,0 +1,54 @@
+# src/core/video_backend.py
+"""
+Видео-бэкенд (OpenCV + NumPy), загружаемый лениво.
+
+Импорт cv2 и numpy занимает заметную часть запуска, а нужны они только
+для арт-видео. Модули импортируются при первом обращении (первая
+VideoAnimation с реальным файлом, кэш кадров, AssetLoader) и дальше
+переиспользуются. Импорт защищен блокировкой - к бэкенду обращаются
+и из рабочих потоков.
+
+Обычные import-инструкции внутри функций оставлены намеренно:
+PyInstaller находит их при анализе и кладет cv2/numpy в сборку.
+"""
+
+import threading
+
+from src.core.startup_profile import timed
+
+_lock = threading.Lock()
+_cv2 = None
+_np = None
+
+
+def get_numpy():
+    """Модуль numpy (импортируется при первом вызове)"""
+    global _np
+    if _np is None:
+        with _lock:
+            if _np is None:
+                with timed("numpy"):
+                    import numpy
+                _np = numpy
+    return _np
+
+
+def get_cv2():
+    """
+    Модуль cv2 (импортируется при первом вызове).
+    Бросает ImportError, если OpenCV не установлен.
+    """
+    global _cv2
+    if _cv2 is None:
+        get_numpy()  # cv2 все равно тянет numpy - замеряем их отдельно
+        with _lock:
+            if _cv2 is None:
+                with timed("cv2 (OpenCV)"):
+                    import cv2
+                _cv2 = cv2
+    return _cv2
+
+
+def is_loaded():
+    """Загружен ли уже OpenCV"""
+    return _cv2 is not None
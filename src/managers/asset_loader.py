@@ -0,0 +1,157 @@
+# src/managers/asset_loader.py
+"""
+AssetLoader - фоновая загрузка ресурсов для LoadingScene.
+
+Каждая задача состоит из двух частей:
+ - decode: выполняется в пуле потоков (чтение файла, декодирование картинки/видео в сырой буфер)
+ - finalize: выполняется в главном потоке (convert_alpha, запись в кэши, прогрев сцен)
+
+Главный поток вызывает poll() раз в кадр - он доделывает готовые задачи в пределах
+бюджета времени, поэтому экран загрузки не подвисает, а прогресс показывает
+реальное количество загруженных ресурсов.
+"""
+
+import os
+import queue
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pygame
+
+# Этапы загрузки - совпадают с текстами шагов в LoadingScene
+STAGE_RESOURCES = 0
+STAGE_CHARACTERS = 1
+STAGE_SCENES = 2
+
+
+class AssetTask:
+    def __init__(self, label, stage, decode=None, finalize=None):
+        self.label = label
+        self.stage = stage
+        self.decode = decode      # () -> result, в рабочем потоке
+        self.finalize = finalize  # (result) -> None, в главном потоке
+        self.done = False
+
+
+class AssetLoader:
+    def __init__(self, resources, max_workers=None):
+        self.resources = resources
+        self.max_workers = max_workers or min(4, os.cpu_count() or 1)
+        self.tasks = []
+        self.completed = 0
+        self.current_label = ""
+        self._results = queue.Queue()
+        self._executor = None
+        self._started = False
+        # Задачи без decode (только главный поток) выполняются строго после всех decode-задач своего этапа
+        self._main_only = []
+
+    # ---------- постановка задач ----------
+
+    def add_task(self, label, stage, decode=None, finalize=None):
+        task = AssetTask(label, stage, decode, finalize)
+        self.tasks.append(task)
+        return task
+
+    def add_image(self, path, stage=STAGE_RESOURCES):
+        """Картинка: декодируем в потоке, convert_alpha и кэш - в главном"""
+        if path in self.resources._images:
+            return None
+        return self.add_task(os.path.basename(path), stage,
+                             decode=lambda: self._decode_image(path),
+                             finalize=lambda surface: self._store_image(path, surface))
+
+    @staticmethod
+    def _decode_image(path):
+        if not os.path.exists(path):
+            return None
+        # Без convert_alpha: в рабочем потоке получаем только сырой буфер пикселей
+        return pygame.image.load(path)
+
+    def _store_image(self, path, surface):
+        if surface is not None and path not in self.resources._images:
+            self.resources._images[path] = surface.convert_alpha()
+
+    # ---------- выполнение ----------
+
+    def start(self):
+        if self._started:
+            return
+        self._started = True
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="assets")
+        for task in self.tasks:
+            if task.decode is None:
+                self._main_only.append(task)
+            else:
+                future = self._executor.submit(task.decode)
+                future.add_done_callback(lambda f, t=task: self._results.put((t, f)))
+        # Задачи главного потока идут в порядке этапов
+        self._main_only.sort(key=lambda t: t.stage)
+        if not any(t.decode for t in self.tasks):
+            self._shutdown()
+
+    def poll(self, time_budget=0.008):
+        """Доделывает готовые задачи в главном потоке, не дольше time_budget секунд"""
+        if not self._started:
+            self.start()
+        deadline = time.perf_counter() + time_budget
+
+        while time.perf_counter() < deadline:
+            try:
+                task, future = self._results.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                result = future.result()
+                if task.finalize:
+                    task.finalize(result)
+            except Exception as e:
+                print(f"❌ Ошибка загрузки ресурса {task.label}: {e}")
+            self._complete(task)
+
+        # Задачи только для главного потока - когда их этап полностью декодирован
+        while self._main_only and time.perf_counter() < deadline:
+            task = self._main_only[0]
+            if any(not t.done and t.decode for t in self.tasks if t.stage <= task.stage):
+                break
+            self._main_only.pop(0)
+            try:
+                task.finalize(None)
+            except Exception as e:
+                print(f"❌ Ошибка подготовки {task.label}: {e}")
+            self._complete(task)
+
+        if self.done:
+            self._shutdown()
+
+    def _complete(self, task):
+        task.done = True
+        self.completed += 1
+        self.current_label = task.label
+
+    def _shutdown(self):
+        if self._executor:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    # ---------- состояние ----------
+
+    @property
+    def total(self):
+        return len(self.tasks)
+
+    @property
+    def progress(self):
+        if not self.tasks:
+            return 1.0
+        return self.completed / len(self.tasks)
+
+    @property
+    def done(self):
+        return self.completed >= len(self.tasks)
+
+    @property
+    def current_stage(self):
+        """Этап первой незавершенной задачи (для подписи в LoadingScene)"""
+        pending = [t.stage for t in self.tasks if not t.done]
+        return min(pending) if pending else STAGE_SCENES + 1
@@ -0,0 +1,133 @@
+# src/managers/balance_sweep.py
+"""
+Балансировочный прогон боев бот против бота
+-------------------------------------------
+Перебирает персонажей ростера за P1; соперника выбирает pick_bot_selection -
+так же, как бот в режиме VS BOT. Бои персонажа режутся на задачи по
+JOB_MATCHES для ProcessPoolExecutor: бои идут через headless_runner.run_match
+(без окна и отрисовки) параллельно во всех процессах, а частичные результаты
+потом складываются в один отчет: процент побед, длина боя и
+нанесенный/полученный урон по персонажам.
+
+Камео и карта в BattleManager пока ни на что не влияют, поэтому по ним
+не перебираем и не группируем - отчет по ним был бы перетасовкой тех же
+боев. Добавить их, когда они попадут в симуляцию.
+
+Каждый бой получает свой seed, поэтому результат не зависит от числа
+процессов - workers=1 дает тот же отчет, только медленнее.
+
+Запуск:
+  python -m src.managers.balance_sweep              # 100 боев на персонажа, все ядра
+  python -m src.managers.balance_sweep 500 4        # 500 боев, 4 процесса
+"""
+
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from src.core.fixed_step import TICK_RATE
+from src.managers.headless_runner import run_match
+from src.scenes.character_selection_scene import CHARACTERS, pick_bot_selection
+
+JOB_MATCHES = 20  # боев в одной задаче пула
+
+
+def build_jobs(matches_per_character=100, seed=0):
+    """Задачи [(персонаж, первый seed, число боев)] - бои персонажа кусками по JOB_MATCHES"""
+    jobs = []
+    for index, character in enumerate(CHARACTERS):
+        first_seed = seed + index * matches_per_character
+        for offset in range(0, matches_per_character, JOB_MATCHES):
+            count = min(JOB_MATCHES, matches_per_character - offset)
+            jobs.append((character["name"], first_seed + offset, count))
+    return jobs
+
+
+def _new_entry():
+    return {"matches": 0, "wins": 0, "losses": 0, "draws": 0, "ticks": 0,
+            "damage_dealt": 0, "damage_taken": 0}
+
+
+def _record(entry, result, side):
+    """Добавляет бой в статистику с точки зрения бойца side (0 - P1, 1 - P2)"""
+    entry["matches"] += 1
+    entry["ticks"] += result["ticks"]
+    entry["damage_dealt"] += result["damage"][side]
+    entry["damage_taken"] += result["damage"][1 - side]
+    if result["winner"] is None:
+        entry["draws"] += 1
+    elif result["winner"] == side:
+        entry["wins"] += 1
+    else:
+        entry["losses"] += 1
+
+
+def run_job(job):
+    """
+    Бои одной задачи (выполняется в процессе пула).
+    Возвращает { персонаж: статистика } - только простые типы, чтобы дешево передать между процессами.
+    """
+    character, first_seed, count = job
+    stats = {}
+
+    for match_seed in range(first_seed, first_seed + count):
+        bot_character, _ = pick_bot_selection(character, None, random.Random(match_seed))
+        result = run_match(match_seed, (character, bot_character))
+        for side, name in enumerate((character, bot_character)):
+            _record(stats.setdefault(name, _new_entry()), result, side)
+    return stats
+
+
+def merge_results(parts):
+    """Складывает частичные результаты задач в один"""
+    merged = {}
+    for part in parts:
+        for name, entry in part.items():
+            total = merged.setdefault(name, _new_entry())
+            for key, value in entry.items():
+                total[key] += value
+    return merged
+
+
+def run_sweep(matches_per_character=100, workers=None, seed=0):
+    """
+    Полный прогон по всем персонажам.
+    workers=None - по числу ядер, workers=1 - последовательно в этом процессе.
+    """
+    jobs = build_jobs(matches_per_character, seed)
+    workers = workers or os.cpu_count() or 1
+    started = time.perf_counter()
+    if workers == 1:
+        parts = [run_job(job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            parts = list(pool.map(run_job, jobs))
+    elapsed = time.perf_counter() - started
+
+    return {
+        "stats": merge_results(parts),
+        "jobs": len(jobs),
+        "matches": len(CHARACTERS) * matches_per_character,
+        "workers": workers,
+        "seconds": elapsed,
+    }
+
+
+def print_report(report):
+    print(f"⚔️ Боев: {report['matches']} ({report['jobs']} задач), "
+          f"процессов: {report['workers']}, время: {report['seconds']:.2f} с")
+    print("\n📊 По персонажам:")
+    print(f"  {'':<20}{'бои':>7}{'победы':>9}{'ничьи':>8}{'длина, с':>10}{'урон':>9}{'получено':>10}")
+    for name, entry in sorted(report["stats"].items()):
+        matches = max(entry["matches"], 1)
+        print(f"  {name:<20}{entry['matches']:>7}{entry['wins'] / matches:>9.1%}"
+              f"{entry['draws'] / matches:>8.1%}{entry['ticks'] / matches / TICK_RATE:>10.1f}"
+              f"{entry['damage_dealt'] / matches:>9.0f}{entry['damage_taken'] / matches:>10.0f}")
+
+
+if __name__ == "__main__":
+    matches = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else None
+    print_report(run_sweep(matches, workers))
@@ -1,17 +1,181 @@
+# src/managers/battle_manager.py
+"""
+BattleManager - симуляция боя двух персонажей.
+
+Ничего не рисует и не переключает сцены: BattleScene и headless_runner
+только передают ввод обоих игроков на каждый тик и читают результат.
+Вся логика считается в фиксированных тиках (fixed_step.TICK_DT), ввод - битовые
+маски ACTION_BITS, случайность - только через переданный random.Random,
+поэтому одинаковые входы дают одинаковый бой.
+
+Раунд длится ROUND_SECONDS; если никто не упал до нуля HP,
+побеждает тот, у кого HP больше (при равенстве - ничья, winner = None).
+"""
+
+from src.core.fixed_step import TICK_DT, TICK_RATE
+from src.core.input_handler import ACTION_BITS
+
+ROUND_SECONDS = 99
+ROUND_TICKS = ROUND_SECONDS * TICK_RATE
+
+# Арена в координатах базового разрешения
+ARENA_LEFT = 0
+ARENA_RIGHT = 1280
+START_OFFSET = 250  # Отступ стартовых позиций от краев арены
+
+WALK_SPEED = 300.0           # пикселей/с
+ATTACK_DAMAGE = 50
+ATTACK_RANGE = 40            # дальность удара от края тела
+ATTACK_COOLDOWN_TICKS = 30
+BLOCK_DAMAGE_DIVIDER = 5     # блок снижает урон в 5 раз
+
+LEFT = ACTION_BITS["left"]
+RIGHT = ACTION_BITS["right"]
+ATTACK = ACTION_BITS["attack_1"]
+BLOCK = ACTION_BITS["block"]
+
+
 class BattleManager:
     """Контроль боя двух персонажей"""
-    def __init__(self, p1, p2):
+    def __init__(self, p1, p2, round_ticks=ROUND_TICKS):
         self.p1 = p1
         self.p2 = p2
-    
+        self.fighters = (p1, p2)
+        self.round_ticks = round_ticks
+        self.tick = 0
+        self.finished = False
+        self.winner = None
+        self.cooldowns = [0, 0]
+        self.damage = [0, 0]  # урон, нанесенный каждым бойцом
+        self.initial_hp = max(p1.hp, p2.hp, 1)  # для полосок HP
+        self.last_inputs = [0, 0]
+        self.reset_positions()
+
+    def reset_positions(self):
+        """Ставит бойцов по краям арены лицом друг к другу"""
+        self.p1.set_position(ARENA_LEFT + START_OFFSET, self.p1.y)
+        self.p2.set_position(ARENA_RIGHT - START_OFFSET - self.p2.rect.width, self.p2.y)
+        self.p1.is_facing_right = True
+        self.p2.is_facing_right = False
+
+    @property
+    def time_left(self):
+        """Оставшееся время раунда в секундах"""
+        return max(0, self.round_ticks - self.tick) / TICK_RATE
+
+    def step(self, input_p1=0, input_p2=0, dt=TICK_DT):
+        """Один тик боя. input_p1/input_p2 - маски ACTION_BITS"""
+        if self.finished:
+            # Бой закончен - доигрываем только анимации (победная поза)
+            for fighter in self.fighters:
+                fighter.save_previous()
+                fighter.velocity_x = 0
+                fighter.update(dt)
+            return
+
+        self.tick += 1
+        inputs = (input_p1, input_p2)
+        self.last_inputs = list(inputs)
+
+        # Движение
+        for fighter, enemy, mask in zip(self.fighters, reversed(self.fighters), inputs):
+            direction = (1 if mask & RIGHT else 0) - (1 if mask & LEFT else 0)
+            if mask & BLOCK:
+                direction = 0  # в блоке стоим на месте
+            fighter.velocity_x = direction * WALK_SPEED
+            fighter.is_facing_right = enemy.rect.centerx >= fighter.rect.centerx
+
+        for fighter in self.fighters:
+            fighter.save_previous()
+            fighter.update(dt)
+            self._clamp_to_arena(fighter)
+
+        # Удары - после движения, чтобы оба бойца били по одинаковым позициям
+        for i, (fighter, enemy, mask) in enumerate(zip(self.fighters, reversed(self.fighters), inputs)):
+            if self.cooldowns[i] > 0:
+                self.cooldowns[i] -= 1
+                continue
+            if mask & ATTACK and not mask & BLOCK:
+                self.cooldowns[i] = ATTACK_COOLDOWN_TICKS
+                if self.in_reach(fighter, enemy):
+                    blocked = inputs[1 - i] & BLOCK
+                    damage = ATTACK_DAMAGE // BLOCK_DAMAGE_DIVIDER if blocked else ATTACK_DAMAGE
+                    damage = min(damage, enemy.hp)  # HP не уходит ниже нуля
+                    enemy.hp -= damage
+                    self.damage[i] += damage
+
+        self._check_finish()
+
+    def snapshot(self):
+        """
+        Состояние боя целиком: тик, флаги, кулдауны, урон и оба бойца (Character.get_state).
+        Только неизменяемые кортежи - снапшоты можно хранить сколько угодно (тренировка, откат).
+        """
+        winner = self.fighters.index(self.winner) if self.winner is not None else None
+        return (self.tick, self.finished, winner, tuple(self.cooldowns), tuple(self.damage),
+                tuple(self.last_inputs), self.p1.get_state(), self.p2.get_state())
+
+    def restore(self, snapshot):
+        """Возвращает бой к snapshot() - те же объекты Character, без загрузки ассетов"""
+        self.tick, self.finished, winner, cooldowns, damage, last_inputs, state_p1, state_p2 = snapshot
+        self.winner = self.fighters[winner] if winner is not None else None
+        self.cooldowns = list(cooldowns)
+        self.damage = list(damage)
+        self.last_inputs = list(last_inputs)
+        self.p1.set_state(state_p1)
+        self.p2.set_state(state_p2)
+
     def update(self, dt):
-        self.p1.update(dt)
-        self.p2.update(dt)
-    
+        """Совместимость: тик без ввода"""
+        self.step(0, 0, dt)
+
+    def _clamp_to_arena(self, fighter):
+        right_limit = ARENA_RIGHT - fighter.rect.width
+        if fighter.x < ARENA_LEFT or fighter.x > right_limit:
+            fighter.x = min(max(fighter.x, ARENA_LEFT), right_limit)
+            fighter.rect.x = int(fighter.x)
+
+    @staticmethod
+    def in_reach(attacker, defender):
+        if attacker.is_facing_right:
+            reach_left, reach_right = attacker.rect.right, attacker.rect.right + ATTACK_RANGE
+        else:
+            reach_left, reach_right = attacker.rect.left - ATTACK_RANGE, attacker.rect.left
+        return reach_left < defender.rect.right and defender.rect.left < reach_right
+
+    def _check_finish(self):
+        p1_down = self.p1.hp <= 0
+        p2_down = self.p2.hp <= 0
+        if p1_down or p2_down:
+            self.finished = True
+            self.winner = None if p1_down and p2_down else (self.p2 if p1_down else self.p1)
+        elif self.tick >= self.round_ticks:
+            # Время вышло - побеждает тот, у кого больше HP
+            self.finished = True
+            if self.p1.hp != self.p2.hp:
+                self.winner = self.p1 if self.p1.hp > self.p2.hp else self.p2
+
     def check_hit(self, a, d):
         """
         a - атакующий
         d - защищающийся
         """
         if a.rect.colliderect(d.rect):
-            print(f"{a.name} hit {d.name}")
\ No newline at end of file
+            print(f"{a.name} hit {d.name}")
+
+
+def bot_controls(battle, index, rng):
+    """
+    Простой бот: подходит на дистанцию удара, бьет, иногда ставит блок.
+    rng - random.Random (для воспроизводимых боев передавай с фиксированным seed).
+    """
+    me = battle.fighters[index]
+    enemy = battle.fighters[1 - index]
+    mask = 0
+    if not battle.in_reach(me, enemy):
+        mask |= RIGHT if enemy.rect.centerx > me.rect.centerx else LEFT
+    elif rng.random() < 0.2:
+        mask |= BLOCK
+    else:
+        mask |= ATTACK
+    return mask
@@ -7,6 +7,8 @@ GameManager - унифицированная система управления
 import pygame
 import os
 import sys
+from src.core.fonts import CachedFont, get_font
+from src.core.fixed_step import FixedStepClock
 
 def resource_path(relative_path):
     """Получает правильный путь к ресурсам для .exe и .py"""
@@ -18,10 +20,37 @@ def resource_path(relative_path):
     
     return os.path.join(base_path, relative_path)
 
+DIRTY_MERGE_DISTANCE = 32  # области ближе этого (в пикселях) перерисовываются одним проходом
+
+
+def merge_dirty_rects(rects, distance=DIRTY_MERGE_DISTANCE):
+    """Объединяет пересекающиеся и близкие (не дальше distance) области; далекие остаются отдельными"""
+    merged = []
+    for rect in rects:
+        rect = pygame.Rect(rect)
+        i = 0
+        while i < len(merged):
+            if rect.inflate(distance * 2, distance * 2).colliderect(merged[i]):
+                rect.union_ip(merged.pop(i))
+                i = 0  # выросшая область может задеть уже проверенные
+            else:
+                i += 1
+        merged.append(rect)
+    return merged
+
 # src/managers/game_manager.py
 class BaseScene:
+    # Сцена умеет сообщать измененные области (режим dirty_rects в настройках).
+    # Для остальных сцен экран всегда перерисовывается целиком.
+    supports_dirty_rects = False
+
     def __init__(self, game_manager):
         self.gm = game_manager
+        # Доля между двумя последними тиками fixed_update - для интерполяции в draw
+        self.interpolation_alpha = 1.0
+        self._dirty_rects = []
+        self._full_redraw = True
+        self._layers = {}  # { (name, size): Surface } - статичные слои, нарисованные один раз
         
     def handle_events(self, events):
         pass
@@ -56,11 +85,46 @@ class BaseScene:
         if hasattr(self.gm, 'settings') and self.gm.settings:
             return self.gm.settings.scale_font_size(size)
         return size
+
+    # DIRTY RECTS
+    def invalidate(self, rect=None):
+        """Пометить область для перерисовки (rect=None - весь экран)"""
+        if rect is None:
+            self._full_redraw = True
+        else:
+            self._dirty_rects.append(pygame.Rect(rect))
+
+    def get_dirty_rects(self):
+        """
+        Измененные с прошлого кадра области.
+        None - перерисовать весь экран, [] - ничего не изменилось.
+        """
+        if not self.supports_dirty_rects or self._full_redraw:
+            self._full_redraw = False
+            self._dirty_rects = []
+            return None
+        rects, self._dirty_rects = self._dirty_rects, []
+        return rects
+
+    def get_layer(self, name, size, paint):
+        """
+        Статичный слой (градиент и т.п.), нарисованный paint(surface) один раз для размера size.
+        При смене разрешения слой перерисовывается.
+        """
+        key = (name, tuple(size))
+        layer = self._layers.get(key)
+        if layer is None:
+            for old_key in [k for k in self._layers if k[0] == name]:
+                del self._layers[old_key]
+            layer = pygame.Surface(size).convert()
+            paint(layer)
+            self._layers[key] = layer
+        return layer
     
     def get_font(self, size, bold=False):
         """Получение шрифта с масштабированием"""
         font_size = self.f(size)
-        return pygame.font.SysFont("arial", font_size, bold=bold)
+        return CachedFont(font_size, bold)
     
         # Это можно добавить в BaseScene или как отдельную утилиту
     def load_icon(self, icon_name, size=24):
@@ -106,7 +170,7 @@ class BaseScene:
             text = "I"
         
         # Добавляем текст
-        font = pygame.font.SysFont("arial", max(10, size // 2))
+        font = get_font(max(10, size // 2))
         text_surface = font.render(text, True, (255, 255, 255))
         text_rect = text_surface.get_rect(center=(size//2, size//2))
         icon.blit(text_surface, text_rect)
@@ -126,6 +190,13 @@ class GameManager:
         self.delta = 0.0
         self.settings = None
         self.music_playing = False
+        # Тики фиксированного шага для сцен с fixed_update (бой)
+        self.sim_clock = FixedStepClock()
+
+    @property
+    def dirty_rects_enabled(self):
+        """Режим частичной перерисовки (для слабых машин), включается в настройках"""
+        return bool(self.settings and self.settings.current_settings.get("dirty_rects", False))
 
     def register_scene(self, name, scene):
         self.scenes[name] = scene
@@ -159,25 +230,70 @@ class GameManager:
                 self.active_scene.on_exit()
         
         self.active_scene = self.scenes.get(name)
+        self.sim_clock.reset()
         if self.active_scene:
             if hasattr(self.active_scene, 'on_enter'):
                 self.active_scene.on_enter()
             elif hasattr(self.active_scene, 'start'):  # ✅ Поддержка старых сцен
                 self.active_scene.start()
+            if hasattr(self.active_scene, 'invalidate'):
+                self.active_scene.invalidate()
 
     def handle_events(self, events):
         if self.active_scene:
+            # Любой ввод может поменять что угодно на экране - перерисовываем целиком.
+            # Движение мыши без нажатых кнопок ничего не меняет (подсветки по наведению нет).
+            if self.dirty_rects_enabled and hasattr(self.active_scene, 'invalidate'):
+                for event in events:
+                    if event.type != pygame.MOUSEMOTION or any(event.buttons):
+                        self.active_scene.invalidate()
+                        break
             self.active_scene.handle_events(events)
 
     def update(self, dt):
         self.delta = dt
-        if self.active_scene:
-            self.active_scene.update(dt)
+        scene = self.active_scene
+        if not scene:
+            return
+        # Симуляция - только целыми фиксированными тиками, независимо от FPS
+        if hasattr(scene, 'fixed_update'):
+            for _ in range(self.sim_clock.advance(dt)):
+                scene.fixed_update(self.sim_clock.dt)
+                if self.active_scene is not scene:
+                    return  # сцена сменилась посреди тиков
+            scene.interpolation_alpha = self.sim_clock.alpha
+        scene.update(dt)
 
     def get_scene(self, scene_name):
         """Возвращает сцену по имени"""
         return self.scenes.get(scene_name)
 
     def draw(self, surface):
-        if self.active_scene:
-            self.active_scene.draw(surface)
\ No newline at end of file
+        """
+        Рисует активную сцену.
+        Возвращает None, если перерисован весь экран (нужен display.flip),
+        или список измененных областей для display.update (пустой - обновлять нечего).
+        """
+        scene = self.active_scene
+        if not scene:
+            surface.fill((0, 0, 0))
+            return None
+
+        rects = scene.get_dirty_rects() if self.dirty_rects_enabled and hasattr(scene, 'get_dirty_rects') else None
+        if rects is None:
+            surface.fill((0, 0, 0))
+            scene.draw(surface)
+            return None
+
+        if rects:
+            # Сцена рисуется как обычно, но пиксели меняются только внутри измененных областей.
+            # Далекие области (наведение в углу и арт в другом) - отдельными проходами:
+            # общий прямоугольник накрыл бы почти весь экран
+            rects = merge_dirty_rects(rects)
+            try:
+                for rect in rects:
+                    surface.set_clip(rect)
+                    scene.draw(surface)
+            finally:
+                surface.set_clip(None)
+        return rects
\ No newline at end of file
@@ -0,0 +1,183 @@
+# src/managers/headless_runner.py
+"""
+Headless-прогон боев
+--------------------
+Бой без окна и отрисовки: два Character + BattleManager, которые шагают
+тиками fixed_step.TICK_DT так быстро, как позволяет процессор.
+Нужен для балансировки, проверки детерминизма и обучения бота.
+
+SDL запускается с dummy-драйверами (окно не создается, звук не открывается),
+draw() нигде не вызывается. Оба бойца управляются bot_controls со своим
+random.Random(seed) - один и тот же seed дает один и тот же бой.
+
+Запуск:
+  python -m src.managers.headless_runner              # 100 боев, seed 0
+  python -m src.managers.headless_runner 1000 42      # 1000 боев, seed 42
+  python -m src.managers.headless_runner --record match.vwr 42   # записать бой с seed 42
+  python -m src.managers.headless_runner --replay match.vwr      # воспроизвести и сверить итог
+"""
+
+import os
+import random
+import sys
+import time
+
+# До импорта pygame: без окна и без звуковой карты
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+
+from src.core.character import Character
+from src.core.fixed_step import TICK_DT, TICK_RATE
+from src.core.input_handler import InputHandler
+from src.core.replay import Replay, ReplayRecorder, ReplayPlayer
+from src.managers.battle_manager import BattleManager, bot_controls, ROUND_TICKS
+
+DEFAULT_FIGHTERS = ("Player1", "Player2")
+
+
+def run_match(seed=0, names=DEFAULT_FIGHTERS, round_ticks=ROUND_TICKS, recorder=None):
+    """
+    Один бой до конца раунда.
+    Возвращает {"winner": индекс бойца или None (ничья), "ticks": ..., "hp": (hp1, hp2),
+                "damage": (урон P1, урон P2)}
+    recorder - ReplayRecorder, если бой нужно записать.
+    """
+    # resource_manager=None - без спрайтов и без обращений к диску
+    p1 = Character(names[0], None)
+    p2 = Character(names[1], None)
+    battle = BattleManager(p1, p2, round_ticks)
+    rng_p1 = random.Random(seed * 2)
+    rng_p2 = random.Random(seed * 2 + 1)
+
+    while not battle.finished:
+        input_p1, input_p2 = bot_controls(battle, 0, rng_p1), bot_controls(battle, 1, rng_p2)
+        if recorder:
+            recorder.record(input_p1, input_p2, battle.snapshot() if recorder.needs_keyframe else None)
+        battle.step(input_p1, input_p2, TICK_DT)
+
+    return _get_result(battle)
+
+
+def _get_result(battle):
+    p1, p2 = battle.fighters
+    winner = battle.fighters.index(battle.winner) if battle.winner else None
+    return {"winner": winner, "ticks": battle.tick, "hp": (p1.hp, p2.hp), "damage": tuple(battle.damage)}
+
+
+def record_match(path, seed=0, names=DEFAULT_FIGHTERS, round_ticks=ROUND_TICKS):
+    """Бой ботов с записью реплея в path; возвращает Replay"""
+    recorder = ReplayRecorder({
+        "characters": list(names),
+        "cameos": [None, None],
+        "skins": ["default", "default"],
+        "map": "soul_beach",
+        "mode": "headless",
+        "seed": seed,
+        "round_ticks": round_ticks,
+        "tick_rate": TICK_RATE,
+    })
+    result = run_match(seed, names, round_ticks, recorder)
+    replay = recorder.finish(result["ticks"], json_result(result))
+    replay.save(path)
+    return replay
+
+
+def run_replay(replay, from_tick=0):
+    """
+    Воспроизводит реплей без окна так быстро, как может процессор.
+    Ввод идет через два InputHandler (как у живых игроков).
+    from_tick - начать с ближайшего ключевого кадра не позже этого тика (проверка перемотки).
+    Возвращает (итог, тиков/с).
+    """
+    meta = replay.metadata
+    names = meta.get("characters") or DEFAULT_FIGHTERS
+    battle = BattleManager(Character(names[0], None), Character(names[1], None),
+                           meta.get("round_ticks", ROUND_TICKS))
+    handlers = (InputHandler(), InputHandler())
+    player = ReplayPlayer(replay, handlers)
+    keyframe = replay.keyframe_before(from_tick) if from_tick else None
+    if keyframe:
+        battle.restore(keyframe[1])
+        player.seek(keyframe[0])
+
+    started = time.perf_counter()
+    while not battle.finished and player.next_tick():
+        battle.step(handlers[0].get_action_mask(), handlers[1].get_action_mask(), TICK_DT)
+    elapsed = max(time.perf_counter() - started, 1e-9)
+    return _get_result(battle), (player.tick - (keyframe[0] if keyframe else 0)) / elapsed
+
+
+def run_matches(count=100, seed=0, names=DEFAULT_FIGHTERS, round_ticks=ROUND_TICKS):
+    """
+    count боев подряд с seed, seed+1, ...
+    Возвращает сводку: победы, ничьи, тики, скорость в тиках/с и во сколько раз быстрее реального времени.
+    """
+    wins = [0, 0]
+    draws = 0
+    total_ticks = 0
+    started = time.perf_counter()
+    for i in range(count):
+        result = run_match(seed + i, names, round_ticks)
+        total_ticks += result["ticks"]
+        if result["winner"] is None:
+            draws += 1
+        else:
+            wins[result["winner"]] += 1
+    elapsed = max(time.perf_counter() - started, 1e-9)
+
+    ticks_per_second = total_ticks / elapsed
+    return {
+        "matches": count,
+        "wins": tuple(wins),
+        "draws": draws,
+        "ticks": total_ticks,
+        "seconds": elapsed,
+        "ticks_per_second": ticks_per_second,
+        "realtime_factor": ticks_per_second / TICK_RATE,
+    }
+
+
+def print_report(stats):
+    print(f"⚔️ Боев: {stats['matches']}  (победы P1/P2: {stats['wins'][0]}/{stats['wins'][1]}, ничьи: {stats['draws']})")
+    print(f"⏱️ Тиков: {stats['ticks']} за {stats['seconds']:.2f} с")
+    print(f"🚀 {stats['ticks_per_second']:.0f} тиков/с  (x{stats['realtime_factor']:.0f} от реального времени)")
+
+
+def _print_replay_check(path):
+    replay = Replay.load(path)
+    result, ticks_per_second = run_replay(replay)
+    expected = replay.metadata.get("result")
+    print(f"📼 {path}: {os.path.getsize(path)} байт, {replay.ticks} тиков, "
+          f"серий ввода {len(replay.runs[0])}/{len(replay.runs[1])}")
+    print(f"🚀 Воспроизведение: {ticks_per_second:.0f} тиков/с (x{ticks_per_second / TICK_RATE:.0f} от реального времени)")
+    if expected is not None:
+        same = expected == json_result(result)
+        print("✅ Итог совпал с записью" if same else f"❌ Итог отличается: {result} != {expected}")
+    if replay.keyframe_ticks:
+        # Перемотка: с последнего ключевого кадра до середины боя и дальше до конца
+        middle = replay.ticks // 2
+        result, _ = run_replay(replay, middle)
+        start = replay.keyframe_before(middle)[0]
+        print(f"⏩ Ключевых кадров: {len(replay.keyframe_ticks)} (каждые {replay.keyframe_interval} тиков), "
+              f"с тика {start}: " + ("итог совпал" if json_result(result) == expected else f"❌ {result}"))
+
+
+def json_result(result):
+    """Итог в том виде, в каком он лежит в метаданных реплея (JSON: кортежи -> списки)"""
+    return {key: list(value) if isinstance(value, tuple) else value for key, value in result.items()}
+
+
+if __name__ == "__main__":
+    pygame.init()
+    if len(sys.argv) > 2 and sys.argv[1] == "--record":
+        record_match(sys.argv[2], int(sys.argv[3]) if len(sys.argv) > 3 else 0)
+        _print_replay_check(sys.argv[2])
+    elif len(sys.argv) > 2 and sys.argv[1] == "--replay":
+        _print_replay_check(sys.argv[2])
+    else:
+        matches = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+        seed = int(sys.argv[2]) if len(sys.argv) > 2 else 0
+        print_report(run_matches(matches, seed))
+    pygame.quit()
@@ -66,6 +66,10 @@ class LanguageManager:
             "battle_mode": "РЕЖИМЫ БОЯ",
             "vs_bot": "VS BOT",
             "vs_friend": "ПРОТИВ ДРУГА",
+            "vs_friend_online": "ПО СЕТИ",
+            "netplay_waiting": "Ожидание соперника",
+            "netplay_back": "ESC - в меню",
+            "netplay_port_error": "Порт занят",
             "training": "ТРЕНИРОВКА",
             
             # Выбор персонажей
@@ -96,6 +100,7 @@ class LanguageManager:
             "fullscreen": "Полноэкранный режим:",
             "resolution": "Разрешение экрана:",
             "language": "Язык интерфейса:",
+            "save_replays": "Сохранять реплеи:",
             "apply": "ПРИМЕНИТЬ",
             "back": "НАЗАД",
             
@@ -219,6 +224,10 @@ class LanguageManager:
             "battle_mode": "BATTLE MODES",
             "vs_bot": "VS BOT",
             "vs_friend": "VS FRIEND",
+            "vs_friend_online": "ONLINE",
+            "netplay_waiting": "Waiting for opponent",
+            "netplay_back": "ESC - back to menu",
+            "netplay_port_error": "Port is busy",
             "training": "TRAINING",
             
             # Character selection
@@ -249,6 +258,7 @@ class LanguageManager:
             "fullscreen": "Fullscreen Mode:",
             "resolution": "Screen Resolution:",
             "language": "Interface Language:",
+            "save_replays": "Save Replays:",
             "apply": "APPLY",
             "back": "BACK",
             
@@ -372,6 +382,10 @@ class LanguageManager:
             "battle_mode": "MODOS DE LUCHA",
             "vs_bot": "VS BOT",
             "vs_friend": "CONTRA AMIGO",
+            "vs_friend_online": "EN LÍNEA",
+            "netplay_waiting": "Esperando al rival",
+            "netplay_back": "ESC - volver al menú",
+            "netplay_port_error": "Puerto ocupado",
             "training": "ENTRENAMIENTO",
             
             # Selección de personajes
@@ -402,6 +416,7 @@ class LanguageManager:
             "fullscreen": "Pantalla completa:",
             "resolution": "Resolución de pantalla:",
             "language": "Idioma de interfaz:",
+            "save_replays": "Guardar repeticiones:",
             "apply": "APLICAR",
             "back": "ATRÁS",
             
@@ -0,0 +1,493 @@
+# src/managers/netplay.py
+"""
+Сетевая игра с откатом (rollback netcode)
+-----------------------------------------
+По сети передается только ввод (маски ACTION_BITS), симуляцию боя каждый
+игрок считает сам - BattleManager детерминирован.
+
+ - UdpTransport      - неблокирующий UDP-сокет; в каждом пакете все еще не
+                       подтвержденные соперником вводы (потерянный пакет
+                       перекрывается следующим) и номер последнего полученного кадра (ack)
+ - RollbackSession   - свой ввод идет с задержкой input_delay кадров, ввод соперника,
+                       которого еще нет, предсказывается (повтор последнего известного).
+                       Когда настоящий ввод отличается от предсказанного, бой
+                       откатывается к снапшоту (BattleManager.snapshot/restore) и
+                       пересчитывается до текущего кадра. Если соперник отстал больше
+                       чем на max_rollback кадров, сессия ждет (stall).
+ - NetplayHandshake  - до боя: каждый игрок присылает свой выбор (персонаж, камео,
+                       скины; P1 еще карту и seed), из двух выборов собирается одна
+                       настройка боя, и стороны сверяют ее контрольную сумму.
+                       Другая версия протокола, два P1 или разные настройки -
+                       NetplayError, а не молча разошедшийся бой.
+
+Режим "ПО СЕТИ" (vs_friend_online) выбирается в меню: CharacterSelectionScene
+(свой боец, карту выбирает P1) -> NetplayLobbyScene (ожидание соперника) -> бой.
+Адрес берется из настройки "netplay" (game_settings.json) или из командной строки:
+  python main.py --netplay 1 7000 127.0.0.1:7001 [задержка]
+  python main.py --netplay 2 7001 127.0.0.1:7000 [задержка]
+
+Проверка без окна (боты с обеих сторон, в конце - сверка итогового состояния):
+  python -m src.managers.netplay 1 7000 127.0.0.1:7001 [задержка] [потери 0..1]
+  python -m src.managers.netplay 2 7001 127.0.0.1:7000 [задержка] [потери 0..1]
+"""
+
+import json
+import random
+import socket
+import struct
+import time
+import zlib
+
+from src.core.fixed_step import TICK_DT, TICK_RATE
+
+DEFAULT_INPUT_DELAY = 2     # кадров задержки своего ввода (меньше откатов, но больше лаг)
+MAX_ROLLBACK_FRAMES = 8     # дальше этого предсказывать не даем - ждем соперника
+MAX_INPUTS_PER_PACKET = 64
+
+NETPLAY_VERSION = 1         # у обоих игроков должна совпадать
+PACKET_MAGIC = b"VW"
+PACKET_INPUTS = 1
+PACKET_HELLO = 2
+# magic, тип - начало любого пакета; за PACKET_HELLO следует JSON
+KIND = struct.Struct("!2sB")
+# magic, тип, ack (последний кадр соперника, полученный подряд; -1 - ничего), первый кадр, число вводов
+HEADER = struct.Struct("!2sBiiB")
+INPUT = struct.Struct("!H")
+
+
+class NetplayError(Exception):
+    """Игроки не могут начать бой: разные версии, оба - один и тот же игрок, разные настройки"""
+
+
+class UdpTransport:
+    """Обмен вводом по UDP (без соединения и без блокировок)"""
+    def __init__(self, local_port, remote_addr, loss=0.0, seed=None):
+        self.remote_addr = remote_addr
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.bind(("", local_port))
+        self.sock.setblocking(False)
+        # Имитация потерь пакетов - только для проверки отката
+        self.loss = loss
+        self.rng = random.Random(seed)
+        self.sent = 0
+        self.received = 0
+        self.hellos = []  # пришедшие PACKET_HELLO (dict) - их читает NetplayHandshake
+
+    def send_inputs(self, ack, start_frame, masks):
+        packet = HEADER.pack(PACKET_MAGIC, PACKET_INPUTS, ack, start_frame, len(masks))
+        self._send(packet + b"".join(INPUT.pack(mask) for mask in masks))
+
+    def send_hello(self, hello):
+        self._send(KIND.pack(PACKET_MAGIC, PACKET_HELLO) + json.dumps(hello).encode("utf-8"))
+
+    def _send(self, packet):
+        if self.loss and self.rng.random() < self.loss:
+            return
+        try:
+            self.sock.sendto(packet, self.remote_addr)
+            self.sent += 1
+        except OSError:
+            pass  # соперник еще не запущен (ICMP port unreachable) - просто повторим позже
+
+    def receive(self):
+        """Все пришедшие пакеты ввода: [(ack, первый кадр, [маски])]; PACKET_HELLO - в self.hellos"""
+        packets = []
+        while True:
+            try:
+                data, addr = self.sock.recvfrom(2048)
+            except (BlockingIOError, InterruptedError):
+                break
+            except OSError:
+                continue  # ошибка от предыдущей отправки (Windows) - читаем дальше
+            if len(data) < KIND.size:
+                continue
+            magic, kind = KIND.unpack_from(data)
+            if magic == PACKET_MAGIC and kind == PACKET_HELLO:
+                try:
+                    self.hellos.append(json.loads(data[KIND.size:].decode("utf-8")))
+                except ValueError:
+                    pass
+                continue
+            if len(data) < HEADER.size:
+                continue
+            magic, kind, ack, start_frame, count = HEADER.unpack_from(data)
+            if magic != PACKET_MAGIC or kind != PACKET_INPUTS or len(data) < HEADER.size + count * INPUT.size:
+                continue
+            masks = [INPUT.unpack_from(data, HEADER.size + i * INPUT.size)[0] for i in range(count)]
+            packets.append((ack, start_frame, masks))
+            self.received += 1
+        return packets
+
+    def close(self):
+        self.sock.close()
+
+
+class RollbackSession:
+    """Бой BattleManager, синхронизируемый с соперником через откаты"""
+    def __init__(self, battle, local_index, transport, input_delay=DEFAULT_INPUT_DELAY,
+                 max_rollback=MAX_ROLLBACK_FRAMES):
+        self.battle = battle
+        self.local_index = local_index
+        self.transport = transport
+        self.input_delay = input_delay
+        self.max_rollback = max_rollback
+
+        self.frame = 0               # следующий кадр для симуляции
+        self.local_inputs = {}       # кадр -> своя маска
+        self.remote_inputs = {}      # кадр -> подтвержденная маска соперника
+        self.predicted = {}          # кадр -> маска соперника, с которой кадр посчитан
+        self.snapshots = {}          # кадр -> снапшот боя перед этим кадром
+        self.remote_confirmed = -1   # до этого кадра включительно ввод соперника известен
+        self.remote_ack = -1         # до этого кадра соперник получил наш ввод
+        self.waiting = False         # последний advance() ждал соперника
+        self.recorder = None         # ReplayRecorder - сюда идут кадры, к которым откат уже невозможен
+        self.recorded = -1           # последний записанный кадр
+
+        # Первые input_delay кадров своего ввода нет - это пустые маски, но соперник должен их получить
+        for frame in range(input_delay):
+            self.local_inputs[frame] = 0
+        self.last_local_frame = input_delay - 1  # последний кадр, для которого есть свой ввод
+
+        self.stats = {"rollbacks": 0, "rollback_frames": 0, "resim_seconds": 0.0, "stalls": 0}
+        # Значения за последнюю секунду симуляции (TICK_RATE кадров)
+        self.per_second = {"rollback_frames": 0, "resim_ms": 0.0}
+        self._window = {"rollback_frames": 0, "resim_seconds": 0.0}
+
+    def advance(self, local_mask):
+        """
+        Один кадр: обмен вводом, откат при ошибке предсказания и шаг боя.
+        Возвращает False, если кадр не посчитан (ждем соперника).
+        """
+        self._receive()
+
+        if self.frame - self.remote_confirmed > self.max_rollback:
+            self.stats["stalls"] += 1
+            self.waiting = True
+            self._send()
+            return False
+        self.waiting = False
+
+        self.last_local_frame = self.frame + self.input_delay
+        self.local_inputs[self.last_local_frame] = local_mask
+        self._send()
+
+        self.snapshots[self.frame] = self.battle.snapshot()
+        self.battle.step(*self._inputs(self.frame), TICK_DT)
+        self.frame += 1
+        if self.recorder:
+            self._record()
+
+        if self.frame % TICK_RATE == 0:
+            self.per_second = {"rollback_frames": self._window["rollback_frames"],
+                               "resim_ms": self._window["resim_seconds"] * 1000}
+            self._window = {"rollback_frames": 0, "resim_seconds": 0.0}
+        return True
+
+    def poll(self):
+        """Обмен вводом без шага (после конца боя - дослать сопернику последние кадры)"""
+        self._receive()
+        self._send()
+
+    def is_confirmed(self):
+        """Все посчитанные кадры - с настоящим вводом соперника (отката уже не будет)"""
+        return self.remote_confirmed >= self.frame - 1
+
+    def is_result_confirmed(self):
+        """
+        Бой закончен и все кадры до конца боя посчитаны с настоящим вводом.
+        Кадры после конца (battle.tick больше не растет) на итог не влияют -
+        соперник может их и не прислать.
+        """
+        return self.battle.finished and self.remote_confirmed >= self.battle.tick - 1
+
+    def is_synced(self):
+        """Итог подтвержден, и соперник получил весь наш ввод до конца боя"""
+        return self.is_result_confirmed() and self.remote_ack >= self.battle.tick - 1
+
+    def _inputs(self, frame):
+        """(ввод P1, ввод P2) для кадра; ввод соперника - настоящий или предсказанный"""
+        local = self.local_inputs.get(frame, 0)
+        remote = self.remote_inputs.get(frame)
+        if remote is None:
+            remote = self.remote_inputs.get(self.remote_confirmed, 0)
+            self.predicted[frame] = remote
+        else:
+            self.predicted.pop(frame, None)
+        return (local, remote) if self.local_index == 0 else (remote, local)
+
+    def _send(self):
+        # Пустой список тоже отправляем - соперник получит ack
+        last = self.last_local_frame
+        first = max(self.remote_ack + 1, last - MAX_INPUTS_PER_PACKET + 1)
+        masks = [self.local_inputs[frame] for frame in range(first, last + 1)]
+        self.transport.send_inputs(self.remote_confirmed, first, masks)
+
+    def _receive(self):
+        rollback_from = None
+        for ack, start_frame, masks in self.transport.receive():
+            self.remote_ack = max(self.remote_ack, ack)
+            for offset, mask in enumerate(masks):
+                frame = start_frame + offset
+                if frame <= self.remote_confirmed or frame in self.remote_inputs:
+                    continue
+                self.remote_inputs[frame] = mask
+                # Кадр уже посчитан с другим вводом - нужен откат
+                if frame < self.frame and self.predicted.get(frame) != mask:
+                    if rollback_from is None or frame < rollback_from:
+                        rollback_from = frame
+
+        previous_confirmed = self.remote_confirmed
+        while self.remote_confirmed + 1 in self.remote_inputs:
+            self.remote_confirmed += 1
+
+        if rollback_from is not None:
+            self._rollback(rollback_from)
+        if self.remote_confirmed != previous_confirmed:
+            if self.recorder:
+                self._record()
+            self._forget(previous_confirmed)
+
+    def _rollback(self, from_frame):
+        """Возврат к кадру from_frame и пересчет до текущего с исправленным вводом"""
+        started = time.perf_counter()
+        self.battle.restore(self.snapshots[from_frame])
+        for frame in range(from_frame, self.frame):
+            self.snapshots[frame] = self.battle.snapshot()
+            self.battle.step(*self._inputs(frame), TICK_DT)
+        elapsed = time.perf_counter() - started
+
+        frames = self.frame - from_frame
+        self.stats["rollbacks"] += 1
+        self.stats["rollback_frames"] += frames
+        self.stats["resim_seconds"] += elapsed
+        self._window["rollback_frames"] += frames
+        self._window["resim_seconds"] += elapsed
+
+    def _record(self):
+        """Подтвержденные посчитанные кадры - в реплей (до _forget, пока вводы еще есть)"""
+        last = min(self.remote_confirmed, self.frame - 1)
+        for frame in range(self.recorded + 1, last + 1):
+            local = self.local_inputs.get(frame, 0)
+            remote = self.remote_inputs[frame]
+            inputs = (local, remote) if self.local_index == 0 else (remote, local)
+            # Снапшот перед подтвержденным кадром уже посчитан с настоящим вводом
+            self.recorder.record(*inputs, self.snapshots.get(frame))
+        self.recorded = max(self.recorded, last)
+
+    def _forget(self, previous_confirmed):
+        """Удаляет снапшоты и вводы, к которым откат уже невозможен"""
+        # Соперник может быть впереди - еще не посчитанные кадры не трогаем
+        keep_from = min(self.remote_confirmed + 1, self.frame)
+        for frame in range(previous_confirmed + 1, keep_from):
+            self.snapshots.pop(frame, None)
+            self.predicted.pop(frame, None)
+        # Последний подтвержденный ввод соперника нужен для предсказания
+        for frame in [f for f in self.remote_inputs if f < min(self.remote_confirmed, keep_from)]:
+            del self.remote_inputs[frame]
+        for frame in [f for f in self.local_inputs if f < min(self.remote_ack + 1, keep_from)]:
+            del self.local_inputs[frame]
+
+    def close(self):
+        self.transport.close()
+
+
+class NetplayHandshake:
+    """
+    Обмен выбором игроков перед боем (без блокировок - poll() раз в кадр).
+    pick - свой выбор: {"character", "cameo", "skin", "cameo_skin"}, у P1 еще "map" и "seed".
+    Когда выбор соперника пришел, setup - настройка боя, одинаковая у обоих:
+    {"characters": [P1, P2], "cameos": [...], "skins": [...], "cameo_skins": [...], "map", "seed"}.
+    Каждый hello после этого несет контрольную сумму setup; готово, когда соперник
+    прислал ту же сумму или уже шлет ввод (значит, свою проверку он прошел).
+    """
+    def __init__(self, transport, player, pick):
+        self.transport = transport
+        self.player = player  # 1 или 2
+        self.pick = pick
+        self.setup = None
+        self.checksum = None
+        self.done = False
+
+    def poll(self):
+        """Один обмен; True - setup известен обоим. Несовпадение - NetplayError"""
+        inputs_arrived = bool(self.transport.receive())
+        hellos, self.transport.hellos = self.transport.hellos, []
+        remote_checksum = None
+        try:
+            for hello in hellos:
+                self._check(hello)
+                if self.setup is None:
+                    self.setup = self._combine(hello["pick"])
+                    self.checksum = setup_checksum(self.setup)
+                if hello.get("checksum") is not None:
+                    remote_checksum = hello["checksum"]
+                    if remote_checksum != self.checksum:
+                        raise NetplayError("у игроков разные настройки боя - проверь версию игры и ростер")
+        finally:
+            # И при ошибке: соперник получит наш hello и тоже остановится, а не будет ждать
+            self._send_hello()
+        if self.setup is not None and (remote_checksum is not None or inputs_arrived):
+            self.done = True
+        return self.done
+
+    def _send_hello(self):
+        self.transport.send_hello({"version": NETPLAY_VERSION, "player": self.player,
+                                   "pick": self.pick, "checksum": self.checksum})
+
+    def _check(self, hello):
+        if hello.get("version") != NETPLAY_VERSION:
+            raise NetplayError(f"версия сетевой игры соперника {hello.get('version')}, у нас {NETPLAY_VERSION}")
+        if hello.get("player") == self.player:
+            raise NetplayError(f"оба игрока запущены как P{self.player} - у соперника должен быть другой номер")
+        if not isinstance(hello.get("pick"), dict):
+            raise NetplayError("соперник не прислал выбор бойца")
+
+    def _combine(self, remote_pick):
+        p1, p2 = (self.pick, remote_pick) if self.player == 1 else (remote_pick, self.pick)
+        return {
+            "characters": [p1["character"], p2["character"]],
+            "cameos": [p1.get("cameo"), p2.get("cameo")],
+            "skins": [p1.get("skin", "default"), p2.get("skin", "default")],
+            "cameo_skins": [p1.get("cameo_skin", "default"), p2.get("cameo_skin", "default")],
+            "map": p1.get("map", "soul_beach"),
+            "seed": p1.get("seed", 0),
+        }
+
+
+def setup_checksum(setup):
+    return zlib.crc32(json.dumps(setup, sort_keys=True).encode("utf-8"))
+
+
+def parse_netplay_args(argv):
+    """
+    --netplay <игрок 1|2> <свой порт> <хост:порт соперника> [задержка] -> конфиг для game_mode_data["netplay"]
+    Без --netplay - None.
+    """
+    if "--netplay" not in argv:
+        return None
+    args = argv[argv.index("--netplay") + 1:]
+    return _make_config(*args[:4])
+
+
+def _make_config(player, local_port, remote, input_delay=DEFAULT_INPUT_DELAY):
+    host, port = str(remote).rsplit(":", 1)
+    return {
+        "player": int(player),
+        "local_port": int(local_port),
+        "remote_addr": (host, int(port)),
+        "input_delay": int(input_delay),
+    }
+
+
+def get_netplay_config(gm):
+    """Адрес сетевой игры: из --netplay, иначе из настройки "netplay" (game_settings.json)"""
+    config = getattr(gm, "netplay_config", None)
+    if config:
+        return dict(config)
+    settings = gm.settings.current_settings.get("netplay") or {}
+    return _make_config(settings.get("player", 1), settings.get("local_port", 7000),
+                        settings.get("remote", "127.0.0.1:7001"),
+                        settings.get("input_delay", DEFAULT_INPUT_DELAY))
+
+
+def create_transport(config):
+    return UdpTransport(config["local_port"], tuple(config["remote_addr"]), config.get("loss", 0.0))
+
+
+def create_session(battle, config):
+    """RollbackSession по конфигу parse_netplay_args (transport - уже открытый после NetplayHandshake)"""
+    transport = config.get("transport") or create_transport(config)
+    return RollbackSession(battle, config["player"] - 1, transport,
+                           config.get("input_delay", DEFAULT_INPUT_DELAY))
+
+
+def start_netplay(gm, config, setup):
+    """
+    Сцены боя vs_friend по сети (как CharacterSelectionScene._create_game_session).
+    setup - настройка боя из NetplayHandshake, одинаковая у обоих игроков.
+    """
+    from src.core.character import Character
+    from src.scenes.intro_scene import IntroSequenceScene
+    from src.scenes.battle_scene import BattleScene
+    from src.scenes.victory_scene import VictoryScene
+    from src.scenes.loading_scene import LoadingScene
+
+    p1, p2 = (Character(name, gm.resources, skin=skin) for name, skin in zip(setup["characters"], setup["skins"]))
+    p1_cameo, p2_cameo = (Character(name, gm.resources, skin=skin)
+                          for name, skin in zip(setup["cameos"], setup["cameo_skins"]))
+    game_mode_data = {
+        "id": "vs_friend",
+        "name": "VS_FRIEND",
+        "map": setup["map"],
+        "is_training": False,
+        "cameos": list(setup["cameos"]),
+        "skins": list(setup["skins"]),
+        "seed": setup["seed"],
+        "netplay": config,
+    }
+    gm.register_scene("intro", IntroSequenceScene(gm, p1, p1_cameo, p2, p2_cameo, game_mode_data))
+    gm.register_scene("battle", BattleScene(gm, p1, p2, game_mode_data))
+    gm.register_scene("victory", VictoryScene(gm, None, game_mode_data))
+    gm.register_scene("game_loading", LoadingScene(gm, "intro", skip_logo=True))
+    gm.set_scene("game_loading")
+    print(f"🌐 Сетевая игра: P{config['player']}, порт {config['local_port']} -> "
+          f"{config['remote_addr'][0]}:{config['remote_addr'][1]}, задержка {config['input_delay']}, "
+          f"{setup['characters'][0]} vs {setup['characters'][1]} на {setup['map']}")
+
+
+def run_headless(config, seed=0, timeout=60.0):
+    """
+    Бой бот против бота через сеть без окна (с NetplayHandshake, seed - от P1).
+    Возвращает (итог боя, статистика); итог у обоих процессов должен совпасть.
+    """
+    from src.core.character import Character
+    from src.managers.battle_manager import BattleManager, bot_controls
+
+    transport = create_transport(config)
+    pick = {"character": f"Player{config['player']}"}
+    if config["player"] == 1:
+        pick.update(map="soul_beach", seed=seed)
+    handshake = NetplayHandshake(transport, config["player"], pick)
+    started = time.perf_counter()
+    try:
+        while not handshake.poll():
+            if time.perf_counter() - started > timeout:
+                raise TimeoutError("соперник не отвечает")
+            time.sleep(0.001)
+    except BaseException:
+        transport.close()
+        raise
+
+    setup = handshake.setup
+    battle = BattleManager(Character(setup["characters"][0], None), Character(setup["characters"][1], None))
+    session = create_session(battle, dict(config, transport=transport))
+    rng = random.Random(setup["seed"] * 2 + session.local_index)
+    try:
+        while not session.is_result_confirmed():
+            if time.perf_counter() - started > timeout:
+                raise TimeoutError("соперник не отвечает")
+            if not session.advance(bot_controls(battle, session.local_index, rng)):
+                time.sleep(0.001)
+        # Досылаем последние кадры, пока соперник их не подтвердит
+        finished_at = time.perf_counter()
+        while not session.is_synced() and time.perf_counter() - finished_at < 2.0:
+            session.poll()
+            time.sleep(0.001)
+    finally:
+        session.close()
+    p1, p2 = battle.fighters
+    result = (battle.tick, battle.winner is p1, battle.winner is p2, tuple(battle.damage),
+              p1.hp, p2.hp, p1.x, p1.y, p2.x, p2.y)
+    return result, dict(session.stats, frames=session.frame, seconds=time.perf_counter() - started)
+
+
+if __name__ == "__main__":
+    import sys
+
+    args = sys.argv[1:]
+    config = parse_netplay_args(["--netplay"] + args[:4])
+    config["loss"] = float(args[4]) if len(args) > 4 else 0.0
+    result, stats = run_headless(config)
+    print(f"🏁 Кадров: {stats['frames']}, откатов: {stats['rollbacks']} ({stats['rollback_frames']} кадров), "
+          f"пересчет: {stats['resim_seconds'] * 1000:.1f} мс, ожиданий: {stats['stalls']}, {stats['seconds']:.2f} с")
+    print(f"🔑 Итог боя: {zlib.crc32(repr(result).encode()):08x} (тик {result[0]}, HP {result[4]}/{result[5]})")
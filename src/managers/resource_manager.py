@@ -6,6 +6,14 @@
 import pygame
 import sys
 import os
+from src.core.frame_cache import FrameCache
+from src.core.atlas import read_atlas_index, list_animation_frames
+from src.core.animations import AnimationClip
+from src.core.palette import read_palette_skin, recolor
+from src.core.sprite_trim import trim_frame, mirrored_offset, accelerate
+
+CARD_BASE_SIZE = 280  # Базовый размер карточки при scale_factor 1.0
+CLIP_FPS = 12  # Скорость анимаций бойцов
 
 def resource_path(relative_path):
     try:
@@ -13,13 +21,22 @@ def resource_path(relative_path):
     except Exception:
         base_path = os.path.abspath(".")
 
+    return os.path.join(base_path, relative_path)
+
 class ResourceManager:
     def __init__(self, base_sprite_dir="Sprites", base_sound_dir="Sounds"):
         self.base_sprite_dir = resource_path(base_sprite_dir)
         self.base_sound_dir = resource_path(base_sound_dir)
         self._images = {}
         self._sounds = {}
-        self._skins = {}  # { character: { skin_name: { anim_name: [frames] } } }
+        self._catalog = {}  # { character: { skin_name: { anim_name: [путь или (лист, rect)] } } } - без декодирования
+        self._skins = {}  # { character: { skin_name: { anim_name: [frames] } } } - только уже запрошенные анимации
+        self._palettes = {}  # { (character, skin_name): { цвет: цвет } } - скины-перекраски базового скина
+        self._clips = {}  # { (character, skin_name, anim_name): AnimationClip } - общие для всех бойцов
+        self._offsets = {}  # { (character, skin_name, anim_name): (смещения кадров, смещения отраженных) }
+        self._cards = {}  # { (card_id, size): Surface } - карточки, уже масштабированные под разрешение
+        self.cards_dir = os.path.join(self.base_sprite_dir, "cards")
+        self.frame_cache = FrameCache()  # Дисковый кэш кадров арт-видео
         pygame.mixer.init()
 
     def load_image(self, path):
@@ -45,6 +62,48 @@ class ResourceManager:
         pygame.draw.rect(surface, (0, 0, 0), (0, 0, width, height), 2)
         return surface
 
+    def get_card_path(self, card_id):
+        """Путь к файлу карточки (Sprites/cards/<card_id>.jpg) или None"""
+        for name in (card_id, card_id.lower()):
+            path = os.path.join(self.cards_dir, f"{name}.jpg")
+            if os.path.exists(path):
+                return path
+        return None
+
+    def get_card(self, card_id, size):
+        """
+        Карточка card_id (например "chara_default_normal"), масштабированная до size x size.
+        Декодирование и масштабирование выполняются один раз на разрешение,
+        результат общий для всех сцен. Возвращает None, если файла нет -
+        заглушку сцена рисует сама.
+        """
+        key = (card_id, size)
+        if key in self._cards:
+            return self._cards[key]
+
+        path = self.get_card_path(card_id)
+        if path is None:
+            return None
+        try:
+            card = pygame.transform.scale(self.load_image(path), (size, size))
+        except pygame.error as e:
+            print(f"Error scaling card {path}: {e}")
+            return None
+        self._cards[key] = card
+        return card
+
+    def get_card_size(self, scale_factor):
+        """Размер карточки в зависимости от масштаба интерфейса (меню, магазин)"""
+        if scale_factor > 1.5:
+            return int(CARD_BASE_SIZE * 1.3)
+        elif scale_factor > 1.2:
+            return int(CARD_BASE_SIZE * 1.15)
+        return CARD_BASE_SIZE
+
+    def clear_card_cache(self):
+        """Сбрасывает масштабированные карточки (после смены разрешения)"""
+        self._cards.clear()
+
     def load_sound(self, path):
         """Загрузка звука с кэшированием"""
         if path in self._sounds:
@@ -63,68 +122,181 @@ class ResourceManager:
 
     def load_character_skins(self, character_name):
         """
-        Загружает все скины для персонажа
-        Возвращает dict: { skin_name: { anim_name: [frames] } }
+        Каталог скинов персонажа: { skin_name: { anim_name: [кадры] } }, где кадр -
+        путь к файлу или (лист атласа, rect). Только сканирование папок, без декодирования:
+        картинки грузятся при первом запросе конкретной анимации (get_frames).
+        Скин с palette.json (src.core.palette) своих кадров не имеет - в каталоге
+        у него кадры базового скина, а цвета меняются при декодировании.
         """
-        if character_name in self._skins:
-            return self._skins[character_name]
-            
+        if character_name in self._catalog:
+            return self._catalog[character_name]
+
         char_dir = os.path.join(self.base_sprite_dir, character_name)
         if not os.path.isdir(char_dir):
             print(f"Warning: Character directory not found: {char_dir}")
-            self._skins[character_name] = {}
+            self._catalog[character_name] = {}
             return {}
 
         skins = {}
+        palette_skins = {}
         for skin_name in os.listdir(char_dir):
             skin_dir = os.path.join(char_dir, skin_name)
             if not os.path.isdir(skin_dir):
                 continue
-                
-            animations = self._load_animations_from_folder(skin_dir)
+            palette = read_palette_skin(skin_dir)
+            if palette:
+                palette_skins[skin_name] = palette
+                continue
+            # Если для скина собран атлас (python -m src.core.atlas), кадры - subsurface его листов
+            animations = read_atlas_index(skin_dir) or list_animation_frames(skin_dir)
+            animations = {name: frames for name, frames in animations.items() if frames}
             if animations:  # Только если есть анимации
                 skins[skin_name] = animations
 
-        self._skins[character_name] = skins
+        # Перекраски - после обычных скинов: базовый скин уже в каталоге
+        for skin_name, (base_skin, colors) in palette_skins.items():
+            if base_skin in skins:
+                skins[skin_name] = skins[base_skin]
+                self._palettes[(character_name, skin_name)] = colors
+            else:
+                print(f"Warning: Base skin '{base_skin}' not found for {character_name}/{skin_name}")
+
+        self._catalog[character_name] = skins
         return skins
 
-    def _load_animations_from_folder(self, folder_path):
-        """Загрузка анимаций из папки"""
-        animations = {}
-        
-        for anim_name in os.listdir(folder_path):
-            anim_dir = os.path.join(folder_path, anim_name)
-            if not os.path.isdir(anim_dir):
+    def get_default_skin(self, character_name):
+        """Скин, который берет Character - первый найденный (или None)"""
+        return next(iter(self.load_character_skins(character_name)), None)
+
+    def resolve_skin(self, character_name, skin_name=None):
+        """skin_name, если он есть в каталоге, иначе get_default_skin"""
+        if skin_name in self.load_character_skins(character_name):
+            return skin_name
+        return self.get_default_skin(character_name)
+
+    def get_frames(self, character_name, skin_name, anim_name):
+        """
+        Кадры одной анимации скина - декодируются при первом запросе и обрезаются
+        до непрозрачной области (sprite_trim); смещения кадров - get_frame_offsets.
+        """
+        decoded = self._skins.setdefault(character_name, {}).setdefault(skin_name, {})
+        frames = decoded.get(anim_name)
+        if frames is None:
+            entries = self.load_character_skins(character_name).get(skin_name, {}).get(anim_name, [])
+            colors = self._palettes.get((character_name, skin_name))
+            sources = {}
+            frames, offsets, mirrored_offsets = [], [], []
+            for entry in entries:
+                if colors is None:
+                    image = self._decode_frame(entry)
+                    if not isinstance(entry, tuple):
+                        self._images.pop(entry, None)  # полный холст больше не нужен - держим обрезанный кадр
+                else:
+                    image = self._decode_recolored(entry, colors, sources)
+                frame, offset = trim_frame(image)
+                frames.append(frame)
+                offsets.append(offset)
+                mirrored_offsets.append(mirrored_offset(offset, frame, image.get_width()))
+            decoded[anim_name] = frames
+            self._offsets[(character_name, skin_name, anim_name)] = (offsets, mirrored_offsets)
+        return frames
+
+    def get_frame_offsets(self, character_name, skin_name, anim_name):
+        """(смещения кадров, смещения отраженных кадров) внутри исходного холста - для рисования вручную"""
+        self.get_frames(character_name, skin_name, anim_name)
+        return self._offsets[(character_name, skin_name, anim_name)]
+
+    def _decode_frame(self, entry):
+        if isinstance(entry, tuple):
+            sheet, rect = entry
+            return self.load_image(sheet).subsurface(rect)
+        return self.load_image(entry)
+
+    def _decode_recolored(self, entry, colors, sources):
+        """
+        Кадр скина-перекраски. Файл базы читается без convert_alpha, чтобы у 8-битного
+        PNG осталась палитра (перекраска - set_palette); в кэш _images не попадает.
+        Готовый кадр переводится в формат экрана, как и обычные кадры: иначе каждый
+        blit конвертирует пиксели заново. 8-битный кадр с colorkey - через convert()
+        (colorkey сохраняется, sprite_trim.accelerate включает для него RLE),
+        полноцветный - через convert_alpha(). В памяти перекраска - полная копия,
+        как отдельный скин; экономия на диске и на подготовке кадров.
+        sources - уже прочитанные файлы (листы атласа) в пределах одной анимации.
+        """
+        path, rect = entry if isinstance(entry, tuple) else (entry, None)
+        source = sources.get(path)
+        if source is None:
+            if not os.path.exists(path):
+                print(f"Warning: Image not found: {path}")
+                return self._create_placeholder_surface(64, 64)
+            source = sources[path] = pygame.image.load(path)
+        if rect:
+            source = source.subsurface(rect)
+        frame = recolor(source, colors)
+        if frame.get_colorkey() is not None:
+            return frame.convert()
+        return frame.convert_alpha()
+
+    def list_character_images(self, character_name, skin_name=None, animations=None):
+        """
+        Пути картинок, которые понадобятся get_frames для скина skin_name
+        (нет в каталоге - get_default_skin) и анимаций animations (None - все): листы атласа
+        или отдельные кадры. Используется AssetLoader, чтобы декодировать их
+        заранее в фоновых потоках. Скины-перекраски читают базу сами - для них пусто.
+        """
+        skin_name = self.resolve_skin(character_name, skin_name)
+        if (character_name, skin_name) in self._palettes:
+            return []
+        catalog = self.load_character_skins(character_name).get(skin_name, {})
+        paths = []
+        for anim_name, entries in catalog.items():
+            if animations is not None and anim_name not in animations:
                 continue
-                
-            frames = []
-            # Сортируем файлы для правильной последовательности кадров
-            frame_files = sorted([f for f in os.listdir(anim_dir) 
-                                if f.lower().endswith(('.png', '.jpg', '.jpeg'))])
-            
-            for fname in frame_files:
-                fpath = os.path.join(anim_dir, fname)
-                frame = self.load_image(fpath)
-                if frame:
-                    frames.append(frame)
-            
-            if frames:
-                animations[anim_name] = frames
-
-        return animations
+            for entry in entries:
+                path = entry[0] if isinstance(entry, tuple) else entry
+                if path not in paths:
+                    paths.append(path)
+        return paths
 
     def get_skin_animations(self, character_name, skin_name):
-        """Получить анимации для конкретного скина"""
-        return self._skins.get(character_name, {}).get(skin_name, {})
+        """Все анимации скина (декодирует каждую - для бойцов хватает get_clip по одной)"""
+        catalog = self.load_character_skins(character_name).get(skin_name, {})
+        return {anim_name: self.get_frames(character_name, skin_name, anim_name) for anim_name in catalog}
+
+    def get_clip(self, character_name, skin_name, anim_name):
+        """
+        AnimationClip анимации скина (или None, если кадров нет). Создается один раз
+        вместе с отраженными кадрами (сборка бойца на загрузке) и общий для всех
+        Character с этим скином - зеркальный бой и повторные бои не копируют кадры,
+        а в бою Animation.draw только выбирает набор, без transform.flip на каждый кадр.
+        Кадры обрезаны - клип хранит их смещения, Animation.draw прибавляет их сам.
+        """
+        key = (character_name, skin_name, anim_name)
+        clip = self._clips.get(key)
+        if clip is None:
+            frames = self.get_frames(character_name, skin_name, anim_name)
+            if not frames:
+                return None
+            offsets, mirrored_offsets = self._offsets[key]
+            clip = self._clips[key] = AnimationClip(frames, CLIP_FPS, loop=True,
+                                                    offsets=offsets, mirrored_offsets=mirrored_offsets)
+            # RLE - после отражения: flip читает пиксели и дает Surface без RLEACCEL
+            accelerate(frames)
+            accelerate(clip.mirror())
+        return clip
 
     def get_animation_frame(self, character_name, skin_name, anim_name, frame_index):
-        """Получить конкретный кадр анимации"""
-        anims = self.get_skin_animations(character_name, skin_name)
-        frames = anims.get(anim_name, [])
+        """Получить конкретный кадр анимации (обрезанный, смещение - get_frame_offsets)"""
+        frames = self.get_frames(character_name, skin_name, anim_name)
         if frames and 0 <= frame_index < len(frames):
             return frames[frame_index]
         return None
     
-    def preload_character(self, character_name):
-        """Предзагрузка всех ресурсов персонажа"""
-        return self.load_character_skins(character_name)
\ No newline at end of file
+    def preload_character(self, character_name, animations=None):
+        """Предзагрузка анимаций animations (None - все) скина по умолчанию"""
+        skin_name = self.get_default_skin(character_name)
+        catalog = self.load_character_skins(character_name).get(skin_name, {})
+        for anim_name in catalog:
+            if animations is None or anim_name in animations:
+                self.get_frames(character_name, skin_name, anim_name)
+        return catalog
\ No newline at end of file
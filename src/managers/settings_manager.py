@@ -3,6 +3,7 @@ import json
 import os
 import pygame
 import sys
+from src.core.fonts import clear_text_cache
 
 def resource_path(relative_path):
     """Получает правильный путь к ресурсам для работы как из .py, так и из .exe"""
@@ -23,7 +24,13 @@ class SettingsManager:
             "sound_volume": 0.7,
             "fullscreen": False,
             "resolution": [1280, 720],
-            "language": "Русский"
+            "language": "Русский",
+            # Частичная перерисовка экрана в меню (для слабых машин/киосков)
+            "dirty_rects": False,
+            # Запись реплея каждого боя (.vwr в папке данных пользователя)
+            "save_replays": True,
+            # Режим "ПО СЕТИ": номер игрока, свой UDP-порт, адрес соперника, задержка ввода в кадрах
+            "netplay": {"player": 1, "local_port": 7000, "remote": "127.0.0.1:7001", "input_delay": 2}
         }
         self.current_settings = self.default_settings.copy()
         self.scale_factor = 1.0
@@ -74,6 +81,7 @@ class SettingsManager:
         """Установка языка с сохранением в настройках"""
         success = self.language_manager.set_language(language_name)
         if success:
+            clear_text_cache()
             self.current_settings["language"] = language_name
             self.save_settings()
             print(f"✅ Язык установлен и сохранен: {language_name}")
@@ -85,6 +93,7 @@ class SettingsManager:
     
     def update_scale_factor(self, current_width):
         self.scale_factor = current_width / self.base_resolution[0]
+        clear_text_cache()  # Текст отрисован под старый масштаб
         return self.scale_factor
     
     def scale_value(self, value):
@@ -1,16 +1,51 @@
 # src/scenes/battle_scene.py
 import pygame
+import random
 from src.managers.game_manager import BaseScene
+from src.managers.battle_manager import BattleManager, bot_controls, ROUND_TICKS
+from src.core import ui
+from src.core.map_backgrounds import get_map_background, get_map_name
+from src.core.fixed_step import TICK_RATE
+from src.core.replay import ReplayRecorder, save_replay
+
+# Сколько тиков показываем победу перед VictoryScene
+VICTORY_DELAY_TICKS = 3 * TICK_RATE
 
 class BattleScene(BaseScene):
-    def __init__(self, gm, fighter_left, fighter_right, game_mode_data=None):
+    def __init__(self, gm, fighter_left, fighter_right, game_mode_data=None, battle=None):
         super().__init__(gm)
         self.f_l = fighter_left
         self.f_r = fighter_right
         self.game_mode_data = game_mode_data or {}
+        self.background = None  # MapBackground под текущее разрешение
         self.ended = False
         self.winner = None
-        self.timer = 0
+        self.end_ticks = 0     # тиков после конца боя
+        # Вся логика боя - в BattleManager (его же гоняет headless_runner);
+        # готовый бой передает ReplayViewerScene (со своей длиной раунда)
+        self.battle = battle if battle is not None else BattleManager(self.f_l, self.f_r)
+        seed = self.game_mode_data.get('seed')
+        self.seed = seed if seed is not None else random.randrange(2 ** 31)
+        self.bot_rng = random.Random(self.seed)
+        
+        # Тренировка: снапшоты боя вместо пересоздания сцен и LoadingScene
+        self.is_training = self.game_mode_data.get('is_training', False)
+        self.start_snapshot = self.battle.snapshot()  # R - сброс к началу
+        self.saved_snapshot = None                    # F5 - сохранить позицию, F9 - загрузить
+        
+        # Сетевая игра (vs_friend по сети): ввод соперника приходит через RollbackSession
+        self.netplay = None
+        if self.game_mode_data.get('netplay'):
+            from src.managers.netplay import create_session
+            self.netplay = create_session(self.battle, self.game_mode_data['netplay'])
+        
+        # Реплей: ввод обоих игроков по тикам (в тренировке не пишем - там откаты позиции,
+        # при просмотре реплея - record_replay: False)
+        self.recorder = None
+        if not self.is_training and self.game_mode_data.get('record_replay', True):
+            self.recorder = ReplayRecorder(self._get_replay_metadata())
+            if self.netplay:
+                self.netplay.recorder = self.recorder  # пишет только подтвержденные кадры
         
         print(f"🎮 BattleScene создана")
         print(f"  Режим: {self.game_mode_data.get('id', 'unknown')}")
@@ -18,81 +53,181 @@ class BattleScene(BaseScene):
         print(f"  Игрок 1: {self.f_l}")
         print(f"  Игрок 2: {self.f_r}")
     
-    def update(self, dt):
+    @property
+    def tick(self):
+        """Номер тика симуляции"""
+        return self.battle.tick
+    
+    def handle_events(self, events):
+        if self.gm.input:
+            self.gm.input.update(events)
+        
+        if self.is_training:
+            for event in events:
+                if event.type != pygame.KEYDOWN:
+                    continue
+                if event.key == pygame.K_r:
+                    self.load_snapshot(self.start_snapshot)
+                elif event.key == pygame.K_F5:
+                    self.saved_snapshot = self.battle.snapshot()
+                    print(f"💾 Позиция сохранена (тик {self.tick})")
+                elif event.key == pygame.K_F9 and self.saved_snapshot:
+                    self.load_snapshot(self.saved_snapshot)
+    
+    def _get_replay_metadata(self):
+        return {
+            "characters": [self.f_l.name, self.f_r.name],
+            "cameos": self.game_mode_data.get('cameos', [None, None]),
+            "skins": self.game_mode_data.get('skins', ["default", "default"]),
+            "map": self.game_mode_data.get('map', 'random'),
+            "mode": self.game_mode_data.get('id', 'unknown'),
+            "seed": self.seed,
+            "round_ticks": ROUND_TICKS,
+            "tick_rate": TICK_RATE,
+        }
+    
+    def load_snapshot(self, snapshot):
+        """Мгновенно возвращает бой к снапшоту (BattleManager.snapshot) - сценарии тренировки"""
+        self.battle.restore(snapshot)
+        self.ended = self.battle.finished
+        self.winner = self.battle.winner
+        self.end_ticks = 0
+        self.gm.sim_clock.reset()
+    
+    def _get_inputs(self):
+        """Ввод обоих игроков на этот тик (маски ACTION_BITS)"""
+        input_p1 = self.gm.input.consume_action_mask() if self.gm.input else 0
+        input_p2 = 0
+        if self.game_mode_data.get('id') == 'vs_bot' and not self.is_training:
+            input_p2 = bot_controls(self.battle, 1, self.bot_rng)
+        return input_p1, input_p2
+    
+    def fixed_update(self, dt):
+        """Один тик симуляции боя (dt всегда fixed_step.TICK_DT)"""
+        if self.netplay:
+            # Свой ввод - в сессию; она сама шагает бой и откатывает его при ошибке предсказания
+            self.netplay.advance(self.gm.input.consume_action_mask() if self.gm.input else 0)
+            finished = self.netplay.is_result_confirmed()
+        else:
+            inputs = self._get_inputs()
+            if self.recorder and not self.battle.finished:
+                keyframe = self.battle.snapshot() if self.recorder.needs_keyframe else None
+                self.recorder.record(*inputs, keyframe)
+            self.battle.step(*inputs, dt)
+            finished = self.battle.finished
+        
         if not self.ended:
-            self.f_l.update(dt)
-            self.f_r.update(dt)
-            if self.f_l.hp <= 0:
+            if finished:
                 self.ended = True
-                self.winner = self.f_r
+                self.winner = self.battle.winner
                 self.end_battle()
-            elif self.f_r.hp <= 0:
-                self.ended = True
-                self.winner = self.f_l
-                self.end_battle()
-        else:
-            self.timer += dt
-            if self.timer > 3:
+        elif not self.is_training:  # в тренировке бой не закрывается - R/F9 возвращают позицию
+            self.end_ticks += 1
+            if self.end_ticks > VICTORY_DELAY_TICKS:
                 # ✅ Используем новую систему сцен
                 victory_scene = self.gm.get_scene("victory")
                 if victory_scene:
                     victory_scene.winner = self.winner
                 self.gm.set_scene("victory")
     
+    def update(self, dt):
+        # Вся логика боя - в fixed_update
+        pass
+    
+    def on_exit(self):
+        if self.netplay:
+            self.netplay.close()
+            self.netplay = None
+    
     def end_battle(self):
         if self.winner:
             self.winner.play_animation("victory")
-        self.timer = 0
+        self.end_ticks = 0
+        self._save_replay()
+    
+    def _save_replay(self):
+        """Записывает реплей законченного боя (save_replay; настройка save_replays)"""
+        if not self.recorder or not self.gm.settings.current_settings.get('save_replays', True):
+            return
+        battle = self.battle
+        result = {
+            "winner": battle.fighters.index(battle.winner) if battle.winner else None,
+            "ticks": battle.tick,
+            "hp": [fighter.hp for fighter in battle.fighters],
+            "damage": list(battle.damage),
+        }
+        try:
+            path = save_replay(self.recorder.finish(battle.tick, result))
+            print(f"📼 Реплей сохранен: {path}")
+        except OSError as e:
+            print(f"⚠️ Не удалось сохранить реплей: {e}")
+        self.recorder = None
     
     def draw(self, screen):
-        # Рисуем фон в зависимости от карты
+        # Фон карты вместе с подписями - один заранее собранный слой
         self._draw_background(screen)
         
-        self.f_l.draw(screen)
-        self.f_r.draw(screen)
+        self.f_l.draw(screen, self.interpolation_alpha)
+        self.f_r.draw(screen, self.interpolation_alpha)
         
-        # Отображаем информацию о режиме
-        self._draw_mode_info(screen)
+        self._draw_hud(screen)
+    
+    def _draw_hud(self, screen):
+        """Полоски HP и таймер раунда"""
+        bar_width, bar_height = self.s(400), self.s(24)
+        bar_y = self.s(60)
+        max_hp = self.battle.initial_hp
+        ui.draw_health_bar(screen, self.s(20), bar_y, bar_width, bar_height, max(0, self.f_l.hp), max_hp)
+        ui.draw_health_bar(screen, screen.get_width() - self.s(20) - bar_width, bar_y, bar_width, bar_height,
+                           max(0, self.f_r.hp), max_hp)
+        
+        timer_text = self.get_font(36, bold=True).render(f"{int(self.battle.time_left + 0.999)}", True, (255, 255, 255))
+        screen.blit(timer_text, (screen.get_width() // 2 - timer_text.get_width() // 2, bar_y - self.s(8)))
+        
+        if self.netplay:
+            self._draw_netplay_stats(screen, bar_y + bar_height + self.s(10))
+    
+    def _draw_netplay_stats(self, screen, y):
+        """Статистика отката: кадры пересчета и время пересчета за последнюю секунду"""
+        stats = self.netplay.per_second
+        if self.netplay.waiting:
+            text = "Ожидание соперника..."
+        else:
+            text = (f"Задержка {self.netplay.input_delay} | откат {stats['rollback_frames']} кадр/с | "
+                    f"пересчет {stats['resim_ms']:.1f} мс/с")
+        label = self.get_font(18).render(text, True, (200, 200, 200))
+        screen.blit(label, (screen.get_width() // 2 - label.get_width() // 2, y))
     
     def _draw_background(self, screen):
         """Отрисовывает фон в зависимости от карты"""
+        if self.background is None or self.background.size != screen.get_size():
+            map_id = self.game_mode_data.get('map', 'random')
+            self.background = get_map_background(map_id, screen.get_size(), self.gm.resources, self._get_labels())
+        self.background.draw(screen, self._get_camera_x(screen))
+    
+    def _get_camera_x(self, screen):
+        """Смещение камеры для параллакса - середина между бойцами"""
+        center = (self.f_l.rect.centerx + self.f_r.rect.centerx) / 2
+        return center - screen.get_width() / 2
+    
+    def _get_labels(self):
+        """Подписи поверх фона: карта слева, режим справа"""
         map_id = self.game_mode_data.get('map', 'random')
-        
-        # Цвета фона для разных карт
-        map_colors = {
-            'soul_beach': (135, 206, 235),  # Небесно-голубой для пляжа
-            'hall_of_judgement': (70, 70, 90),  # Темно-серый для зала
-            'deep_caves': (30, 30, 40),  # Очень темный для пещер
-            'everlost': (100, 50, 150),  # Фиолетовый для забытого измерения
-        }
-        
-        color = map_colors.get(map_id, (0, 0, 30))  # По умолчанию темно-синий
-        screen.fill(color)
-        
-        # Отображаем название карты
-        font = self.get_font(24)
-        map_name = self._get_map_name(map_id)
-        text = font.render(f"Карта: {map_name}", True, (255, 255, 255))
-        screen.blit(text, (self.s(20), self.s(20)))
+        white = (255, 255, 255)
+        return [
+            (f"Карта: {get_map_name(map_id)}", self.f(24), white, (self.s(20), self.s(20)), False),
+            (f"Режим: {self._get_mode_name()}", self.f(18), white, (-self.s(20), self.s(20)), False),
+        ]
     
     def _get_map_name(self, map_id):
         """Возвращает название карты"""
-        map_names = {
-            'soul_beach': 'Soul Beach',
-            'hall_of_judgement': 'Hall of Judgement',
-            'deep_caves': 'Deep Caves',
-            'everlost': 'Everlost',
-            'random': 'Random'
-        }
-        return map_names.get(map_id, map_id)
+        return get_map_name(map_id)
     
-    def _draw_mode_info(self, screen):
-        """Отображает информацию о режиме игры"""
+    def _get_mode_name(self):
+        """Название режима игры"""
         mode_id = self.game_mode_data.get('id', 'unknown')
         is_training = self.game_mode_data.get('is_training', False)
         
-        font = self.get_font(18)
-        
         # Название режима
         mode_names = {
             'vs_bot': 'VS BOT',
@@ -103,6 +238,4 @@ class BattleScene(BaseScene):
         mode_name = mode_names.get(mode_id, mode_id)
         if is_training:
             mode_name += " (Тренировка)"
-        
-        text = font.render(f"Режим: {mode_name}", True, (255, 255, 255))
-        screen.blit(text, (screen.get_width() - text.get_width() - self.s(20), self.s(20)))
\ No newline at end of file
+        return mode_name
@@ -3,6 +3,7 @@ import pygame
 import os
 import sys
 from src.managers.game_manager import BaseScene
+from src.core.fonts import get_font
 from src.managers.save_manager import SaveManager
 import random
 
@@ -15,10 +16,34 @@ def resource_path(relative_path):
     
     return os.path.join(base_path, relative_path)
 
+# Ростер (его же использует balance_sweep)
+CHARACTERS = [
+    {"name": "1x1x1x1", "display_name": "1x1x1x1", "map": "soul_beach"},
+    {"name": "chara", "display_name": "Chara", "map": "hall_of_judgement"},
+    {"name": "steve", "display_name": "Steve", "map": "deep_caves"},
+    {"name": "nameless", "display_name": "Nameless", "map": "everlost"}
+]
+
+CAMEOS = [
+    {"name": "c00lk1d", "display_name": "Cool Kid", "map": "soul_beach"},
+    {"name": "papyrus", "display_name": "Papyrus", "map": "hall_of_judgement"}
+]
+
+
+def pick_bot_selection(p1_character, p1_cameo, rng=random, characters=CHARACTERS, cameos=CAMEOS):
+    """
+    Выбор бота для VS BOT: случайный персонаж и камео, отличные от выбора P1
+    (если выбирать не из чего - любой). Возвращает (персонаж, камео) - имена.
+    """
+    available_chars = [c for c in characters if c["name"] != p1_character] or characters
+    available_cameos = [c for c in cameos if c["name"] != p1_cameo] or cameos
+    return rng.choice(available_chars)["name"], rng.choice(available_cameos)["name"]
+
+
 class CharacterSelectionScene(BaseScene):
     def __init__(self, gm, game_mode, is_training=False):
         super().__init__(gm)
-        self.game_mode = game_mode  # "vs_bot", "vs_friend", "training"
+        self.game_mode = game_mode  # "vs_bot", "vs_friend", "vs_friend_online", "training"
         self.is_training = is_training
         
         # Цветовая схема
@@ -39,19 +64,9 @@ class CharacterSelectionScene(BaseScene):
         self.selection_phase = 0  # 0 - выбор персонажей, 1 - выбор камео, 2 - выбор карты
         self.current_player = 0  # 0 - P1, 1 - P2 (для режима vs_friend)
         
-        # Персонажи
-        self.characters = [
-            {"name": "1x1x1x1", "display_name": "1x1x1x1", "map": "soul_beach"},
-            {"name": "chara", "display_name": "Chara", "map": "hall_of_judgement"},
-            {"name": "steve", "display_name": "Steve", "map": "deep_caves"},
-            {"name": "nameless", "display_name": "Nameless", "map": "everlost"}
-        ]
-        
-        # Камео
-        self.cameos = [
-            {"name": "c00lk1d", "display_name": "Cool Kid", "map": "soul_beach"},
-            {"name": "papyrus", "display_name": "Papyrus", "map": "hall_of_judgement"}
-        ]
+        # Персонажи и камео
+        self.characters = CHARACTERS
+        self.cameos = CAMEOS
         
         # Карты (инициализируем без переводов, обновим в on_enter)
         self.maps = [
@@ -120,34 +135,22 @@ class CharacterSelectionScene(BaseScene):
             print(f"⏩ Пропускаем выбор для {self.game_mode}, сразу к карте")
     
     def _load_cards(self):
-        """Загружает карточки персонажей и камео"""
+        """Загружает карточки персонажей и камео из общего кэша ResourceManager"""
         card_size = self._get_card_size()
         
         # Загружаем карточки персонажей
         for char in self.characters:
-            try:
-                card_path = resource_path(os.path.join("Sprites", "cards", f"{char['name']}_default_normal.jpg"))
-                if os.path.exists(card_path):
-                    card = pygame.image.load(card_path).convert_alpha()
-                    card = pygame.transform.scale(card, (card_size, card_size))
-                    self.character_cards[char["name"]] = card
-                else:
-                    self.character_cards[char["name"]] = self._create_placeholder_card(char["display_name"], card_size, False)
-            except:
-                self.character_cards[char["name"]] = self._create_placeholder_card(char["display_name"], card_size, False)
+            card = self.gm.resources.get_card(f"{char['name']}_default_normal", card_size)
+            if card is None:
+                card = self._create_placeholder_card(char["display_name"], card_size, False)
+            self.character_cards[char["name"]] = card
         
         # Загружаем карточки камео
         for cameo in self.cameos:
-            try:
-                card_path = resource_path(os.path.join("Sprites", "cards", f"{cameo['name']}_default_normal.jpg"))
-                if os.path.exists(card_path):
-                    card = pygame.image.load(card_path).convert_alpha()
-                    card = pygame.transform.scale(card, (card_size, card_size))
-                    self.cameo_cards[cameo["name"]] = card
-                else:
-                    self.cameo_cards[cameo["name"]] = self._create_placeholder_card(cameo["display_name"], card_size, False)
-            except:
-                self.cameo_cards[cameo["name"]] = self._create_placeholder_card(cameo["display_name"], card_size, False)
+            card = self.gm.resources.get_card(f"{cameo['name']}_default_normal", card_size)
+            if card is None:
+                card = self._create_placeholder_card(cameo["display_name"], card_size, False)
+            self.cameo_cards[cameo["name"]] = card
     
     def _get_card_size(self):
         """Определяет размер карточки"""
@@ -163,7 +166,7 @@ class CharacterSelectionScene(BaseScene):
             card.fill((80, 80, 150, 255))
         
         # Добавляем текст
-        font = pygame.font.SysFont("arial", max(20, size // 10))
+        font = get_font(max(20, size // 10))
         text = font.render(name, True, (255, 255, 255))
         card.blit(text, (size//2 - text.get_width()//2, size//2 - text.get_height()//2))
         
@@ -246,27 +249,13 @@ class CharacterSelectionScene(BaseScene):
         if not self.selections["p1"]["cameo"]:
             self.selections["p1"]["cameo"] = "c00lk1d"
         
-        # Случайный персонаж для бота (исключая выбранного P1)
-        available_chars = [c for c in self.characters if c["name"] != self.selections["p1"]["character"]]
-        if available_chars:
-            bot_char = random.choice(available_chars)
-            self.selections["p2"]["character"] = bot_char["name"]
-            print(f"🤖 Бот выбрал персонажа: {bot_char['name']}")
-        else:
-            # Если только один персонаж, берем его
-            bot_char = random.choice(self.characters)
-            self.selections["p2"]["character"] = bot_char["name"]
-        
-        # Случайное камео для бота (исключая выбранное P1)
-        available_cameos = [c for c in self.cameos if c["name"] != self.selections["p1"]["cameo"]]
-        if available_cameos:
-            bot_cameo = random.choice(available_cameos)
-            self.selections["p2"]["cameo"] = bot_cameo["name"]
-            print(f"🤖 Бот выбрал камео: {bot_cameo['name']}")
-        else:
-            # Если только одно камео, берем его
-            bot_cameo = random.choice(self.cameos)
-            self.selections["p2"]["cameo"] = bot_cameo["name"]
+        # Случайные персонаж и камео для бота (исключая выбранные P1)
+        bot_char, bot_cameo = pick_bot_selection(
+            self.selections["p1"]["character"], self.selections["p1"]["cameo"],
+            random, self.characters, self.cameos
+        )
+        self.selections["p2"]["character"] = bot_char
+        self.selections["p2"]["cameo"] = bot_cameo
         
         print(f"🤖 Бот выбрал: {self.selections['p2']['character']} + {self.selections['p2']['cameo']}")
     
@@ -439,8 +428,11 @@ class CharacterSelectionScene(BaseScene):
             # Переходим к выбору карты
             self.selection_phase = 2
             
+            # По сети карту выбирает P1 - второй игрок сразу ждет соперника
+            if self.game_mode == "vs_friend_online" and self._get_netplay_config()["player"] != 1:
+                self._start_netplay(None)
             # Для тренировки автоматически выбираем карту по персонажам
-            if self.is_training:
+            elif self.is_training:
                 selected_map = self._calculate_map_by_characters()
                 print(f"🏞️ Автоматически выбрана карта для тренировки: {selected_map}")
                 self._confirm_map_selection()
@@ -473,8 +465,47 @@ class CharacterSelectionScene(BaseScene):
         if hasattr(self.gm, 'save_manager') and self.gm.save_manager:
             self.gm.save_manager.set_map(selected_map_id)
         
-        # Переходим к созданию игровой сессии
-        self._create_game_session(selected_map_id)
+        # Переходим к созданию игровой сессии (по сети - сначала ждем соперника)
+        if self.game_mode == "vs_friend_online":
+            self._start_netplay(selected_map_id)
+        else:
+            self._create_game_session(selected_map_id)
+    
+    def _get_player_skin(self):
+        """Скин персонажа P1 из сохранения"""
+        if hasattr(self.gm, 'save_manager') and self.gm.save_manager:
+            return self.gm.save_manager.get_character_skin()
+        return "default"
+    
+    def _get_cameo_skin(self):
+        """Скин камео P1 из сохранения"""
+        if hasattr(self.gm, 'save_manager') and self.gm.save_manager:
+            return self.gm.save_manager.get_cameo_skin()
+        return "default"
+    
+    def _get_netplay_config(self):
+        from src.managers.netplay import get_netplay_config
+        return get_netplay_config(self.gm)
+    
+    def _start_netplay(self, map_id):
+        """
+        Сетевой бой: свой выбор уходит в NetplayLobbyScene, соперника там и ждем.
+        Бойцы и карта у обоих берутся из обмена выборами, а не из этой сцены.
+        """
+        from src.scenes.netplay_lobby_scene import NetplayLobbyScene
+        
+        config = self._get_netplay_config()
+        pick = {
+            "character": self.selections['p1']['character'],
+            "cameo": self.selections['p1']['cameo'],
+            "skin": self._get_player_skin(),
+            "cameo_skin": self._get_cameo_skin(),
+        }
+        if config["player"] == 1:
+            pick["map"] = map_id
+            pick["seed"] = random.randrange(2 ** 31)
+        self.gm.register_scene("netplay_lobby", NetplayLobbyScene(self.gm, config, pick))
+        self.gm.set_scene("netplay_lobby")
     
     def _create_game_session(self, map_id):
         """Создает игровую сессию с выбранными параметрами"""
@@ -490,9 +521,9 @@ class CharacterSelectionScene(BaseScene):
         from src.scenes.battle_scene import BattleScene
         from src.scenes.victory_scene import VictoryScene
         
-        # Игрок 1
-        player_char = Character(self.selections['p1']['character'], self.gm.resources)
-        player_cameo = Character(self.selections['p1']['cameo'], self.gm.resources)
+        # Игрок 1 - в выбранных скинах
+        player_char = Character(self.selections['p1']['character'], self.gm.resources, skin=self._get_player_skin())
+        player_cameo = Character(self.selections['p1']['cameo'], self.gm.resources, skin=self._get_cameo_skin())
         
         # Игрок 2 (бот или второй игрок)
         enemy_char = Character(self.selections['p2']['character'], self.gm.resources)
@@ -503,7 +534,9 @@ class CharacterSelectionScene(BaseScene):
             "id": self.game_mode,
             "name": self.game_mode.upper(),
             "map": map_id,
-            "is_training": self.is_training
+            "is_training": self.is_training,
+            "cameos": [self.selections['p1']['cameo'], self.selections['p2']['cameo']],
+            "skins": [player_char.skin, "default"]
         }
         
         # Создаем сцены с передачей параметров
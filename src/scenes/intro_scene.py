@@ -1,6 +1,8 @@
 # src/scenes/intro_scene.py
 import pygame
 from src.managers.game_manager import BaseScene
+from src.core.character import PREFETCH_ANIMATIONS
+from src.core.map_backgrounds import get_map_background, get_map_name
 
 class IntroSequenceScene(BaseScene):
     def __init__(self, gm, fighter_left, cameo_left, fighter_right, cameo_right, game_mode_data=None):
@@ -10,6 +12,7 @@ class IntroSequenceScene(BaseScene):
         self.f_r = fighter_right
         self.c_r = cameo_right
         self.game_mode_data = game_mode_data or {}
+        self.background = None  # MapBackground под текущее разрешение
         self.order = [self.f_l, self.c_l, self.f_r, self.c_r]
         self.index = 0
         self.timer = 0
@@ -21,6 +24,28 @@ class IntroSequenceScene(BaseScene):
         print(f"  P1: {self.f_l} + {self.c_l}")
         print(f"  P2: {self.f_r} + {self.c_r}")
     
+    def queue_preload(self, loader):
+        """Ставит в AssetLoader кадры всех участников боя (вызывается из LoadingScene)"""
+        from src.managers.asset_loader import STAGE_CHARACTERS, STAGE_SCENES
+
+        fighters = []
+        for obj in self.order:
+            fighter = (getattr(obj, "name", None), getattr(obj, "skin", None))
+            if fighter[0] and fighter not in fighters:
+                fighters.append(fighter)
+        for name, skin in fighters:
+            # Только скин бойца и анимации боя - остальное декодируется по первому запросу
+            for path in self.gm.resources.list_character_images(name, skin, PREFETCH_ANIMATIONS):
+                loader.add_image(path, STAGE_CHARACTERS)
+
+        loader.add_task("fighters", STAGE_SCENES, finalize=lambda _: self._prepare_fighters())
+
+    def _prepare_fighters(self):
+        """Собирает анимации бойцов из уже загруженных кадров"""
+        for obj in self.order:
+            if hasattr(obj, "reload_animations"):
+                obj.reload_animations()
+
     def on_enter(self):
         self.order[0].play_animation("intro")
 
@@ -47,24 +72,14 @@ class IntroSequenceScene(BaseScene):
         self._draw_fight_info(screen)
     
     def _draw_background(self, screen):
-        """Отрисовывает фон в зависимости от карты"""
-        map_id = self.game_mode_data.get('map', 'random')
-        
-        # Цвета фона для разных карт
-        map_colors = {
-            'soul_beach': (135, 206, 235),  # Небесно-голубой для пляжа
-            'hall_of_judgement': (70, 70, 90),  # Темно-серый для зала
-            'deep_caves': (30, 30, 40),  # Очень темный для пещер
-            'everlost': (100, 50, 150),  # Фиолетовый для забытого измерения
-        }
-        
-        color = map_colors.get(map_id, (0, 0, 30))  # По умолчанию темно-синий
-        screen.fill(color)
+        """Отрисовывает фон карты вместе с названиями режима и карты (один слой)"""
+        if self.background is None or self.background.size != screen.get_size():
+            map_id = self.game_mode_data.get('map', 'random')
+            self.background = get_map_background(map_id, screen.get_size(), self.gm.resources, self._get_labels())
+        self.background.draw(screen)
     
-    def _draw_fight_info(self, screen):
-        """Отображает информацию о предстоящем бое"""
-        font = self.get_font(32, bold=True)
-        
+    def _get_labels(self):
+        """Название режима и карты не меняются - они запекаются в фон"""
         # Название режима
         mode_id = self.game_mode_data.get('id', 'unknown')
         mode_names = {
@@ -72,29 +87,21 @@ class IntroSequenceScene(BaseScene):
             'vs_friend': 'ПРОТИВ ДРУГА',
             'training': 'ТРЕНИРОВКА'
         }
-        
         mode_name = mode_names.get(mode_id, mode_id)
-        text = font.render(f"РЕЖИМ: {mode_name}", True, (255, 255, 255))
-        screen.blit(text, (screen.get_width()//2 - text.get_width()//2, self.s(50)))
         
         # Название карты
-        map_font = self.get_font(24)
         map_id = self.game_mode_data.get('map', 'random')
-        map_names = {
-            'soul_beach': 'SOUL BEACH',
-            'hall_of_judgement': 'HALL OF JUDGEMENT',
-            'deep_caves': 'DEEP CAVES',
-            'everlost': 'EVERLOST',
-            'random': 'RANDOM MAP'
-        }
-        
-        map_name = map_names.get(map_id, map_id)
-        map_text = map_font.render(f"КАРТА: {map_name}", True, (255, 215, 0))
-        screen.blit(map_text, (screen.get_width()//2 - map_text.get_width()//2, self.s(100)))
+        map_name = get_map_name(map_id).upper() if map_id != 'random' else 'RANDOM MAP'
         
-        # Счетчик
+        return [
+            (f"РЕЖИМ: {mode_name}", self.f(32), (255, 255, 255), (None, self.s(50)), True),
+            (f"КАРТА: {map_name}", self.f(24), (255, 215, 0), (None, self.s(100)), False),
+        ]
+    
+    def _draw_fight_info(self, screen):
+        """Отображает счетчик до начала боя (остальное уже в фоне)"""
         timer_font = self.get_font(48, bold=True)
         time_left = max(0, self.duration - self.timer)
         timer_text = timer_font.render(f"{int(time_left) + 1}", True, (255, 100, 100))
         screen.blit(timer_text, (screen.get_width()//2 - timer_text.get_width()//2, 
-                               screen.get_height()//2 - timer_text.get_height()//2))
\ No newline at end of file
+                               screen.get_height()//2 - timer_text.get_height()//2))
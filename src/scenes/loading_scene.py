@@ -1,6 +1,7 @@
 # src/scenes/loading_scene.py
 import pygame
 from src.managers.game_manager import BaseScene
+from src.managers.asset_loader import AssetLoader
 import sys
 import os
 def resource_path(relative_path):
@@ -26,12 +27,12 @@ class LoadingScene(BaseScene):
             self.gm.settings.get_text("loading_complete")
         ]
         self.current_step = 0
-        self.step_progress = 0
         self.background_art = None
         self.logo_displayed = False
         self.logo_timer = 0
         self.logo_duration = 2.0  # 2 секунды показываем логотип
         self.logo_image = None
+        self.loader = None
         
         # Проверяем первый запуск
         if hasattr(gm, 'save_manager') and gm.save_manager:
@@ -40,10 +41,14 @@ class LoadingScene(BaseScene):
     def on_enter(self):
         self.progress = 0
         self.current_step = 0
-        self.step_progress = 0
         self.logo_displayed = False
         self.logo_timer = 0
         
+        # Фоновая загрузка стартует сразу - в том числе пока показывается логотип
+        self.loader = AssetLoader(self.gm.resources)
+        self._preload_resources()
+        self.loader.start()
+        
         # Если пропускаем логотип, сразу начинаем загрузку
         if self.skip_logo:
             self.logo_displayed = True
@@ -91,9 +96,17 @@ class LoadingScene(BaseScene):
             self.background_art = None
         
     def _preload_resources(self):
-        pass
+        """Целевая сцена сама сообщает, какие ресурсы ей нужны (queue_preload)"""
+        target = self.gm.get_scene(self.target_scene)
+        if target and hasattr(target, "queue_preload"):
+            target.queue_preload(self.loader)
+        print(f"📦 Ресурсов к загрузке: {self.loader.total}")
         
     def update(self, dt):
+        # Доделываем готовые ресурсы в главном потоке (convert_alpha и т.д.)
+        if self.loader:
+            self.loader.poll()
+
         # Сначала показываем логотип
         if not self.logo_displayed:
             self.logo_timer += dt
@@ -104,17 +117,14 @@ class LoadingScene(BaseScene):
                     self.gm.save_manager.set_first_launch_false()
             return
             
-        # Затем начинаем загрузку
-        self.step_progress += dt * 0.5
+        # Затем показываем реальный прогресс загрузки
+        self.progress = self.loader.progress
+        self.current_step = min(self.loader.current_stage, len(self.loading_steps) - 1)
         
-        if self.step_progress >= 1.0:
-            self.step_progress = 0
-            self.current_step += 1
-            self.progress = self.current_step / len(self.loading_steps)
-            
-            if self.current_step >= len(self.loading_steps):
-                self.gm.set_scene(self.target_scene)
-                return
+        if self.loader.done:
+            self.current_step = len(self.loading_steps) - 1
+            self.gm.set_scene(self.target_scene)
+            return
                 
     def draw(self, screen):
         # Фаза 1: Показ логотипа на черном фоне
@@ -174,6 +184,13 @@ class LoadingScene(BaseScene):
         percent_text = font.render(f"{percent}%", True, (255, 255, 255))
         screen.blit(percent_text, (screen.get_width()//2 - percent_text.get_width()//2, bar_y + bar_height + self.s(20)))
         
+        # Какой ресурс загружен последним (НАД ПОДСКАЗКОЙ)
+        if self.loader and self.loader.total:
+            asset_font = self.get_font(14)
+            asset_line = f"{self.loader.completed}/{self.loader.total}  {self.loader.current_label}"
+            asset_text = asset_font.render(asset_line, True, (120, 120, 120))
+            screen.blit(asset_text, (screen.get_width()//2 - asset_text.get_width()//2, bar_y + bar_height + self.s(45)))
+        
         # Подсказка (ЕЩЕ НИЖЕ)
         hint_font = self.get_font(18)
         hint_text = self.gm.settings.get_text("please_wait")
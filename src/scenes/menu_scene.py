@@ -5,7 +5,8 @@ import sys
 from src.managers.game_manager import BaseScene
 from src.managers.save_manager import SaveManager
 from src.managers.skin_manager import SkinManager
-from src.core.animations import VideoAnimation, resource_path
+from src.core.animations import VideoAnimation, cache_video_frames, resource_path
+from src.core.fonts import get_font, fit_text
 
 # Функция для получения корректного пути к ресурсам в pyinstaller
 def resource_path(relative_path):
@@ -19,6 +20,8 @@ def resource_path(relative_path):
     return os.path.join(base_path, relative_path)
 
 class MenuScene(BaseScene):
+    supports_dirty_rects = True
+
     def __init__(self, gm):
         super().__init__(gm)
         
@@ -163,7 +166,8 @@ class MenuScene(BaseScene):
         self.game_modes = [
             {"id": "vs_bot", "name": "VS BOT"},
             {"id": "training", "name": "ТРЕНИРОВКА"},
-            {"id": "vs_friend", "name": "ПРОТИВ ДРУГА"}
+            {"id": "vs_friend", "name": "ПРОТИВ ДРУГА"},
+            {"id": "vs_friend_online", "name": "ПО СЕТИ"}
         ]  # Режимы игры как массив словарей
         self.selected_game_mode = 0  # 0 - VS BOT, 1 - Тренировка
         self.mode_selecting = False  # Режим выбора режима игры
@@ -183,7 +187,9 @@ class MenuScene(BaseScene):
         
         # 🎬 ДОБАВЛЕНО: Кэш для анимаций артов
         self.art_animations = {}  # Ключ: (имя, скин, размер) -> VideoAnimation
+        self.cards_card_size = None  # Размер, под который уже подготовлены карточки
         self.playing_animations = []  # Список активных анимаций для обновления
+        self.animated_regions = []  # Где на экране арты (перерисовываются в режиме dirty rects)
         
         # Загружаем иконки
         self.icons = {
@@ -237,7 +243,7 @@ class MenuScene(BaseScene):
             text = "I"
         
         # Добавляем текст
-        font = pygame.font.SysFont("arial", max(10, size // 2))
+        font = get_font(max(10, size // 2))
         text_surface = font.render(text, True, (255, 255, 255))
         text_rect = text_surface.get_rect(center=(size//2, size//2))
         icon.blit(text_surface, text_rect)
@@ -296,6 +302,10 @@ class MenuScene(BaseScene):
         
         print(f"💰 Данные игрока обновлены: {self.player_data['coins']} монет, {self.player_data['trophies']} трофеев")
 
+    def on_exit(self):
+        """Арты меню не нужны за его пределами - останавливаем их декодеры"""
+        self._release_art_animations()
+
     def _restore_last_selection(self):
         """Восстанавливает последний выбор персонажей из сохранения"""
         last_char = self.save_manager.get_last_character()
@@ -375,9 +385,53 @@ class MenuScene(BaseScene):
         self.show_selection_confirmed = True
         self.selecting_mode = False
 
+    def queue_preload(self, loader):
+        """
+        Ставит в AssetLoader все, что нужно меню: картинки карточек, арт-видео выбранных
+        персонажа и камео (декодируются в дисковый кэш кадров) и подготовку карточек
+        под текущий размер. Вызывается из LoadingScene. Арты остальных скинов
+        кэшируются при первом показе - загрузка не растет с каталогом скинов.
+        """
+        from src.managers.asset_loader import STAGE_RESOURCES, STAGE_CHARACTERS, STAGE_SCENES
+
+        for skins in (self.character_skins, self.cameo_skins):
+            for entity_name, skin_ids in skins.items():
+                for skin_id in skin_ids:
+                    for kind in ("normal", "special"):
+                        card_path = resource_path(os.path.join("Sprites", "cards", f"{entity_name}_{skin_id}_{kind}.jpg"))
+                        if os.path.exists(card_path):
+                            loader.add_image(card_path, STAGE_RESOURCES)
+
+        art_size = self.s(350)
+        target_size = self._get_art_target_size(art_size)
+        frame_cache = self.gm.resources.frame_cache
+        for entity_name, skin_id in self._get_saved_arts():
+            video_path = os.path.join("Sprites", "arts", f"{entity_name.lower()}_{skin_id}_art.mp4")
+            loader.add_task(
+                f"{entity_name}_{skin_id}_art.mp4", STAGE_CHARACTERS,
+                decode=lambda path=video_path: cache_video_frames(path, target_size, frame_cache)
+            )
+
+        loader.add_task("menu_cards", STAGE_SCENES, finalize=lambda _: self._load_all_cards())
+
+    def _get_saved_arts(self):
+        """(имя, скин) артов секции FIGHT по последнему выбору из сохранения (как _restore_last_selection)"""
+        arts = []
+        for entities, last_name, skin_id in (
+                (self.characters, self.save_manager.get_last_character(), self.save_manager.get_character_skin()),
+                (self.cameos, self.save_manager.get_last_cameo(), self.save_manager.get_cameo_skin())):
+            entity = next((e for e in entities if e["name"].lower() == last_name.lower()), None)
+            if entity is None:
+                arts.append((entities[0]["name"], entities[0]["skin"]))
+            else:
+                arts.append((entity["name"], skin_id))
+        return arts
+
     def _load_all_cards(self):
         """Загружаем все карточки с учетом скинов"""
         card_size = self._get_card_size()
+        if self.cards_card_size == card_size:
+            return  # Уже подготовлены (например, LoadingScene прогрела меню)
         
         # Загружаем карточки персонажей
         for char_name in self.character_skins.keys():
@@ -410,6 +464,8 @@ class MenuScene(BaseScene):
                 if default_skin in self.cameo_skins[cameo_key]:
                     cameo["card_normal"] = self.cameo_skins[cameo_key][default_skin]["card_normal"]
                     cameo["card_special"] = self.cameo_skins[cameo_key][default_skin]["card_special"]
+
+        self.cards_card_size = card_size
     
     def _load_character_cards(self, character):
         """Перезагружает карточки для персонажа с учетом скина"""
@@ -443,30 +499,15 @@ class MenuScene(BaseScene):
     
     def _get_card_size(self):
         """Определяем размер карточки в зависимости от разрешения"""
-        base_size = 280
-        
-        if self.gm.settings.scale_factor > 1.5:
-            return int(base_size * 1.3)
-        elif self.gm.settings.scale_factor > 1.2:
-            return int(base_size * 1.15)
-        return base_size
+        return self.gm.resources.get_card_size(self.gm.settings.scale_factor)
 
     def _load_card_image(self, filename, is_special, card_size):
-        """Загрузка карточки с указанным размером - ИСПРАВЛЕНО ДЛЯ PYINSTALLER"""
-        # Используем resource_path для корректной работы в .exe
-        card_path = resource_path(os.path.join("Sprites", "cards", filename))
-        
-        try:
-            if os.path.exists(card_path):
-                card = pygame.image.load(card_path).convert_alpha()
-                card = pygame.transform.scale(card, (card_size, card_size))
-                return card
-            else:
-                print(f"⚠️ Карточка не найдена: {card_path}")
-                return self._create_placeholder_card(filename, is_special, card_size)
-        except Exception as e:
-            print(f"❌ Ошибка загрузки карточки {card_path}: {e}")
+        """Карточка из общего кэша ResourceManager (масштабируется один раз на разрешение)"""
+        card = self.gm.resources.get_card(os.path.splitext(filename)[0], card_size)
+        if card is None:
+            print(f"⚠️ Карточка не найдена: {filename}")
             return self._create_placeholder_card(filename, is_special, card_size)
+        return card
 
     def _create_placeholder_card(self, filename, is_special, card_size):
         """Создание заглушки для карточки"""
@@ -486,12 +527,12 @@ class MenuScene(BaseScene):
         filename_text = filename
         
         font_size = max(10, card_size // 12)
-        font = pygame.font.SysFont("arial", font_size)
+        font = get_font(font_size)
         status = self.gm.settings.get_text("special") if is_special else self.gm.settings.get_text("normal")
         text = font.render(f"{filename_text}", True, (255, 255, 255))
         card.blit(text, (card_size//20, card_size//2))
         
-        placeholder_font = pygame.font.SysFont("arial", max(12, card_size//10), bold=True)
+        placeholder_font = get_font(max(12, card_size//10), bold=True)
         placeholder_render = placeholder_font.render(placeholder_text, True, (255, 255, 255))
         card.blit(placeholder_render, (card_size//2 - placeholder_render.get_width()//2, card_size//3))
         
@@ -542,7 +583,8 @@ class MenuScene(BaseScene):
         self.game_modes = [
             {"id": "vs_bot", "name": self.gm.settings.get_text("vs_bot", "VS BOT")},
             {"id": "vs_friend", "name": self.gm.settings.get_text("vs_friend", "ПРОТИВ ДРУГА")},  # Новый режим
-            {"id": "training", "name": self.gm.settings.get_text("training", "ТРЕНИРОВКА")}
+            {"id": "training", "name": self.gm.settings.get_text("training", "ТРЕНИРОВКА")},
+            {"id": "vs_friend_online", "name": self.gm.settings.get_text("vs_friend_online", "ПО СЕТИ")}
         ]
     
     def handle_events(self, events):
@@ -894,7 +936,7 @@ class MenuScene(BaseScene):
             self.gm.register_scene("game_loading", loading_scene)
             self.gm.set_scene("game_loading")
         else:
-            # Для VS BOT и Против друга переходим на сцену выбора персонажей
+            # Для VS BOT, Против друга и игры по сети переходим на сцену выбора персонажей
             from src.scenes.character_selection_scene import CharacterSelectionScene
             character_selection = CharacterSelectionScene(self.gm, game_mode["id"], is_training=False)
             self.gm.register_scene("character_selection", character_selection)
@@ -917,9 +959,9 @@ class MenuScene(BaseScene):
         from src.scenes.battle_scene import BattleScene
         from src.scenes.victory_scene import VictoryScene
         
-        player_char = Character(char_name, self.gm.resources)
+        player_char = Character(char_name, self.gm.resources, skin=self.save_manager.get_character_skin())
         enemy_char = Character("fighter_right", self.gm.resources)  # Бот по умолчанию
-        player_cameo = Character(cameo_name, self.gm.resources)
+        player_cameo = Character(cameo_name, self.gm.resources, skin=self.save_manager.get_cameo_skin())
         enemy_cameo = Character("cameo_right", self.gm.resources)
         
         # Создаем данные режима игры
@@ -927,7 +969,9 @@ class MenuScene(BaseScene):
             "id": game_mode["id"],
             "name": game_mode["name"],
             "map": "random",  # Для тренировки всегда случайная карта
-            "is_training": game_mode["id"] == "training"
+            "is_training": game_mode["id"] == "training",
+            "cameos": [cameo_name, "cameo_right"],
+            "skins": [self.save_manager.get_character_skin(), "default"]
         }
         
         # 🎮 Создаем интро сцену с передачей режима игры
@@ -947,8 +991,11 @@ class MenuScene(BaseScene):
         for animation in self.playing_animations:
             animation.update(dt)
         
-        # Очищаем список анимаций (будет заполнен заново при отрисовке)
-        self.playing_animations = []
+        # В режиме dirty rects перерисовываем только арты, а оверлеи с таймером - целиком
+        for region in self.animated_regions:
+            self.invalidate(region)
+        if self.show_selection_confirmed or self.unlock_animation or self.locked_skin_message:
+            self.invalidate()
         
         if self.show_selection_confirmed:
             current_time = pygame.time.get_ticks()
@@ -974,6 +1021,10 @@ class MenuScene(BaseScene):
                 self.locked_skin_message = False
     
     def draw(self, screen):
+        # Арты и их области заполняются заново при отрисовке. Между отрисовками (в режиме
+        # dirty rects кадр может ничего не рисовать) анимации продолжают обновляться
+        self.animated_regions = []
+        self.playing_animations = []
         self._draw_background(screen)
         self._draw_header(screen)
         self._draw_section_tabs(screen)
@@ -1007,13 +1058,16 @@ class MenuScene(BaseScene):
             self._draw_locked_skin_message(screen)
     
     def _draw_background(self, screen):
-        """Отрисовка фона с градиентом"""
-        screen.fill(self.colors["background"])
+        """Отрисовка фона с градиентом (градиент рисуется один раз и кэшируется)"""
+        screen.blit(self.get_layer("background", screen.get_size(), self._paint_background), (0, 0))
+
+    def _paint_background(self, layer):
+        layer.fill(self.colors["background"])
         
         # Градиентный фон
-        for i in range(screen.get_height()):
+        for i in range(layer.get_height()):
             color = (20 + i//20, 20 + i//25, 40 + i//15)
-            pygame.draw.line(screen, color, (0, i), (screen.get_width(), i))
+            pygame.draw.line(layer, color, (0, i), (layer.get_width(), i))
     
     def _draw_header(self, screen):
         """Верхняя панель с названием и ресурсами"""
@@ -1021,9 +1075,7 @@ class MenuScene(BaseScene):
         header_rect = pygame.Rect(0, 0, screen.get_width(), header_height)
         
         # Градиентный фон хедера
-        for i in range(header_height):
-            color = (30 + i//3, 30 + i//3, 50 + i//2)
-            pygame.draw.line(screen, color, (0, i), (screen.get_width(), i))
+        screen.blit(self.get_layer("header", header_rect.size, self._paint_header), (0, 0))
         
         # Заголовок
         title_font = self.get_font(36, bold=True)
@@ -1046,6 +1098,12 @@ class MenuScene(BaseScene):
         trophies_text = resource_font.render(f"{self.player_data['trophies']}", True, (255, 200, 100))
         screen.blit(trophies_text, (screen.get_width() - self.s(150) + trophy_icon.get_width() + 5, self.s(50)))
     
+    def _paint_header(self, layer):
+        """Градиент хедера (рисуется один раз в get_layer)"""
+        for i in range(layer.get_height()):
+            color = (30 + i//3, 30 + i//3, 50 + i//2)
+            pygame.draw.line(layer, color, (0, i), (layer.get_width(), i))
+    
     def _draw_section_tabs(self, screen):
         """Отрисовка вертикальных вкладок меню слева и справа, центрированных по Y - увеличенные"""
         self.tab_buttons = []
@@ -1079,20 +1137,9 @@ class MenuScene(BaseScene):
             pygame.draw.rect(screen, self.colors["text_light"], tab_rect, self.s(2), border_radius=self.s(12))
             
             # ⚡ УВЕЛИЧИЛ ШРИФТ
-            max_font_size = self.f(18)
-            min_font_size = self.f(12)
-            font_size = max_font_size
-            
-            while font_size >= min_font_size:
-                font = pygame.font.SysFont("arial", int(font_size), bold=True)
-                text_surface = font.render(section, True, self.colors["text_light"])
-                
-                if text_surface.get_width() <= tab_width - self.s(15):
-                    break
-                font_size -= 1
-            
-            final_font = pygame.font.SysFont("arial", int(font_size), bold=True)
-            final_text = final_font.render(section, True, self.colors["text_light"])
+            # Размер подбирается один раз и кэшируется вместе с готовым текстом
+            final_text = fit_text(section, tab_width - self.s(15), self.f(18), self.f(12),
+                                  bold=True, color=self.colors["text_light"])
             
             screen.blit(final_text, (tab_rect.centerx - final_text.get_width() // 2, 
                                    tab_rect.centery - final_text.get_height() // 2))
@@ -1113,20 +1160,9 @@ class MenuScene(BaseScene):
             pygame.draw.rect(screen, self.colors["text_light"], tab_rect, self.s(2), border_radius=self.s(12))
             
             # ⚡ УВЕЛИЧИЛ ШРИФТ
-            max_font_size = self.f(18)
-            min_font_size = self.f(12)
-            font_size = max_font_size
-            
-            while font_size >= min_font_size:
-                font = pygame.font.SysFont("arial", int(font_size), bold=True)
-                text_surface = font.render(section, True, self.colors["text_light"])
-                
-                if text_surface.get_width() <= tab_width - self.s(15):
-                    break
-                font_size -= 1
-            
-            final_font = pygame.font.SysFont("arial", int(font_size), bold=True)
-            final_text = final_font.render(section, True, self.colors["text_light"])
+            # Размер подбирается один раз и кэшируется вместе с готовым текстом
+            final_text = fit_text(section, tab_width - self.s(15), self.f(18), self.f(12),
+                                  bold=True, color=self.colors["text_light"])
             
             screen.blit(final_text, (tab_rect.centerx - final_text.get_width() // 2, 
                                    tab_rect.centery - final_text.get_height() // 2))
@@ -1139,6 +1175,7 @@ class MenuScene(BaseScene):
         
         # 🎬 АНИМИРОВАННЫЕ АРТЫ ПО ЦЕНТРУ
         art_size = self.s(350)
+        char_animation = cameo_animation = None
         
         # Арт персонажа с учетом ВЫБРАННОГО СКИНА (анимированный)
         if selected_char:
@@ -1151,6 +1188,7 @@ class MenuScene(BaseScene):
                 frame = char_animation.get_frame()
                 if frame:
                     screen.blit(frame, (char_x, char_y))
+                self.animated_regions.append(self._get_art_rect(frame, char_x, char_y, art_size))
                 
                 # Добавляем анимацию в список для обновления, если ее там еще нет
                 if char_animation not in self.playing_animations:
@@ -1167,11 +1205,15 @@ class MenuScene(BaseScene):
                 frame = cameo_animation.get_frame()
                 if frame:
                     screen.blit(frame, (cameo_x, cameo_y))
+                self.animated_regions.append(self._get_art_rect(frame, cameo_x, cameo_y, art_size))
                 
                 # Добавляем анимацию в список для обновления, если ее там еще нет
                 if cameo_animation not in self.playing_animations:
                     self.playing_animations.append(cameo_animation)
         
+        # Остальные арты (прошлый скин, старый размер после смены разрешения) - закрываем
+        self._release_art_animations(keep=(char_animation, cameo_animation))
+        
         # 🎮 Кнопка выбора режима - внизу по центру
         mode_btn_width = self.s(220)
         mode_btn_height = self.s(60)
@@ -1233,6 +1275,30 @@ class MenuScene(BaseScene):
         screen.blit(btn_render, (self.battle_button.centerx - btn_render.get_width() // 2,
                                self.battle_button.centery - btn_render.get_height() // 2))
 
+    def _get_art_target_size(self, art_size):
+        """Размер кадра арта: высота art_size, пропорции оригинала 704x1280"""
+        if art_size <= 0:
+            return None
+        return (int(704 * art_size / 1280), art_size)
+
+    def _get_art_rect(self, frame, x, y, art_size):
+        """
+        Область арта на экране. Пока потоковый декодер не отдал первый кадр (frame - None),
+        берется целевой размер - иначе в режиме dirty rects арт больше не перерисуется.
+        """
+        if frame:
+            return frame.get_rect(topleft=(x, y))
+        return pygame.Rect((x, y), self._get_art_target_size(art_size))
+
+    def _release_art_animations(self, keep=()):
+        """Закрывает арты не из keep (фоновый декодер и VideoCapture) и убирает их из кэша"""
+        for cache_key, animation in list(self.art_animations.items()):
+            if animation not in keep:
+                animation.close()
+                del self.art_animations[cache_key]
+                if animation in self.playing_animations:
+                    self.playing_animations.remove(animation)
+
     def _load_art_animation(self, entity_name, skin_id, art_size):
         """🎬 Загружает видео-анимацию арта с учетом скина"""
         cache_key = f"{entity_name.lower()}_{skin_id}_{art_size}"
@@ -1253,32 +1319,20 @@ class MenuScene(BaseScene):
                 print(f"🎬 Загружаем видео арт: {video_path}")
                 
                 # Рассчитываем целевой размер с сохранением пропорций 704x1280
-                # Пропорции: 704 / 1280 ≈ 0.55 (ширина/высота)
-                original_width = 704   # Ширина оригинала
-                original_height = 1280 # Высота оригинала
-                
-                # Сохраняем пропорции видео (портретный формат)
-                # Подгоняем под квадрат art_size
-                if art_size > 0:
-                    # Вычисляем масштаб по высоте (лимитирующая сторона)
-                    scale_factor = art_size / original_height
-                    target_width = int(original_width * scale_factor)
-                    target_height = art_size  # Высота равна art_size
-                    
-                    # Видео будет уже чем квадрат, поэтому центрируем
-                    target_size = (target_width, target_height)
-                else:
-                    target_size = None
+                # (тот же размер использует прогрев кэша кадров в queue_preload)
+                target_size = self._get_art_target_size(art_size)
                 
-                print(f"📐 Масштабирование: {original_width}x{original_height} -> {target_size}")
+                print(f"📐 Масштабирование: 704x1280 -> {target_size}")
                 
                 animation = VideoAnimation(
                     video_path=video_path,
                     target_size=target_size,
                     loop=True,  # Зацикленное воспроизведение
-                    fps=30  # Можно не указывать, будет взято из видео
+                    fps=30,  # Можно не указывать, будет взято из видео
+                    streaming=True,  # Декодируем на лету в фоновом потоке
+                    frame_cache=self.gm.resources.frame_cache  # Готовые кадры с диска
                 )
-                print(f"✅ Видео загружено: {len(animation.frames)} кадров, FPS: {animation.fps}")
+                print(f"✅ Видео открыто: {animation.frame_count} кадров, FPS: {animation.fps}")
             else:
                 print(f"❌ Видео не найдено: {actual_path}")
                 # Пробуем альтернативные пути (для обратной совместимости)
@@ -1293,19 +1347,15 @@ class MenuScene(BaseScene):
                     if os.path.exists(alt_actual_path):
                         print(f"🎬 Найдено альтернативное видео: {alt_path}")
                         # Используем то же масштабирование
-                        if art_size > 0:
-                            scale_factor = art_size / 1280
-                            target_width = int(704 * scale_factor)
-                            target_height = art_size
-                            target_size = (target_width, target_height)
-                        else:
-                            target_size = None
+                        target_size = self._get_art_target_size(art_size)
                         
                         animation = VideoAnimation(
                             video_path=alt_path,
                             target_size=target_size,
                             loop=True,
-                            fps=30
+                            fps=30,
+                            streaming=True,
+                            frame_cache=self.gm.resources.frame_cache
                         )
                         print(f"✅ Альтернативное видео загружено")
                         break
@@ -1412,16 +1462,16 @@ class MenuScene(BaseScene):
         border = max(3, min(width, height) // 40)
         pygame.draw.rect(art, (255, 255, 255), (border, border, width-2*border, height-2*border), border)
         
-        placeholder_font = pygame.font.SysFont("arial", max(20, min(width, height)//15), bold=True)
+        placeholder_font = get_font(max(20, min(width, height)//15), bold=True)
         placeholder_text = placeholder_font.render("АРТ", True, (255, 255, 255))
         art.blit(placeholder_text, (width//2 - placeholder_text.get_width()//2, height//3))
         
-        name_font = pygame.font.SysFont("arial", max(14, min(width, height)//20))
+        name_font = get_font(max(14, min(width, height)//20))
         name_text = name_font.render(filename, True, (200, 200, 200))
         art.blit(name_text, (width//2 - name_text.get_width()//2, height//2))
         
         # Добавляем информацию о пропорциях
-        ratio_font = pygame.font.SysFont("arial", max(12, min(width, height)//25))
+        ratio_font = get_font(max(12, min(width, height)//25))
         ratio_text = ratio_font.render(f"{width}x{height}", True, (150, 150, 200))
         art.blit(ratio_text, (width//2 - ratio_text.get_width()//2, height*2//3))
         
@@ -1946,7 +1996,7 @@ class MenuScene(BaseScene):
         
         # Текст "РАЗБЛОКИРОВАНО!"
         text_size = int(self.s(40) * (1 + progress * 0.3))
-        text_font = pygame.font.SysFont("arial", text_size, bold=True)
+        text_font = get_font(text_size, bold=True)
         text = text_font.render("РАЗБЛОКИРОВАНО!", True, (100, 255, 100))
         
         text_x = screen.get_width() // 2 - text.get_width() // 2
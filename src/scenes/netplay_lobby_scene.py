@@ -0,0 +1,89 @@
+# src/scenes/netplay_lobby_scene.py
+"""
+Ожидание соперника перед сетевым боем (режим vs_friend_online)
+--------------------------------------------------------------
+Открывает UDP-порт и раз в кадр делает NetplayHandshake.poll(): отправляет свой
+выбор из CharacterSelectionScene и ждет выбор соперника. Когда настройка боя
+согласована, открытый транспорт уходит в бой (start_netplay). Ошибка сверки
+(NetplayError) или занятый порт показываются на экране. Esc - в меню.
+"""
+
+import pygame
+
+from src.managers.game_manager import BaseScene
+from src.managers.netplay import NetplayError, NetplayHandshake, create_transport, start_netplay
+
+
+class NetplayLobbyScene(BaseScene):
+    def __init__(self, gm, config, pick):
+        super().__init__(gm)
+        self.config = config
+        self.pick = pick
+        self.transport = None
+        self.handshake = None
+        self.error = None
+        self.timer = 0.0
+
+    def on_enter(self):
+        self.error = None
+        try:
+            self.transport = create_transport(self.config)
+        except OSError as e:
+            self.error = f"{self.gm.settings.get_text('netplay_port_error', 'Порт занят')}: {e}"
+            return
+        self.handshake = NetplayHandshake(self.transport, self.config["player"], self.pick)
+        print(f"🌐 Ожидание соперника: P{self.config['player']}, порт {self.config['local_port']} -> "
+              f"{self.config['remote_addr'][0]}:{self.config['remote_addr'][1]}")
+
+    def handle_events(self, events):
+        for event in events:
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
+                self._close()
+                self.gm.set_scene("menu")
+
+    def update(self, dt):
+        self.timer += dt
+        if self.handshake is None:
+            return
+        try:
+            ready = self.handshake.poll()
+        except NetplayError as e:
+            print(f"❌ Сетевая игра: {e}")
+            self.error = str(e)
+            self._close()
+            return
+        if ready:
+            # Транспорт не закрываем - им дальше пользуется RollbackSession боя
+            handshake, self.handshake, self.transport = self.handshake, None, None
+            start_netplay(self.gm, dict(self.config, transport=handshake.transport), handshake.setup)
+
+    def _close(self):
+        self.handshake = None
+        if self.transport:
+            self.transport.close()
+            self.transport = None
+
+    def draw(self, screen):
+        screen.fill((20, 20, 40))
+        center_x = screen.get_width() // 2
+        host, port = self.config["remote_addr"]
+
+        title = self.get_font(40, bold=True).render(
+            self.gm.settings.get_text("vs_friend_online", "ПО СЕТИ"), True, (255, 215, 0))
+        screen.blit(title, (center_x - title.get_width() // 2, self.s(150)))
+
+        if self.error:
+            lines = [(self.error, (255, 100, 100))]
+        else:
+            dots = "." * (int(self.timer * 2) % 4)
+            lines = [(f"{self.gm.settings.get_text('netplay_waiting', 'Ожидание соперника')}{dots}", (255, 255, 255)),
+                     (f"P{self.config['player']}: {self.pick['character']} + {self.pick['cameo']}", (200, 200, 200)),
+                     (f"{self.config['local_port']} -> {host}:{port}", (150, 150, 150))]
+        lines.append((self.gm.settings.get_text("netplay_back", "ESC - в меню"), (100, 100, 100)))
+
+        font = self.get_font(24)
+        y = self.s(260)
+        for text, color in lines:
+            label = font.render(text, True, color)
+            screen.blit(label, (center_x - label.get_width() // 2, y))
+            y += self.s(45)
@@ -0,0 +1,164 @@
+# src/scenes/replay_viewer_scene.py
+"""
+Просмотр реплеев (.vwr) с перемоткой
+------------------------------------
+Тот же BattleScene, только ввод берется из реплея по номеру тика.
+
+ - перемотка к любому тику: ближайший ключевой кадр (Replay.keyframe_before)
+   + досчет не больше keyframe_interval тиков; вперед от текущего тика -
+   без восстановления, если так ближе
+ - ускорение x8..x32: за один тик GameManager бой проходит speed тиков,
+   а рисуется только последний - промежуточные кадры никто не увидит
+
+Управление: Пробел - пауза, Стрелки влево/вправо - на 5 секунд назад/вперед,
+Стрелки вверх/вниз - скорость, Home - в начало, Esc - в меню.
+
+Запуск: python main.py --replay replays/<файл>.vwr
+"""
+
+import pygame
+
+from src.core.character import Character, PREFETCH_ANIMATIONS
+from src.core.fixed_step import TICK_DT, TICK_RATE
+from src.core.replay import Replay
+from src.managers.battle_manager import BattleManager, ROUND_TICKS
+from src.scenes.battle_scene import BattleScene
+
+SPEEDS = (1, 8, 16, 32)
+SEEK_TICKS = 5 * TICK_RATE
+
+
+class ReplayViewerScene(BattleScene):
+    def __init__(self, gm, fighter_left, fighter_right, replay):
+        meta = replay.metadata
+        game_mode_data = {
+            "id": "replay",
+            "name": "REPLAY",
+            "map": meta.get("map", "random"),
+            "is_training": False,
+            "cameos": meta.get("cameos", [None, None]),
+            "skins": meta.get("skins", ["default", "default"]),
+            "seed": meta.get("seed"),
+            "record_replay": False,  # реплей реплея не пишем
+        }
+        battle = BattleManager(fighter_left, fighter_right, meta.get("round_ticks", ROUND_TICKS))
+        super().__init__(gm, fighter_left, fighter_right, game_mode_data, battle=battle)
+        self.replay = replay
+        self.masks = replay.masks()  # ввод по номеру тика - для перемотки
+        self.speed_index = 0
+        self.paused = False
+
+    @property
+    def speed(self):
+        return SPEEDS[self.speed_index]
+
+    def queue_preload(self, loader):
+        """Кадры обоих бойцов (вызывается из LoadingScene, как у IntroSequenceScene)"""
+        from src.managers.asset_loader import STAGE_CHARACTERS, STAGE_SCENES
+
+        for fighter in (self.f_l, self.f_r):
+            for path in self.gm.resources.list_character_images(fighter.name, fighter.skin, PREFETCH_ANIMATIONS):
+                loader.add_image(path, STAGE_CHARACTERS)
+        loader.add_task("fighters", STAGE_SCENES, finalize=lambda _: self._prepare_fighters())
+
+    def _prepare_fighters(self):
+        for fighter in (self.f_l, self.f_r):
+            fighter.reload_animations()
+        # Анимации появились только сейчас - стартовый снапшот с их плейхедом
+        self.start_snapshot = self.battle.snapshot()
+
+    def handle_events(self, events):
+        for event in events:
+            if event.type != pygame.KEYDOWN:
+                continue
+            if event.key == pygame.K_SPACE:
+                self.paused = not self.paused
+            elif event.key == pygame.K_LEFT:
+                self.seek(self.tick - SEEK_TICKS)
+            elif event.key == pygame.K_RIGHT:
+                self.seek(self.tick + SEEK_TICKS)
+            elif event.key == pygame.K_HOME:
+                self.seek(0)
+            elif event.key == pygame.K_UP:
+                self.speed_index = min(self.speed_index + 1, len(SPEEDS) - 1)
+            elif event.key == pygame.K_DOWN:
+                self.speed_index = max(self.speed_index - 1, 0)
+            elif event.key == pygame.K_ESCAPE:
+                self.gm.set_scene("loading")
+
+    def seek(self, tick):
+        """Переход к тику: ключевой кадр не позже tick и досчет по записанному вводу"""
+        tick = min(max(tick, 0), self.replay.ticks)
+        keyframe_tick, snapshot = self.replay.keyframe_before(tick) or (0, self.start_snapshot)
+        # Вперед от текущего тика досчитываем без восстановления, если это не дольше
+        if not keyframe_tick <= self.tick <= tick:
+            self.load_snapshot(snapshot)
+        self._simulate(tick - self.tick)
+        self._sync_result()
+
+    def _simulate(self, ticks):
+        """До ticks тиков боя по реплею, без отрисовки"""
+        battle = self.battle
+        for _ in range(ticks):
+            tick = battle.tick
+            if battle.finished or tick >= self.replay.ticks:
+                break
+            battle.step(self.masks[0][tick], self.masks[1][tick], TICK_DT)
+
+    def _sync_result(self):
+        self.ended = self.battle.finished
+        self.winner = self.battle.winner
+
+    def fixed_update(self, dt):
+        if self.paused:
+            return
+        if self.battle.finished:
+            self.battle.step(0, 0, dt)  # победная поза
+            return
+        self._simulate(self.speed)
+        if self.battle.finished and not self.ended:
+            self._sync_result()
+            if self.winner:
+                self.winner.play_animation("victory")
+
+    def draw(self, screen):
+        super().draw(screen)
+        self._draw_timeline(screen)
+
+    def _draw_timeline(self, screen):
+        """Полоса реплея: позиция, ключевые кадры, скорость"""
+        total = max(self.replay.ticks, 1)
+        bar = pygame.Rect(self.s(20), screen.get_height() - self.s(40), screen.get_width() - self.s(40), self.s(8))
+        pygame.draw.rect(screen, (60, 60, 60), bar)
+        pygame.draw.rect(screen, (230, 200, 60), (bar.x, bar.y, bar.width * self.tick // total, bar.height))
+        for keyframe_tick in self.replay.keyframe_ticks:
+            x = bar.x + bar.width * keyframe_tick // total
+            pygame.draw.line(screen, (150, 150, 150), (x, bar.bottom), (x, bar.bottom + self.s(4)))
+
+        state = "Пауза" if self.paused else f"x{self.speed}"
+        text = f"{state}   {self._format_time(self.tick)} / {self._format_time(self.replay.ticks)}"
+        label = self.get_font(18).render(text, True, (255, 255, 255))
+        screen.blit(label, (bar.x, bar.y - label.get_height() - self.s(4)))
+
+    @staticmethod
+    def _format_time(tick):
+        seconds = tick // TICK_RATE
+        return f"{seconds // 60}:{seconds % 60:02d}"
+
+    def _get_mode_name(self):
+        return "Реплей"
+
+
+def start_replay_viewer(gm, path):
+    """Сцена просмотра реплея из файла (python main.py --replay <файл>)"""
+    from src.scenes.loading_scene import LoadingScene
+
+    replay = Replay.load(path)
+    names = replay.metadata.get("characters") or ["fighter_left", "fighter_right"]
+    skins = replay.metadata.get("skins") or [None, None]
+    viewer = ReplayViewerScene(gm, Character(names[0], gm.resources, skin=skins[0]),
+                               Character(names[1], gm.resources, skin=skins[1]), replay)
+    gm.register_scene("replay", viewer)
+    gm.register_scene("game_loading", LoadingScene(gm, "replay", skip_logo=True))
+    gm.set_scene("game_loading")
+    print(f"📼 Реплей: {path}, {replay.ticks} тиков, ключевых кадров {len(replay.keyframe_ticks)}")
@@ -4,6 +4,8 @@ import os
 from src.managers.game_manager import BaseScene
 
 class SettingsScene(BaseScene):
+    supports_dirty_rects = True
+
     def __init__(self, gm):
         super().__init__(gm)
         self.settings_manager = self.gm.settings
@@ -35,6 +37,7 @@ class SettingsScene(BaseScene):
         self.slider_music = None
         self.slider_sound = None
         self.fullscreen_toggle = None
+        self.replays_toggle = None
         self.resolution_buttons = []
         self.language_buttons = []
         self.apply_button = None
@@ -92,6 +95,9 @@ class SettingsScene(BaseScene):
         if self.fullscreen_toggle and self.fullscreen_toggle.collidepoint(mouse_pos):
             self.settings_manager.current_settings["fullscreen"] = not self.settings_manager.current_settings["fullscreen"]
         
+        if self.replays_toggle and self.replays_toggle.collidepoint(mouse_pos):
+            self.settings_manager.current_settings["save_replays"] = not self.settings_manager.current_settings["save_replays"]
+        
         for i, res_button in enumerate(self.resolution_buttons):
             if res_button.collidepoint(mouse_pos):
                 self.settings_manager.current_settings["resolution"] = self.resolutions[i]
@@ -139,9 +145,13 @@ class SettingsScene(BaseScene):
     
     def _apply_settings(self):
         """Применяет настройки без перезагрузки"""
+        old_resolution = self.settings_manager.current_resolution
         new_screen = self.settings_manager.apply_graphics_settings()
         if new_screen:
             self.gm.screen = new_screen
+            # Карточки масштабированы под старое разрешение - освобождаем их
+            if self.settings_manager.current_resolution != old_resolution:
+                self.gm.resources.clear_card_cache()
         
         # Устанавливаем язык
         self.settings_manager.set_language(self.settings_manager.current_settings["language"])
@@ -198,7 +208,7 @@ class SettingsScene(BaseScene):
         sections = [
             (self.gm.settings.get_text("audio_settings"), self._draw_audio_settings, 120),
             (self.gm.settings.get_text("graphics_settings"), self._draw_graphics_settings, 150),
-            (self.gm.settings.get_text("system_settings"), self._draw_system_settings, 120)
+            (self.gm.settings.get_text("system_settings"), self._draw_system_settings, 150)
         ]
         
         total_fixed_height = sum(height for _, _, height in sections)
@@ -285,20 +295,7 @@ class SettingsScene(BaseScene):
         toggle_width = 80
         toggle_rect = pygame.Rect(controls_start_x, toggle_y, toggle_width, toggle_height)
         self.fullscreen_toggle = toggle_rect
-        
-        if self.settings_manager.current_settings["fullscreen"]:
-            pygame.draw.rect(screen, self.colors["button_primary"], toggle_rect, border_radius=15)
-            toggle_text = self.gm.settings.get_text("on")
-        else:
-            pygame.draw.rect(screen, (100, 100, 100), toggle_rect, border_radius=15)
-            toggle_text = self.gm.settings.get_text("off")
-        
-        pygame.draw.rect(screen, self.colors["text_light"], toggle_rect, 2, border_radius=15)
-        
-        toggle_font = self.get_font(16, bold=True)
-        toggle_label = toggle_font.render(toggle_text, True, self.colors["text_light"])
-        screen.blit(toggle_label, (toggle_rect.centerx - toggle_label.get_width() // 2,
-                                toggle_rect.centery - toggle_label.get_height() // 2))
+        self._draw_toggle(screen, toggle_rect, self.settings_manager.current_settings["fullscreen"])
         
         # Кнопки разрешений
         self.resolution_buttons = []
@@ -385,6 +382,12 @@ class SettingsScene(BaseScene):
             screen.blit(lang_text, (btn_rect.centerx - lang_text.get_width() // 2,
                                   btn_rect.centery - lang_text.get_height() // 2))
         
+        # Переключатель записи реплеев
+        replays_text = language_font.render(self.gm.settings.get_text("save_replays"), True, self.colors["text_light"])
+        screen.blit(replays_text, (rect.x + 30, y_offset + 45))
+        self.replays_toggle = pygame.Rect(controls_start_x, y_offset + 40, 80, 30)
+        self._draw_toggle(screen, self.replays_toggle, self.settings_manager.current_settings["save_replays"])
+        
         # Кнопка применения
         apply_font = self.get_font(18, bold=True)
         apply_text = apply_font.render(self.gm.settings.get_text("apply"), True, self.colors["text_light"])
@@ -393,7 +396,7 @@ class SettingsScene(BaseScene):
         
         self.apply_button = pygame.Rect(
             rect.centerx - apply_button_width // 2, 
-            y_offset + 80, 
+            y_offset + 85, 
             apply_button_width, 
             apply_button_height
         )
@@ -403,6 +406,21 @@ class SettingsScene(BaseScene):
         screen.blit(apply_text, (self.apply_button.centerx - apply_text.get_width() // 2,
                                self.apply_button.centery - apply_text.get_height() // 2))
     
+    def _draw_toggle(self, screen, toggle_rect, enabled):
+        if enabled:
+            pygame.draw.rect(screen, self.colors["button_primary"], toggle_rect, border_radius=15)
+            toggle_text = self.gm.settings.get_text("on")
+        else:
+            pygame.draw.rect(screen, (100, 100, 100), toggle_rect, border_radius=15)
+            toggle_text = self.gm.settings.get_text("off")
+        
+        pygame.draw.rect(screen, self.colors["text_light"], toggle_rect, 2, border_radius=15)
+        
+        toggle_font = self.get_font(16, bold=True)
+        toggle_label = toggle_font.render(toggle_text, True, self.colors["text_light"])
+        screen.blit(toggle_label, (toggle_rect.centerx - toggle_label.get_width() // 2,
+                                toggle_rect.centery - toggle_label.get_height() // 2))
+    
     def _draw_slider(self, screen, rect, progress):
         pygame.draw.rect(screen, self.colors["slider_track"], rect, border_radius=10)
         
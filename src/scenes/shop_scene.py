@@ -2,6 +2,7 @@
 import pygame
 import random
 from src.managers.game_manager import BaseScene
+from src.core.fonts import get_font
 import sys
 import os
 
@@ -15,6 +16,8 @@ def resource_path(relative_path):
     return os.path.join(base_path, relative_path)
 
 class ShopScene(BaseScene):
+    supports_dirty_rects = True
+
     def __init__(self, gm):
         super().__init__(gm)
         
@@ -136,7 +139,7 @@ class ShopScene(BaseScene):
             text = "I"
         
         # Добавляем текст
-        font = pygame.font.SysFont("arial", max(10, size // 2))
+        font = get_font(max(10, size // 2))
         text_surface = font.render(text, True, (255, 255, 255))
         text_rect = text_surface.get_rect(center=(size//2, size//2))
         icon.blit(text_surface, text_rect)
@@ -231,47 +234,15 @@ class ShopScene(BaseScene):
     
     def _get_card_size(self):
         """Определяем размер карточки как в MenuScene"""
-        base_size = 280
-        
-        if self.gm.settings.scale_factor > 1.5:
-            return int(base_size * 1.3)
-        elif self.gm.settings.scale_factor > 1.2:
-            return int(base_size * 1.15)
-        return base_size
+        return self.gm.resources.get_card_size(self.gm.settings.scale_factor)
     
     def _load_card_image(self, filename, is_special, card_size):
-        """Загрузка карточки с указанным размером - как в MenuScene"""
-        # ИСПРАВЛЕНИЕ: Правильный путь к карточкам - Sprites/cards/filename
-        card_path = resource_path(os.path.join("Sprites", "cards", filename))
-        
-        try:
-            if os.path.exists(card_path):
-                print(f"✅ Загружаем карточку: {card_path}")
-                card = pygame.image.load(card_path).convert_alpha()
-                card = pygame.transform.scale(card, (card_size, card_size))
-                return card
-            else:
-                print(f"⚠️ Карточка не найдена: {card_path}")
-                
-                # Пробуем найти в альтернативных местах
-                alt_paths = [
-                    resource_path(os.path.join("Sprites", "cards", filename.lower())),
-                    resource_path(os.path.join("sprites", "cards", filename)),
-                    resource_path(os.path.join("sprites", "cards", filename.lower())),
-                ]
-                
-                for alt_path in alt_paths:
-                    if os.path.exists(alt_path):
-                        print(f"✅ Найдена альтернативная карточка: {alt_path}")
-                        card = pygame.image.load(alt_path).convert_alpha()
-                        card = pygame.transform.scale(card, (card_size, card_size))
-                        return card
-                
-                # Если нигде не нашли, создаем заглушку
-                return self._create_placeholder_card(filename, is_special, card_size)
-        except Exception as e:
-            print(f"❌ Ошибка загрузки карточки {card_path}: {e}")
+        """Карточка из общего кэша ResourceManager - те же Surface, что и в MenuScene"""
+        card = self.gm.resources.get_card(os.path.splitext(filename)[0], card_size)
+        if card is None:
+            print(f"⚠️ Карточка не найдена: {filename}")
             return self._create_placeholder_card(filename, is_special, card_size)
+        return card
     
     def _create_placeholder_card(self, filename, is_special, card_size):
         """Создание заглушки для карточки - как в MenuScene"""
@@ -291,12 +262,12 @@ class ShopScene(BaseScene):
         filename_text = filename
         
         font_size = max(10, card_size // 12)
-        font = pygame.font.SysFont("arial", font_size)
+        font = get_font(font_size)
         status = "SPECIAL" if is_special else "NORMAL"
         text = font.render(f"{filename_text}", True, (255, 255, 255))
         card.blit(text, (card_size//20, card_size//2))
         
-        placeholder_font = pygame.font.SysFont("arial", max(12, card_size//10), bold=True)
+        placeholder_font = get_font(max(12, card_size//10), bold=True)
         placeholder_render = placeholder_font.render(placeholder_text, True, (255, 255, 255))
         card.blit(placeholder_render, (card_size//2 - placeholder_render.get_width()//2, card_size//3))
         
@@ -491,6 +462,10 @@ class ShopScene(BaseScene):
     
     def update(self, dt):
         """Обновление сцены"""
+        # Анимация покупки и сообщения с таймером перерисовывают экран каждый кадр
+        if self.purchase_animation or self.locked_skin_message:
+            self.invalidate()
+        
         # Обновляем частицы
         for particle in self.particles[:]:
             particle["x"] += particle["speed_x"]
@@ -542,13 +517,16 @@ class ShopScene(BaseScene):
             self.draw_locked_skin_message(screen)
     
     def draw_background(self, screen):
-        """Отрисовка фона"""
-        screen.fill(self.colors["background"])
+        """Отрисовка фона (градиент рисуется один раз и кэшируется)"""
+        screen.blit(self.get_layer("background", screen.get_size(), self._paint_background), (0, 0))
+    
+    def _paint_background(self, layer):
+        layer.fill(self.colors["background"])
         
         # Градиентный фон
-        for i in range(screen.get_height()):
+        for i in range(layer.get_height()):
             color = (20 + i//20, 20 + i//25, 40 + i//15)
-            pygame.draw.line(screen, color, (0, i), (screen.get_width(), i))
+            pygame.draw.line(layer, color, (0, i), (layer.get_width(), i))
     
     def draw_header(self, screen):
         """Верхняя панель с названием и ресурсами"""
@@ -556,9 +534,7 @@ class ShopScene(BaseScene):
         header_rect = pygame.Rect(0, 0, screen.get_width(), header_height)
         
         # Градиентный фон хедера
-        for i in range(header_height):
-            color = (30 + i//3, 30 + i//3, 50 + i//2)
-            pygame.draw.line(screen, color, (0, i), (screen.get_width(), i))
+        screen.blit(self.get_layer("header", header_rect.size, self._paint_header), (0, 0))
         
         # Заголовок
         title_font = self.get_font(36, bold=True)
@@ -581,6 +557,12 @@ class ShopScene(BaseScene):
         trophies_text = resource_font.render(f"{self.player_trophies}", True, (255, 200, 100))
         screen.blit(trophies_text, (screen.get_width() - self.s(150) + trophy_icon.get_width() + 5, self.s(50)))
     
+    def _paint_header(self, layer):
+        """Градиент хедера (рисуется один раз в get_layer)"""
+        for i in range(layer.get_height()):
+            color = (30 + i//3, 30 + i//3, 50 + i//2)
+            pygame.draw.line(layer, color, (0, i), (layer.get_width(), i))
+    
     def draw_tabs(self, screen):
         """Отрисовка вкладок магазина"""
         self.tab_buttons = []
@@ -915,7 +897,7 @@ class ShopScene(BaseScene):
         
         # Текст "ПОЛУЧЕНО!"
         text_size = int(self.s(40) * (1 + progress * 0.3))
-        text_font = pygame.font.SysFont("arial", text_size, bold=True)
+        text_font = get_font(text_size, bold=True)
         
         if "name" in self.purchase_animation_item:
             if "coins" in self.purchase_animation_item: